@@ -0,0 +1,94 @@
+import unittest
+import base64
+import tempfile
+import os
+import time
+
+from worker import utils
+from worker.artifact_stores.artifact_store import Artifact, InlineArtifact, compute_hash
+from worker.artifact_stores.file_system_artifact_store import FileSystemArtifactStore
+
+
+class FileSystemArtifactStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.__directory = tempfile.TemporaryDirectory()
+        self.__artifact_store = FileSystemArtifactStore(self.__directory.name)
+
+    def tearDown(self):
+        self.__directory.cleanup()
+
+    def test_put(self):
+        data = b'model files'
+        reference = self.__artifact_store.put(data)
+
+        self.assertEqual(reference, {'hash': compute_hash(data), 'size': len(data)})
+        self.assertTrue(self.__artifact_store.exists(reference['hash']))
+        self.assertEqual(self.__artifact_store.read(reference['hash']), data)
+
+        # Storing the same content again is idempotent.
+        self.assertEqual(self.__artifact_store.put(data), reference)
+
+    def test_artifact_matches_inline_artifact(self):
+        data = b'model files'
+        reference = self.__artifact_store.put(data)
+
+        artifact = Artifact(self.__artifact_store, reference['hash'], reference['size'])
+        inline_artifact = InlineArtifact(base64.b64encode(data).decode('utf-8'))
+
+        self.assertEqual(artifact.load(), data)
+        self.assertEqual(inline_artifact.load(), data)
+        self.assertEqual(artifact.hash, inline_artifact.hash)
+        self.assertEqual(artifact.size, inline_artifact.size)
+
+    def test_content_hash(self):
+        model_directory = tempfile.TemporaryDirectory()
+        with open(os.path.join(model_directory.name, 'model.txt'), 'w') as model_file:
+            model_file.write('model')
+        data = utils.create_zip_bytes([model_directory.name])
+
+        # Creates the zip file of the same files with a different timestamp.
+        modification_time = time.time() - 3600
+        os.utime(os.path.join(model_directory.name, 'model.txt'), (modification_time, modification_time))
+        other_data = utils.create_zip_bytes([model_directory.name])
+
+        with open(os.path.join(model_directory.name, 'model.txt'), 'w') as model_file:
+            model_file.write('other model')
+        different_data = utils.create_zip_bytes([model_directory.name])
+        model_directory.cleanup()
+
+        reference = self.__artifact_store.put(data)
+        artifact = Artifact(self.__artifact_store, reference['hash'], reference['size'])
+
+        self.assertNotEqual(compute_hash(data), compute_hash(other_data))
+        self.assertEqual(artifact.content_hash, InlineArtifact(other_data).content_hash)
+        self.assertNotEqual(artifact.content_hash, InlineArtifact(different_data).content_hash)
+
+    def test_load_once(self):
+        data = b'model files'
+        reference = self.__artifact_store.put(data)
+        artifact = Artifact(self.__artifact_store, reference['hash'], reference['size'])
+
+        self.assertEqual(artifact.load(), data)
+        os.remove(os.path.join(self.__directory.name, reference['hash'][:2], reference['hash']))
+        self.assertEqual(artifact.load(), data)
+
+    def test_load_corrupted(self):
+        data = b'model files'
+        reference = self.__artifact_store.put(data)
+        self.__artifact_store.write(reference['hash'], b'other files')
+
+        with self.assertRaises(ValueError):
+            Artifact(self.__artifact_store, reference['hash']).load()
+        with self.assertRaises(ValueError):
+            Artifact(self.__artifact_store, reference['hash'], reference['size'] + 1).load()
+
+    def test_invalid_hash(self):
+        for artifact_hash in ['../x', compute_hash(b'')[:-1] + '/', compute_hash(b'').upper(), None]:
+            with self.assertRaises(ValueError):
+                Artifact(self.__artifact_store, artifact_hash)
+            with self.assertRaises(ValueError):
+                self.__artifact_store.read(artifact_hash)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+import os
+import sys
+import tempfile
+import shutil
+
+from worker import utils
+from worker.model_executor import ModelExecutor
+from worker.batch_model_executor import BatchModelExecutor
+from worker.execution_pool import ExecutionPool
+from worker.extraction_cache import ExtractionCache
+
+
+THIS_DIRECTORY_PATH = os.path.dirname(os.path.abspath(__file__))
+
+PREDICT_BATCH_COMMAND = sys.executable + ' constant_batch_predictor.py ' \
+                        '${CCUBE_PREDICT_DATASET_FILE} ' \
+                        '${CCUBE_PREDICT_INPUT_MANIFEST}'
+PREDICT_BATCH_EXECUTABLE_FILE = 'resources/predictors/constant_batch_predictor.py'
+PREDICT_COMMAND = 'for i in 1 2 3; do echo 7; done > ${CCUBE_PREDICT_PREDICTIONS_FILE}'
+PREDICT_PREDICTIONS_FILE = 'predictions.csv'
+
+DATA_STRING = b'0.1,0.2\n0.3,0.4\n0.5,0.6\n'
+
+
+class BatchModelExecutorTest(unittest.TestCase):
+    def setUp(self):
+        self.__temporary_working_directory = tempfile.TemporaryDirectory()
+        shutil.copy(os.path.join(THIS_DIRECTORY_PATH, PREDICT_BATCH_EXECUTABLE_FILE), self.__temporary_working_directory.name)
+
+        self.__data_file = tempfile.NamedTemporaryFile()
+        self.__data_file.write(DATA_STRING)
+        self.__data_file.flush()
+
+        self.__batch_model_executor = BatchModelExecutor(
+            execution_command=PREDICT_BATCH_COMMAND,
+            working_directory=self.__temporary_working_directory.name,
+            environment_variables=os.environ,
+        )
+
+    def tearDown(self):
+        self.__data_file.close()
+        self.__temporary_working_directory.cleanup()
+
+    def create_model_executor(self, value, **kwargs):
+        model_directory = tempfile.TemporaryDirectory()
+        with open(os.path.join(model_directory.name, 'model.txt'), 'w') as model_file:
+            model_file.write(str(value))
+        model_files_stream = utils.create_zip_base64_string([model_directory.name])
+        model_directory.cleanup()
+
+        return ModelExecutor(
+            model_files_stream=model_files_stream,
+            model_parameters={'parameter': value},
+            predictions_file_path=os.path.join(self.__temporary_working_directory.name, PREDICT_PREDICTIONS_FILE),
+            execution_command=PREDICT_COMMAND,
+            working_directory=self.__temporary_working_directory.name,
+            environment_variables=os.environ,
+            values_type='integer',
+            **kwargs
+        )
+
+    def test_execute(self):
+        models_executors = [self.create_model_executor(i) for i in range(4)]
+
+        models_predicted_values = self.__batch_model_executor.execute(models_executors, self.__data_file.name)
+
+        self.assertEqual([list(predicted_values) for predicted_values in models_predicted_values], [[i] * 3 for i in range(4)])
+
+    def test_execute_cached(self):
+        extraction_cache = ExtractionCache()
+        models_executors = [self.create_model_executor(i, extraction_cache=extraction_cache) for i in [1, 2, 1]]
+
+        models_predicted_values = self.__batch_model_executor.execute(models_executors, self.__data_file.name)
+
+        self.assertEqual([list(predicted_values) for predicted_values in models_predicted_values], [[1] * 3, [2] * 3, [1] * 3])
+        extraction_cache.close()
+
+    def test_execute_missing_predictions(self):
+        models_executors = [self.create_model_executor(value) for value in [1, 'skip', 3]]
+
+        models_predicted_values = self.__batch_model_executor.execute(models_executors, self.__data_file.name)
+
+        self.assertEqual([list(predicted_values) for predicted_values in models_predicted_values], [[1] * 3, [7] * 3, [3] * 3])
+
+    def test_execute_failed(self):
+        models_executors = [self.create_model_executor(value) for value in [1, 'fail', 3]]
+
+        models_predicted_values = self.__batch_model_executor.execute(models_executors, self.__data_file.name)
+
+        self.assertEqual([list(predicted_values) for predicted_values in models_predicted_values], [[7] * 3] * 3)
+
+    def test_execution_pool(self):
+        models_executors = [self.create_model_executor(i) for i in range(5)]
+        execution_pool = ExecutionPool('batch', batch_model_executor=self.__batch_model_executor, batch_size=2)
+
+        models_predicted_values = execution_pool.execute(models_executors, self.__data_file.name)
+
+        self.assertEqual([list(predicted_values) for predicted_values in models_predicted_values], [[i] * 3 for i in range(5)])
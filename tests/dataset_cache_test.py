@@ -0,0 +1,102 @@
+import unittest
+import os
+import tempfile
+
+from worker.dataset_cache import DatasetCache
+
+
+class DatasetCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.__directory = tempfile.TemporaryDirectory()
+        self.__dataset_cache = DatasetCache(self.__directory.name, maximum_size=250)
+        self.__downloads = []
+
+    def tearDown(self):
+        self.__directory.cleanup()
+
+    def create_download(self, content):
+        def download(file):
+            self.__downloads.append(content)
+            file.write(content)
+        return download
+
+    def test_compute_key(self):
+        key = DatasetCache.compute_key('http://factorizer/dataset/higgs/split/fusion', {'a': 1, 'b': 2})
+
+        self.assertEqual(key, DatasetCache.compute_key('http://factorizer/dataset/higgs/split/fusion', {'b': 2, 'a': 1}))
+        self.assertNotEqual(key, DatasetCache.compute_key('http://factorizer/dataset/higgs/split/test', {'a': 1, 'b': 2}))
+        self.assertNotEqual(key, DatasetCache.compute_key('http://factorizer/dataset/higgs/split/fusion', {'a': 2, 'b': 2}))
+
+    def test_download_once(self):
+        for _ in range(3):
+            dataset_file = self.__dataset_cache.open('fusion', self.create_download(b'1,2,3\n'))
+            with open(dataset_file.name, 'rb') as file:
+                self.assertEqual(file.read(), b'1,2,3\n')
+            dataset_file.close()
+
+        self.assertEqual(len(self.__downloads), 1)
+
+    def test_evict_least_recently_used(self):
+        for key in ['a', 'b', 'c']:
+            self.__dataset_cache.open(key, self.create_download(key.encode() * 100)).close()
+            os.utime(os.path.join(self.__directory.name, key), (len(self.__downloads), len(self.__downloads)))
+
+        self.__dataset_cache.open('a', self.create_download(b'a' * 100)).close()
+
+        self.assertEqual(self.__downloads, [b'a' * 100, b'b' * 100, b'c' * 100, b'a' * 100])
+
+    def test_keep_files_in_use(self):
+        dataset_file = self.__dataset_cache.open('a', self.create_download(b'a' * 200))
+        self.__dataset_cache.open('b', self.create_download(b'b' * 200)).close()
+
+        with open(dataset_file.name, 'rb') as file:
+            self.assertEqual(file.read(), b'a' * 200)
+        dataset_file.close()
+
+    def test_failed_download(self):
+        def download(file):
+            file.write(b'partial')
+            raise IOError()
+
+        with self.assertRaises(IOError):
+            self.__dataset_cache.open('a', download)
+
+        self.assertFalse(os.path.exists(os.path.join(self.__directory.name, 'a')))
+
+    def test_invalid_download(self):
+        def truncated_download(file):
+            file.write(b'partial')
+            return 100
+
+        for download in [self.create_download(b''), truncated_download]:
+            with self.assertRaises(IOError):
+                self.__dataset_cache.open('a', download)
+            self.assertFalse(os.path.exists(os.path.join(self.__directory.name, 'a')))
+
+        dataset_file = self.__dataset_cache.open('a', self.create_download(b'1,2,3\n'))
+        with open(dataset_file.name, 'rb') as file:
+            self.assertEqual(file.read(), b'1,2,3\n')
+        dataset_file.close()
+
+    def test_remove_leftover_files(self):
+        self.__dataset_cache.open('x', self.create_download(b'x' * 10)).close()
+        dataset_file = self.__dataset_cache.open('a', self.create_download(b'a' * 200))
+
+        # Simulates the link of a crashed reader, and the lock file of an evicted split.
+        leftover_link_path = os.path.join(self.__directory.name, '.link-crashed')
+        os.link(os.path.join(self.__directory.name, 'x'), leftover_link_path)
+        leftover_lock_path = os.path.join(self.__directory.name, 'evicted.lock')
+        open(leftover_lock_path, 'w').close()
+
+        self.__dataset_cache.open('b', self.create_download(b'b' * 200)).close()
+
+        self.assertFalse(os.path.exists(leftover_link_path))
+        self.assertFalse(os.path.exists(leftover_lock_path))
+        with open(dataset_file.name, 'rb') as file:
+            self.assertEqual(file.read(), b'a' * 200)
+        dataset_file.close()
+
+        self.assertEqual(
+            sorted(name for name in os.listdir(self.__directory.name) if name.startswith('.link-')),
+            [],
+        )
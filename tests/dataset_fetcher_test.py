@@ -0,0 +1,73 @@
+import unittest
+import threading
+import http.server
+import urllib.parse
+
+from worker.dataset_fetcher import DatasetFetcher
+
+
+SPLIT_REQUEST_URL = 'http://{hostname_}:{port_}/dataset/{dataset_name_}/split/{split_}'
+
+
+class DatasetRequestHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urllib.parse.urlparse(self.path)
+        if 'missing' in url.path:
+            self.send_error(404)
+            return
+
+        params = urllib.parse.parse_qs(url.query)
+        body = (url.path + ':' + params['random_seed'][0] + '\n').encode() * 1000
+
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class DatasetFetcherTest(unittest.TestCase):
+    def setUp(self):
+        self.__server = http.server.ThreadingHTTPServer(('localhost', 0), DatasetRequestHandler)
+        threading.Thread(target=self.__server.serve_forever, daemon=True).start()
+
+        self.__dataset_fetcher = DatasetFetcher('localhost', str(self.__server.server_address[1]), chunk_size=1024)
+
+    def tearDown(self):
+        self.__dataset_fetcher.close()
+        self.__server.shutdown()
+        self.__server.server_close()
+
+    def test_fetch_all(self):
+        splits = ['fusion', 'fusion/class', 'test', 'test/class']
+        dataset_files = self.__dataset_fetcher.fetch_all(
+            'higgs',
+            [(SPLIT_REQUEST_URL.replace('{split_}', split), {'random_seed': 7}) for split in splits],
+        )
+
+        for split, dataset_file in zip(splits, dataset_files):
+            with open(dataset_file.name, 'rb') as file:
+                self.assertEqual(file.read(), ('/dataset/higgs/split/' + split + ':7\n').encode() * 1000)
+            dataset_file.close()
+
+        statistics = self.__dataset_fetcher.statistics
+        self.assertEqual(len(statistics), 4)
+        for download_statistics in statistics:
+            self.assertGreater(download_statistics['bytes'], 0)
+            self.assertGreaterEqual(download_statistics['seconds'], 0)
+            self.assertFalse(download_statistics['cached'])
+
+        self.__dataset_fetcher.clear_statistics()
+        self.assertEqual(self.__dataset_fetcher.statistics, [])
+
+    def test_fetch_error(self):
+        with self.assertRaises(Exception):
+            self.__dataset_fetcher.fetch_all(
+                'higgs',
+                [
+                    (SPLIT_REQUEST_URL.replace('{split_}', 'fusion'), {'random_seed': 7}),
+                    (SPLIT_REQUEST_URL.replace('{split_}', 'missing'), {'random_seed': 7}),
+                ],
+            )
@@ -0,0 +1,93 @@
+import unittest
+import time
+
+from worker.execution_pool import ExecutionPool, DEFAULT_BATCH_SIZE
+
+
+class DelayedModelExecutor(object):
+    def __init__(self, predictions, delay):
+        self.__predictions = predictions
+        self.__delay = delay
+
+    def execute(self, data_file_path):
+        time.sleep(self.__delay)
+        return [data_file_path] + self.__predictions
+
+
+class BatchModelExecutor(object):
+    def __init__(self):
+        self.batches_sizes = []
+
+    def execute(self, models_executors, data_file_path):
+        self.batches_sizes.append(len(models_executors))
+        return [model_executor.execute(data_file_path) for model_executor in models_executors]
+
+
+class ExecutionPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.__models_executors = [
+            DelayedModelExecutor([i, i], 0.05 * (5 - i))
+            for i in range(5)
+        ]
+        self.__expected_predictions = [['data', i, i] for i in range(5)]
+
+    def tearDown(self):
+        pass
+
+    def test_serial(self):
+        execution_pool = ExecutionPool('serial')
+        self.assertEqual(execution_pool.execute(self.__models_executors, 'data'), self.__expected_predictions)
+
+    def test_thread(self):
+        execution_pool = ExecutionPool('thread', 3)
+        self.assertEqual(execution_pool.execute(self.__models_executors, 'data'), self.__expected_predictions)
+
+    def test_process(self):
+        execution_pool = ExecutionPool('process', 2)
+        self.assertEqual(execution_pool.execute(self.__models_executors, 'data'), self.__expected_predictions)
+
+    def test_batch(self):
+        batch_model_executor = BatchModelExecutor()
+        execution_pool = ExecutionPool('batch', batch_model_executor=batch_model_executor, batch_size=2)
+        self.assertEqual(execution_pool.execute(self.__models_executors, 'data'), self.__expected_predictions)
+        self.assertEqual(batch_model_executor.batches_sizes, [2, 2, 1])
+
+        with self.assertRaises(ValueError):
+            ExecutionPool('batch')
+
+    def test_batch_default_size(self):
+        batch_model_executor = BatchModelExecutor()
+        execution_pool = ExecutionPool('batch', batch_model_executor=batch_model_executor)
+        models_executors = [DelayedModelExecutor([i], 0) for i in range(2 * DEFAULT_BATCH_SIZE + 1)]
+
+        consumed_models_executors = []
+
+        def generate_models_executors():
+            for model_executor in models_executors:
+                consumed_models_executors.append(model_executor)
+                yield model_executor
+
+        executions = execution_pool.iterate_executions(generate_models_executors(), 'data')
+        self.assertEqual(next(executions), ['data', 0])
+        self.assertEqual(len(consumed_models_executors), DEFAULT_BATCH_SIZE)
+        self.assertEqual(len(list(executions)), 2 * DEFAULT_BATCH_SIZE)
+        self.assertEqual(batch_model_executor.batches_sizes, [DEFAULT_BATCH_SIZE, DEFAULT_BATCH_SIZE, 1])
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            ExecutionPool('unknown')
+
+    def test_iterate_executions_bounded(self):
+        execution_pool = ExecutionPool('thread', 2)
+
+        consumed_models_executors = []
+
+        def generate_models_executors():
+            for model_executor in self.__models_executors:
+                consumed_models_executors.append(model_executor)
+                yield model_executor
+
+        executions = execution_pool.iterate_executions(generate_models_executors(), 'data')
+        self.assertEqual(next(executions), self.__expected_predictions[0])
+        self.assertLessEqual(len(consumed_models_executors), 2 * execution_pool.workers_number + 1)
+        self.assertEqual(list(executions), self.__expected_predictions[1:])
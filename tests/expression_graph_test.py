@@ -0,0 +1,104 @@
+import unittest
+import tempfile
+import os
+
+import numpy
+
+from worker import utils
+from worker.expression_model import ExpressionModel, parse_expression
+from worker.expression_model_executor import ExpressionModelExecutor
+from worker.expression_graph import ExpressionGraph, ExpressionGraphExecutor
+from worker.execution_pool import ExecutionPool
+
+
+MODELS_LINES = [
+    '(+ (mydivide X1 X2) (sin (* X3 X3))),0,0,0.5,-2,2',
+    '(- (sin (* X3 X3)) (mylog X4)),0,0,0.4,-3,3',
+    '(* (mydivide X1 X2) (exp (sin (* X3 X3)))),0,0,0.6,-1,1',
+    '(+ (mydivide X1 X2) (sin (* X3 X3))),0,0,0.2,-2,2',
+    '(sqrt 2),0,0,0.5,0,2',
+]
+
+
+class ExpressionGraphTest(unittest.TestCase):
+    def setUp(self):
+        random_state = numpy.random.RandomState(0)
+        self.__data = random_state.normal(size=(300, 5))
+        self.__models = [ExpressionModel.parse(model_line) for model_line in MODELS_LINES]
+
+    def tearDown(self):
+        pass
+
+    def test_shared_nodes(self):
+        expression_graph = ExpressionGraph()
+        roots = [expression_graph.add(model.expression) for model in self.__models]
+
+        # X1, X2, X3, X4, 2, X3*X3, sin, X1/X2, the first sum, log, difference, exp, product and sqrt.
+        self.assertEqual(len(expression_graph), 14)
+        self.assertEqual(expression_graph.expressions_nodes_number, 34)
+        self.assertEqual(roots[0], roots[3])
+        self.assertEqual(expression_graph.roots, roots)
+
+    def test_evaluate(self):
+        expression_graph = ExpressionGraph()
+        for model in self.__models:
+            expression_graph.add(model.expression)
+
+        models_outputs = expression_graph.evaluate(self.__data)
+
+        self.assertEqual(models_outputs.shape, (len(self.__models), 300))
+        for model, outputs in zip(self.__models, models_outputs):
+            numpy.testing.assert_array_equal(outputs, model.evaluate(self.__data))
+
+    def test_evaluate_repeated_subexpression(self):
+        expression_graph = ExpressionGraph()
+        expression_graph.add(parse_expression('(+ (square X1) (square X1))'))
+
+        self.assertEqual(len(expression_graph), 3)
+        numpy.testing.assert_array_equal(expression_graph.evaluate(self.__data)[0], 2 * self.__data[:, 0] ** 2)
+
+    def test_evaluate_missing_attribute(self):
+        expression_graph = ExpressionGraph()
+        expression_graph.add(parse_expression('(+ X6 1)'))
+
+        with self.assertRaises(ValueError):
+            expression_graph.evaluate(self.__data)
+
+    def test_peak_outputs_number(self):
+        expression_graph = ExpressionGraph()
+        for i in range(100):
+            expression_graph.add(parse_expression('(+ (sin X{}) (* X1 {}))'.format(i % 4 + 1, i)))
+
+        # The outputs of each root are released once yielded, so they do not grow with the number of models.
+        self.assertLess(expression_graph.peak_outputs_number, 10)
+
+    def test_execute(self):
+        models_executors = []
+        for model_line in MODELS_LINES:
+            model_directory = tempfile.TemporaryDirectory()
+            with open(os.path.join(model_directory.name, 'mostAccurate.txt'), 'w') as model_file:
+                model_file.write(model_line + '\n')
+            models_executors.append(ExpressionModelExecutor(
+                model_files_stream=utils.create_zip_base64_string([model_directory.name]),
+                header_lines_number=1,
+            ))
+            model_directory.cleanup()
+
+        data_file = tempfile.NamedTemporaryFile(mode='w', suffix='.csv')
+        data_file.write('X1,X2,X3,X4,y\n')
+        numpy.savetxt(data_file, self.__data, delimiter=',', fmt='%.17g')
+        data_file.flush()
+
+        execution_pool = ExecutionPool(
+            'batch',
+            batch_model_executor=ExpressionGraphExecutor(header_lines_number=1, chunk_rows_number=64, memory_budget=2048),
+            batch_size=3,
+        )
+        models_predicted_values = execution_pool.execute(models_executors, data_file.name)
+
+        self.assertEqual(
+            [list(predicted_values) for predicted_values in models_predicted_values],
+            [list(model_executor.execute(data_file.name)) for model_executor in models_executors],
+        )
+
+        data_file.close()
@@ -0,0 +1,178 @@
+import unittest
+import math
+import tempfile
+import os
+import shutil
+
+import numpy
+
+from worker import utils
+from worker.expression_model import ExpressionModel, parse_expression
+from worker.expression_model_executor import ExpressionModelExecutor
+from worker.model_executor import ModelExecutor
+
+
+THIS_DIRECTORY_PATH = os.path.dirname(os.path.abspath(__file__))
+
+PREDICT_COMMAND = 'java -jar gpfunction.jar ' \
+                  '-predict ${CCUBE_PREDICT_DATASET_FILE} ' \
+                  '-model ${CCUBE_PREDICT_INPUT_FILES}/mostAccurate.txt ' \
+                  '-o predictions.csv'
+PREDICT_EXECUTABLE_FILE = 'resources/learners/gpfunction.jar'
+PREDICT_PREDICTIONS_FILE = 'predictions.csv'
+
+
+MODEL_LINE = '(+ (exp (+ (- (mydivide X4 X14) (* X3 (square (+ (mylog X14) (sin (+ X7 (- (cube (cos (mydivide X4 ' \
+             '(mydivide (mydivide (* (sin X4) X4) X14) X14)))) X1))))))) X11)) (+ (- (* X11 (mydivide X3 X14)) ' \
+             '(* X3 (square (+ (mylog X4) (sin (quart (square (+ (mylog X4) (sin (quart X8)))))))))) X9)),' \
+             '0.9623745819397994,0.9623745819397994,0.29999999999999993,0.6417844690910977,30.362519592778117'
+
+
+def evaluate_reference(node, row):
+    operator = node[0]
+    if operator == 'variable':
+        return row[node[1]]
+    if operator == 'constant':
+        return node[1]
+
+    operands = [evaluate_reference(operand, row) for operand in node[1:]]
+    if operator == '+':
+        return operands[0] + operands[1]
+    if operator == '-':
+        return operands[0] - operands[1]
+    if operator == '*':
+        return operands[0] * operands[1]
+    if operator == 'mydivide':
+        return 1.0 if abs(operands[1]) < 1e-6 else operands[0] / operands[1]
+    if operator == 'mylog':
+        return 0.0 if abs(operands[0]) < 1e-6 else math.log(abs(operands[0]))
+    if operator == 'exp':
+        try:
+            return math.exp(operands[0])
+        except OverflowError:
+            return math.inf
+    if operator == 'sqrt':
+        return math.sqrt(abs(operands[0]))
+    if operator == 'sin':
+        return math.sin(operands[0]) if math.isfinite(operands[0]) else math.nan
+    if operator == 'cos':
+        return math.cos(operands[0]) if math.isfinite(operands[0]) else math.nan
+    if operator == 'square':
+        return operands[0] ** 2
+    if operator == 'cube':
+        return operands[0] ** 3
+    if operator == 'quart':
+        return operands[0] ** 4
+    raise ValueError(operator)
+
+
+def predict_reference(model_line, row):
+    fields = model_line.split(',')
+    threshold, minimum_output, maximum_output = float(fields[3]), float(fields[4]), float(fields[5])
+
+    try:
+        output = evaluate_reference(parse_expression(fields[0]), row)
+    except OverflowError:
+        output = math.inf
+    if output > maximum_output:
+        output = maximum_output
+    if output < minimum_output:
+        output = minimum_output
+    return 1 if (output - minimum_output) / (maximum_output - minimum_output) >= threshold else 0
+
+
+class ExpressionModelTest(unittest.TestCase):
+    def setUp(self):
+        random_state = numpy.random.RandomState(0)
+        self.__data = random_state.normal(size=(500, 15))
+
+    def tearDown(self):
+        pass
+
+    def test_parse_expression(self):
+        self.assertEqual(
+            parse_expression('(+ (mydivide X1 x) (sqrt -0.5))'),
+            ('+', ('mydivide', ('variable', 0), ('variable', 0)), ('sqrt', ('constant', -0.5))),
+        )
+
+        for expression in ['', '(+ X1)', '(+ X1 X2', '(unknown X1)', 'X1 X2', ')', '(+ X0 1)', 'X-1']:
+            with self.assertRaises(ValueError):
+                parse_expression(expression)
+
+    def test_protected_operators(self):
+        values = numpy.array([[0.0, 1e-7, -4.0]])
+
+        self.assertEqual(list(ExpressionModel(parse_expression('(mydivide X3 X2)'), 0, 0, 1).evaluate(values)), [1.0])
+        self.assertEqual(list(ExpressionModel(parse_expression('(mylog X1)'), 0, 0, 1).evaluate(values)), [0.0])
+        self.assertEqual(list(ExpressionModel(parse_expression('(mylog X3)'), 0, 0, 1).evaluate(values)), [math.log(4)])
+        self.assertEqual(list(ExpressionModel(parse_expression('(sqrt X3)'), 0, 0, 1).evaluate(values)), [2.0])
+
+    def test_evaluate_missing_attribute(self):
+        with self.assertRaises(ValueError):
+            ExpressionModel(parse_expression('(+ X4 1)'), 0, 0, 1).evaluate(numpy.array([[1.0, 2.0, 3.0]]))
+
+    def test_predict(self):
+        model = ExpressionModel.parse(MODEL_LINE)
+
+        predicted_values = model.predict(self.__data)
+
+        self.assertEqual(predicted_values.dtype, numpy.int8)
+        self.assertEqual(list(predicted_values), [predict_reference(MODEL_LINE, row) for row in self.__data.tolist()])
+
+    def create_model_files_stream(self):
+        model_directory = tempfile.TemporaryDirectory()
+        with open(os.path.join(model_directory.name, 'mostAccurate.txt'), 'w') as model_file:
+            model_file.write(MODEL_LINE + '\n')
+        model_files_stream = utils.create_zip_base64_string([model_directory.name])
+        model_directory.cleanup()
+        return model_files_stream
+
+    def test_execute(self):
+        model_files_stream = self.create_model_files_stream()
+
+        data_file = tempfile.NamedTemporaryFile(mode='w', suffix='.csv')
+        data_file.write(','.join('X{}'.format(i) for i in range(1, 16)) + '\n')
+        numpy.savetxt(data_file, self.__data, delimiter=',', fmt='%.17g')
+        data_file.flush()
+
+        model_executor = ExpressionModelExecutor(
+            model_files_stream=model_files_stream,
+            header_lines_number=1,
+            chunk_rows_number=64,
+        )
+        predicted_values = model_executor.execute(data_file.name)
+
+        # The last column is the class, not used by the model.
+        self.assertEqual(list(predicted_values), list(ExpressionModel.parse(MODEL_LINE).predict(self.__data[:, :-1])))
+
+        data_file.close()
+
+    @unittest.skipIf(shutil.which('java') is None, 'java is not available')
+    def test_execute_matches_gpfunction(self):
+        model_files_stream = self.create_model_files_stream()
+
+        data_file = tempfile.NamedTemporaryFile(mode='w', suffix='.csv')
+        numpy.savetxt(data_file, self.__data, delimiter=',', fmt='%.17g')
+        data_file.flush()
+
+        temporary_working_directory = tempfile.TemporaryDirectory()
+        shutil.copy(os.path.join(THIS_DIRECTORY_PATH, PREDICT_EXECUTABLE_FILE), temporary_working_directory.name)
+
+        gpfunction_model_executor = ModelExecutor(
+            model_files_stream=model_files_stream,
+            model_parameters=None,
+            predictions_file_path=os.path.join(temporary_working_directory.name, PREDICT_PREDICTIONS_FILE),
+            execution_command=PREDICT_COMMAND,
+            working_directory=temporary_working_directory.name,
+            environment_variables=os.environ,
+            values_type='integer',
+        )
+        expression_model_executor = ExpressionModelExecutor(model_files_stream=model_files_stream)
+
+        self.assertEqual(
+            list(expression_model_executor.execute(data_file.name)),
+            list(gpfunction_model_executor.execute(data_file.name)),
+        )
+
+        temporary_working_directory.cleanup()
+        data_file.close()
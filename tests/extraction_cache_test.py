@@ -0,0 +1,80 @@
+import unittest
+import os
+import pickle
+import tempfile
+
+from worker import utils
+from worker.extraction_cache import ExtractionCache
+from worker.artifact_stores.artifact_store import InlineArtifact
+
+
+def create_model_files_stream(content):
+    model_directory = tempfile.TemporaryDirectory()
+    with open(os.path.join(model_directory.name, 'model.txt'), 'w') as model_file:
+        model_file.write(content)
+    model_files_stream = utils.create_zip_base64_string([model_directory.name])
+    model_directory.cleanup()
+    return InlineArtifact(model_files_stream)
+
+
+class ExtractionCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.__extraction_cache = ExtractionCache(maximum_size=250)
+
+    def tearDown(self):
+        self.__extraction_cache.close()
+
+    def test_extract_once(self):
+        model_files_stream = create_model_files_stream('a' * 100)
+
+        with self.__extraction_cache.extract(model_files_stream) as first_directory:
+            with open(os.path.join(first_directory, 'model.txt')) as model_file:
+                self.assertEqual(model_file.read(), 'a' * 100)
+        with self.__extraction_cache.extract(model_files_stream) as second_directory:
+            pass
+
+        self.assertEqual(first_directory, second_directory)
+        self.assertEqual(self.__extraction_cache.size, 100)
+
+    def test_evict_least_recently_used(self):
+        models_files_streams = [create_model_files_stream(character * 100) for character in 'abc']
+
+        directories = []
+        for model_files_stream in models_files_streams:
+            with self.__extraction_cache.extract(model_files_stream) as directory:
+                directories.append(directory)
+
+        self.assertFalse(os.path.exists(directories[0]))
+        self.assertTrue(os.path.exists(directories[1]))
+        self.assertTrue(os.path.exists(directories[2]))
+        self.assertEqual(self.__extraction_cache.size, 200)
+
+    def test_keep_directories_in_use(self):
+        models_files_streams = [create_model_files_stream(character * 100) for character in 'abc']
+
+        with self.__extraction_cache.extract(models_files_streams[0]) as directory:
+            for model_files_stream in models_files_streams[1:]:
+                with self.__extraction_cache.extract(model_files_stream):
+                    pass
+            self.assertTrue(os.path.exists(directory))
+
+    def test_share_directories_among_copies(self):
+        model_files_stream = create_model_files_stream('a' * 100)
+        extraction_cache_copy = pickle.loads(pickle.dumps(self.__extraction_cache))
+
+        with self.__extraction_cache.extract(model_files_stream) as first_directory:
+            with extraction_cache_copy.extract(model_files_stream) as second_directory:
+                pass
+
+        self.assertEqual(first_directory, second_directory)
+        self.assertEqual(extraction_cache_copy.size, 100)
+
+    def test_keep_directories_in_use_by_copies(self):
+        models_files_streams = [create_model_files_stream(character * 100) for character in 'abc']
+        extraction_cache_copy = pickle.loads(pickle.dumps(self.__extraction_cache))
+
+        with extraction_cache_copy.extract(models_files_streams[0]) as directory:
+            for model_files_stream in models_files_streams[1:]:
+                with self.__extraction_cache.extract(model_files_stream):
+                    pass
+            self.assertTrue(os.path.exists(directory))
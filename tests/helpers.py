@@ -0,0 +1,6 @@
+class ValuesModelExecutor(object):
+    def __init__(self, predicted_values):
+        self.__predicted_values = predicted_values
+
+    def execute(self, data_file_path):
+        return self.__predicted_values
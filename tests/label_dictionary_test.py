@@ -0,0 +1,39 @@
+import unittest
+
+import numpy
+
+from worker.label_dictionary import LabelDictionary
+
+
+class LabelDictionaryTest(unittest.TestCase):
+    def test_encode_integer(self):
+        label_dictionary = LabelDictionary('1', 'integer', numpy.array([0.0, 1.0, 0.0]))
+
+        self.assertEqual(list(label_dictionary.labels), [0, 1])
+        self.assertEqual(label_dictionary.true_code, 1)
+        self.assertEqual(label_dictionary.dtype, numpy.int8)
+        self.assertEqual(list(label_dictionary.encode(numpy.array([1, 0, 2, 1]))), [1, 0, -1, 1])
+        self.assertEqual(list(label_dictionary.binarize([1, 0, -1, 1])), [1, 0, -1, 1])
+
+    def test_encode_text(self):
+        label_dictionary = LabelDictionary('yes', 'text', numpy.array(['no', 'maybe', 'no']))
+
+        self.assertEqual(list(label_dictionary.labels), ['maybe', 'no', 'yes'])
+        self.assertEqual(label_dictionary.true_code, 2)
+        codes = label_dictionary.encode(numpy.array(['yes', 'no', 'never']))
+        self.assertEqual(list(codes), [2, 1, -1])
+        self.assertEqual(list(label_dictionary.binarize(codes)), [1, 0, -1])
+        self.assertEqual(list(label_dictionary.decode(codes[:2])), ['yes', 'no'])
+
+    def test_extend_and_recode(self):
+        label_dictionary = LabelDictionary('1', 'integer', numpy.array([1, 3]))
+        extended_label_dictionary = label_dictionary.extend(numpy.array([2, 0]))
+
+        self.assertEqual(list(extended_label_dictionary.labels), [0, 1, 2, 3])
+        self.assertEqual(extended_label_dictionary.true_code, 1)
+        self.assertEqual(list(extended_label_dictionary.recode(numpy.array([0, 1, -1]), label_dictionary)), [1, 3, -1])
+        self.assertEqual(list(label_dictionary.recode(numpy.array([0, 1, 2, 3]), extended_label_dictionary)), [-1, 0, -1, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
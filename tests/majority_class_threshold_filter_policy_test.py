@@ -4,10 +4,14 @@ import tempfile
 import shutil
 import os
 
+import numpy
+
 from worker import utils
 from worker.model_executor import ModelExecutor
 from worker.filter_policies.majority_class_threshold_filter_policy import MajorityCostThresholdFilterPolicy
 
+from helpers import ValuesModelExecutor
+
 
 THIS_DIRECTORY_PATH = os.path.dirname(os.path.abspath(__file__))
 
@@ -32,6 +36,46 @@ TRAINING_DATA_STRING = b'-0.1266700923442840576,0.3346722722053527832,2.17307615
 ACTUAL_VALUES_STRING = '1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n1.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n0.000000000000000000\n'
 
 
+class RowsModelExecutor(object):
+    def __init__(self, predicted_values):
+        self.__predicted_values = numpy.asarray(predicted_values)
+        self.executed_rows_number = 0
+
+    def execute(self, data_file_path):
+        rows_indices = numpy.loadtxt(data_file_path, delimiter=',', skiprows=1, usecols=0, dtype=int, ndmin=1)
+        self.executed_rows_number += len(rows_indices)
+        return self.__predicted_values[rows_indices]
+
+
+def create_rows_data_file(rows_number):
+    rows_data_file = tempfile.NamedTemporaryFile(mode='w', suffix='.csv')
+    rows_data_file.write('row,class\n')
+    for i in range(rows_number):
+        rows_data_file.write('{},0\n'.format(i))
+    rows_data_file.flush()
+    return rows_data_file
+
+
+def compute_naive_filtered_models(models_predicted_values, actual_values, true_class_value, threshold):
+    false_class_value = 1 - true_class_value
+    actual_values = list(actual_values)
+
+    def compute_cost(predicted_values):
+        confusion_matrix = utils.compute_confusion_matrix(
+            actual_values,
+            predicted_values,
+            [false_class_value, true_class_value],
+        )
+        false_negatives_rate = confusion_matrix['false_negatives'] / actual_values.count(true_class_value)
+        false_positives_rate = confusion_matrix['false_positives'] / actual_values.count(false_class_value)
+        return threshold * false_negatives_rate + (1 - threshold) * false_positives_rate
+
+    majority_class_value = max([false_class_value, true_class_value], key=actual_values.count)
+    majority_cost = compute_cost([majority_class_value] * len(actual_values))
+
+    return [compute_cost(list(predicted_values)) < majority_cost for predicted_values in models_predicted_values]
+
+
 class MajorityClassThresholdFilterPolicyTest(unittest.TestCase):
     def setUp(self):
         pass
@@ -84,3 +128,83 @@ class MajorityClassThresholdFilterPolicyTest(unittest.TestCase):
         filtered_models = filter_policy.filter()
         print(filtered_models)
         self.assertTrue(filtered_models[0])
+
+    def test_filter_matches_confusion_matrices(self):
+        random_state = numpy.random.RandomState(0)
+        actual_values = (random_state.rand(300) < 0.3).astype(int)
+        models_predicted_values = [
+            numpy.where(random_state.rand(300) < accuracy, actual_values, 1 - actual_values)
+            for accuracy in random_state.rand(200)
+        ]
+
+        filter_policy = MajorityCostThresholdFilterPolicy(
+            models_executors=[ValuesModelExecutor(predicted_values) for predicted_values in models_predicted_values],
+            training_data=None,
+            actual_values=actual_values,
+            true_class_value=TRUE_CLASS_VALUE,
+            class_attribute_type=CLASS_ATTRIBUTE_TYPE,
+            configuration={'threshold': FALSE_NEGATIVE_WEIGHT_THRESHOLD},
+        )
+
+        self.assertEqual(
+            filter_policy.filter(),
+            compute_naive_filtered_models(models_predicted_values, actual_values, 1, FALSE_NEGATIVE_WEIGHT_THRESHOLD),
+        )
+
+    def test_filter_racing_without_margin(self):
+        random_state = numpy.random.RandomState(1)
+        actual_values = (random_state.rand(500) < 0.4).astype(int)
+        models_predicted_values = [
+            numpy.where(random_state.rand(500) < accuracy, actual_values, 1 - actual_values)
+            for accuracy in random_state.rand(50)
+        ]
+        training_data_file = create_rows_data_file(len(actual_values))
+
+        models_executors = [RowsModelExecutor(predicted_values) for predicted_values in models_predicted_values]
+        filter_policy = MajorityCostThresholdFilterPolicy(
+            models_executors=models_executors,
+            training_data=training_data_file.name,
+            actual_values=actual_values,
+            true_class_value=TRUE_CLASS_VALUE,
+            class_attribute_type=CLASS_ATTRIBUTE_TYPE,
+            configuration={
+                'threshold': FALSE_NEGATIVE_WEIGHT_THRESHOLD,
+                'racing_delta': 0,
+                'header_lines_number': 1,
+            },
+        )
+
+        self.assertEqual(
+            filter_policy.filter(),
+            compute_naive_filtered_models(models_predicted_values, actual_values, 1, FALSE_NEGATIVE_WEIGHT_THRESHOLD),
+        )
+        for models_executor in models_executors:
+            self.assertEqual(models_executor.executed_rows_number, len(actual_values))
+
+    def test_filter_racing_rejects_early(self):
+        random_state = numpy.random.RandomState(2)
+        actual_values = (random_state.rand(4000) < 0.5).astype(int)
+        models_predicted_values = [
+            numpy.where(random_state.rand(4000) < accuracy, actual_values, 1 - actual_values)
+            for accuracy in [0.9, 0.1, 0.05, 0.2, 0.95]
+        ]
+        training_data_file = create_rows_data_file(len(actual_values))
+
+        models_executors = [RowsModelExecutor(predicted_values) for predicted_values in models_predicted_values]
+        filter_policy = MajorityCostThresholdFilterPolicy(
+            models_executors=models_executors,
+            training_data=training_data_file.name,
+            actual_values=actual_values,
+            true_class_value=TRUE_CLASS_VALUE,
+            class_attribute_type=CLASS_ATTRIBUTE_TYPE,
+            configuration={
+                'threshold': FALSE_NEGATIVE_WEIGHT_THRESHOLD,
+                'racing_delta': 0.05,
+                'header_lines_number': 1,
+            },
+        )
+
+        self.assertEqual(filter_policy.filter(), [True, False, False, False, True])
+        self.assertEqual(models_executors[0].executed_rows_number, len(actual_values))
+        for models_executor in models_executors[1:4]:
+            self.assertLess(models_executor.executed_rows_number, len(actual_values))
@@ -0,0 +1,60 @@
+import unittest
+import json
+import base64
+
+from worker.message_codec import MessageCodec, JSON_CONTENT_TYPE, BINARY_CONTENT_TYPE
+
+
+MESSAGE = [
+    {'files': b'\x00zip\xffbytes', 'success': True},
+    {'files': None, 'nested': {'values': [1, 2.5, 'three', b'four']}},
+]
+
+
+class MessageCodecTest(unittest.TestCase):
+    def test_binary(self):
+        for compression in [None, 'zlib', 'lzma']:
+            body, content_type, content_encoding = MessageCodec('binary', compression).encode(MESSAGE)
+
+            self.assertEqual(content_type, BINARY_CONTENT_TYPE)
+            self.assertEqual(content_encoding, compression)
+            self.assertEqual(MessageCodec.decode(body, content_type, content_encoding), MESSAGE)
+
+    def test_json_encodes_bytes_as_base64(self):
+        body, content_type, content_encoding = MessageCodec('json', 'zlib').encode(MESSAGE)
+        message = MessageCodec.decode(body, content_type, content_encoding)
+
+        self.assertEqual(content_type, JSON_CONTENT_TYPE)
+        self.assertEqual(base64.b64decode(message[0]['files']), MESSAGE[0]['files'])
+
+    def test_decode_legacy_json(self):
+        body = json.dumps({'success': True, 'files': 'UEsFBgAAAAAAAAAAAAAAAAAAAAAAAA=='}).encode()
+
+        self.assertEqual(
+            MessageCodec.decode(body, 'application/json', None),
+            {'success': True, 'files': 'UEsFBgAAAAAAAAAAAAAAAAAAAAAAAA=='},
+        )
+
+    def test_decode_without_properties(self):
+        for codec in ['json', 'binary']:
+            for compression in [None, 'zlib', 'lzma']:
+                body, _, _ = MessageCodec(codec, compression).encode(MESSAGE)
+                message = MessageCodec.decode(body)
+
+                if codec == 'binary':
+                    self.assertEqual(message, MESSAGE)
+                else:
+                    self.assertEqual(base64.b64decode(message[0]['files']), MESSAGE[0]['files'])
+
+        self.assertEqual(MessageCodec.decode(b'80'), 80)
+        self.assertEqual(MessageCodec.decode(b' {"success": true}'), {'success': True})
+
+    def test_unknown_codec(self):
+        with self.assertRaises(ValueError):
+            MessageCodec('xml')
+        with self.assertRaises(ValueError):
+            MessageCodec.decode(b'', 'text/plain', None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+
+import numpy
+from sklearn import metrics as sklearn_metrics
+
+from worker import metrics
+
+
+class MetricsTest(unittest.TestCase):
+    def assert_sklearn_parity(self, actual_values, predicted_values):
+        actual_codes = metrics.encode_binary_values(actual_values, 1, [0])
+        predicted_codes = metrics.encode_binary_values(predicted_values, 1, [0])
+        binary_metrics = metrics.compute_binary_metrics(actual_codes, predicted_codes)
+
+        confusion_matrix = sklearn_metrics.confusion_matrix(actual_values, predicted_values, labels=[0, 1])
+        expected_metrics = {
+            'accuracy': sklearn_metrics.accuracy_score(actual_values, predicted_values),
+            'f-measure': sklearn_metrics.f1_score(actual_values, predicted_values, zero_division=0),
+            'mcc': sklearn_metrics.matthews_corrcoef(actual_values, predicted_values),
+            'precision': sklearn_metrics.precision_score(actual_values, predicted_values, zero_division=0),
+            'recall': sklearn_metrics.recall_score(actual_values, predicted_values, zero_division=0),
+            'true_positives': confusion_matrix[1][1],
+            'false_positives': confusion_matrix[0][1],
+            'true_negatives': confusion_matrix[0][0],
+            'false_negatives': confusion_matrix[1][0],
+        }
+
+        self.assertEqual(set(binary_metrics.keys()), set(expected_metrics.keys()))
+        for name, expected_value in expected_metrics.items():
+            self.assertAlmostEqual(binary_metrics[name], expected_value, places=12, msg=name)
+
+    def test_binary_metrics(self):
+        random_state = numpy.random.RandomState(0)
+        for _ in range(20):
+            actual_values = random_state.randint(0, 2, 300)
+            predicted_values = numpy.where(random_state.rand(300) < random_state.rand(), actual_values, 1 - actual_values)
+            self.assert_sklearn_parity(actual_values, predicted_values)
+
+    def test_binary_metrics_zero_division(self):
+        self.assert_sklearn_parity(numpy.array([0, 0, 0, 0]), numpy.array([0, 0, 0, 0]))
+        self.assert_sklearn_parity(numpy.array([1, 1, 0, 0]), numpy.array([0, 0, 0, 0]))
+        self.assert_sklearn_parity(numpy.array([1, 1, 1, 1]), numpy.array([1, 1, 1, 1]))
+
+    def test_confusion_matrices(self):
+        actual_codes = numpy.array([1, 1, 0, 0])
+        predicted_codes = numpy.array([[1, 0, 0, 1], [-1, 1, 1, -1]])
+
+        confusion_matrices = metrics.compute_confusion_matrices(actual_codes, predicted_codes)
+
+        self.assertEqual(list(confusion_matrices['true_positives']), [1, 1])
+        self.assertEqual(list(confusion_matrices['false_negatives']), [1, 0])
+        self.assertEqual(list(confusion_matrices['true_negatives']), [1, 0])
+        self.assertEqual(list(confusion_matrices['false_positives']), [1, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+import tempfile
+import os
+import time
+
+from worker import utils
+from worker.artifact_stores.artifact_store import Artifact, InlineArtifact, compute_hash
+from worker.model_deduplicator import ModelDeduplicator
+
+
+class UnreadableArtifactStore(object):
+    def read(self, artifact_hash):
+        raise AssertionError('The artifact has been loaded')
+
+
+class ModelDeduplicatorTest(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def create_model_artifact(self, value, modification_time=None):
+        model_directory = tempfile.TemporaryDirectory()
+        model_file_path = os.path.join(model_directory.name, 'model.txt')
+        with open(model_file_path, 'w') as model_file:
+            model_file.write(str(value))
+        if modification_time is not None:
+            os.utime(model_file_path, (modification_time, modification_time))
+        model_files_stream = utils.create_zip_base64_string([model_directory.name])
+        model_directory.cleanup()
+
+        return InlineArtifact(model_files_stream)
+
+    def test_add(self):
+        model_deduplicator = ModelDeduplicator()
+        old_time = time.time() - 3600
+
+        models_artifacts = [
+            self.create_model_artifact(1),
+            self.create_model_artifact(2),
+            self.create_model_artifact(1, old_time),
+            self.create_model_artifact(3),
+            self.create_model_artifact(2),
+            self.create_model_artifact(1),
+        ]
+
+        self.assertEqual(
+            [model_deduplicator.add(model_artifact) for model_artifact in models_artifacts],
+            [(0, True), (1, True), (0, False), (2, True), (1, False), (0, False)],
+        )
+        self.assertEqual(len(model_deduplicator), 3)
+        self.assertEqual(model_deduplicator.models_counts, [3, 2, 1])
+
+    def test_add_stored_artifacts_without_loading(self):
+        model_deduplicator = ModelDeduplicator()
+        artifact_store = UnreadableArtifactStore()
+        hashes = [compute_hash(data) for data in [b'a', b'b', b'a']]
+
+        self.assertEqual(
+            [model_deduplicator.add(Artifact(artifact_store, artifact_hash)) for artifact_hash in hashes],
+            [(0, True), (1, True), (0, False)],
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,179 @@
+import unittest
+import os
+import sys
+import tempfile
+import shutil
+import concurrent.futures
+
+import numpy
+
+from worker import utils
+from worker.model_executor import ModelExecutor
+from worker.execution_pool import ExecutionPool
+
+
+THIS_DIRECTORY_PATH = os.path.dirname(os.path.abspath(__file__))
+
+PREDICT_COMMAND = sys.executable + ' constant_predictor.py ' \
+                  '${CCUBE_PREDICT_DATASET_FILE} ' \
+                  '${CCUBE_PREDICT_INPUT_FILES}/model.txt ' \
+                  '${CCUBE_PREDICT_PREDICTIONS_FILE}'
+PREDICT_EXECUTABLE_FILE = 'resources/predictors/constant_predictor.py'
+PREDICT_PREDICTIONS_FILE = 'predictions.csv'
+
+ROW_PREDICT_COMMAND = sys.executable + ' row_predictor.py ' \
+                      '${CCUBE_PREDICT_DATASET_FILE} ' \
+                      '${CCUBE_PREDICT_INPUT_FILES}/model.txt ' \
+                      '${CCUBE_PREDICT_PREDICTIONS_FILE}'
+ROW_PREDICT_EXECUTABLE_FILE = 'resources/predictors/row_predictor.py'
+
+DATA_STRING = b'0.1,0.2\n0.3,0.4\n0.5,0.6\n0.7,0.8\n'
+
+
+class ModelExecutorTest(unittest.TestCase):
+    def setUp(self):
+        self.__temporary_working_directory = tempfile.TemporaryDirectory()
+        shutil.copy(os.path.join(THIS_DIRECTORY_PATH, PREDICT_EXECUTABLE_FILE), self.__temporary_working_directory.name)
+        shutil.copy(os.path.join(THIS_DIRECTORY_PATH, ROW_PREDICT_EXECUTABLE_FILE), self.__temporary_working_directory.name)
+
+        self.__data_file = tempfile.NamedTemporaryFile()
+        self.__data_file.write(DATA_STRING)
+        self.__data_file.flush()
+
+    def tearDown(self):
+        self.__data_file.close()
+        self.__temporary_working_directory.cleanup()
+
+    def create_model_executor(
+            self,
+            value,
+            predictions_file=PREDICT_PREDICTIONS_FILE,
+            execution_command=PREDICT_COMMAND,
+            **kwargs
+    ):
+        model_directory = tempfile.TemporaryDirectory()
+        with open(os.path.join(model_directory.name, 'model.txt'), 'w') as model_file:
+            model_file.write(str(value))
+        model_files_stream = utils.create_zip_base64_string([model_directory.name])
+        model_directory.cleanup()
+
+        return ModelExecutor(
+            model_files_stream=model_files_stream,
+            model_parameters=None,
+            predictions_file_path=os.path.join(self.__temporary_working_directory.name, predictions_file),
+            execution_command=execution_command,
+            working_directory=self.__temporary_working_directory.name,
+            environment_variables=os.environ,
+            **kwargs
+        )
+
+    def test_execute(self):
+        model_executor = self.create_model_executor(1)
+        predicted_values = model_executor.execute(self.__data_file.name)
+        self.assertEqual(list(predicted_values), [1, 1, 1, 1])
+
+        # The shared working directory is left untouched.
+        self.assertFalse(os.path.exists(os.path.join(self.__temporary_working_directory.name, PREDICT_PREDICTIONS_FILE)))
+
+    def test_execute_npy(self):
+        model_executor = self.create_model_executor(1, predictions_file='predictions.npy')
+        predicted_values = model_executor.execute(self.__data_file.name)
+
+        self.assertEqual(predicted_values.dtype, numpy.int8)
+        self.assertEqual(list(predicted_values), [1, 1, 1, 1])
+
+        # The predictions file has been removed with its context, so the values are copied into memory.
+        self.assertNotIsInstance(predicted_values, numpy.memmap)
+        self.assertIsNone(predicted_values.base)
+
+    def test_execute_raw(self):
+        model_executor = self.create_model_executor(
+            2,
+            predictions_format='raw',
+            predictions_dtype='int32',
+        )
+        predicted_values = model_executor.execute(self.__data_file.name)
+
+        self.assertEqual(predicted_values.dtype, numpy.int32)
+        self.assertEqual(list(predicted_values), [2, 2, 2, 2])
+        self.assertNotIsInstance(predicted_values, numpy.memmap)
+
+    def test_execute_concurrently(self):
+        models_executors = [self.create_model_executor(i) for i in range(8)]
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as pool_executor:
+            models_predicted_values = list(pool_executor.map(
+                lambda model_executor: model_executor.execute(self.__data_file.name),
+                models_executors,
+            ))
+
+        for i, predicted_values in enumerate(models_predicted_values):
+            self.assertEqual(list(predicted_values), [i] * 4)
+
+    def test_execution_pool_isolated(self):
+        # The model executors share the same predictions file, relocated into the context of each execution.
+        models_executors = [self.create_model_executor(i) for i in range(6)]
+
+        for execution_mode in ['thread', 'process']:
+            execution_pool = ExecutionPool(execution_mode, 3)
+            models_predicted_values = execution_pool.execute(models_executors, self.__data_file.name)
+
+            self.assertEqual([list(predicted_values) for predicted_values in models_predicted_values], [[i] * 4 for i in range(6)])
+
+    def test_execute_concurrently_outside_working_directory(self):
+        with tempfile.TemporaryDirectory() as predictions_directory:
+            predictions_file_path = os.path.join(predictions_directory, PREDICT_PREDICTIONS_FILE)
+            models_executors = [self.create_model_executor(i, predictions_file=predictions_file_path) for i in range(8)]
+
+            with concurrent.futures.ThreadPoolExecutor(max_workers=8) as pool_executor:
+                models_predicted_values = list(pool_executor.map(
+                    lambda model_executor: model_executor.execute(self.__data_file.name),
+                    models_executors,
+                ))
+
+            for i, predicted_values in enumerate(models_predicted_values):
+                self.assertEqual(list(predicted_values), [i] * 4)
+
+            # The shared predictions file is never written.
+            self.assertFalse(os.path.exists(predictions_file_path))
+
+    def test_execute_sharded(self):
+        data_file = tempfile.NamedTemporaryFile(mode='w', suffix='.csv')
+        data_file.write('id,value\n')
+        for i in range(103):
+            data_file.write('{},0.5\n'.format(i))
+        data_file.flush()
+
+        model_executor = self.create_model_executor(10, execution_command=ROW_PREDICT_COMMAND, values_type='integer')
+        sharded_model_executor = self.create_model_executor(
+            10,
+            execution_command=ROW_PREDICT_COMMAND,
+            values_type='integer',
+            shards_number=4,
+            header_lines_number=1,
+        )
+
+        predicted_values = model_executor.execute(data_file.name)
+        sharded_predicted_values = sharded_model_executor.execute(data_file.name)
+
+        self.assertEqual(list(predicted_values), list(range(10, 113)))
+        self.assertEqual(list(sharded_predicted_values), list(predicted_values))
+
+        data_file.close()
+
+    def test_split_rows_file(self):
+        data_file = tempfile.NamedTemporaryFile(mode='w', suffix='.csv')
+        data_file.write('a,b\n1,2\n3,4\n\n5,6')
+        data_file.flush()
+
+        with tempfile.TemporaryDirectory() as shards_directory:
+            shards_paths = utils.split_rows_file(data_file.name, 2, shards_directory, header_lines_number=1)
+
+            shards_contents = []
+            for shard_path in shards_paths:
+                with open(shard_path) as shard_file:
+                    shards_contents.append(shard_file.read())
+
+        self.assertEqual(shards_contents, ['a,b\n1,2\n3,4\n', 'a,b\n5,6\n'])
+
+        data_file.close()
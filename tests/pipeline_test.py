@@ -0,0 +1,71 @@
+import unittest
+import threading
+
+from worker.pipeline import Pipeline
+
+
+class PipelineTest(unittest.TestCase):
+    def test_run(self):
+        consumer_threads = []
+
+        def consume(items):
+            consumer_threads.append(threading.current_thread())
+            return [item * 2 for item in items]
+
+        result = Pipeline(consume).run(iter(range(5)))
+
+        self.assertEqual(result, [0, 2, 4, 6, 8])
+        self.assertNotEqual(consumer_threads[0], threading.current_thread())
+
+    def test_consume_while_producing(self):
+        consumed = threading.Event()
+
+        def produce():
+            yield 1
+            # Waits for the consumer to receive the first item, before producing the next one.
+            self.assertTrue(consumed.wait(5))
+            yield 2
+
+        def consume(items):
+            result = []
+            for item in items:
+                result.append(item)
+                consumed.set()
+            return result
+
+        self.assertEqual(Pipeline(consume).run(produce()), [1, 2])
+
+    def test_consumer_error(self):
+        def consume(items):
+            for item in items:
+                raise ValueError(item)
+
+        with self.assertRaises(ValueError):
+            Pipeline(consume).run(iter(range(5)))
+
+    def test_consumer_error_stops_producer(self):
+        def consume(items):
+            raise ValueError()
+
+        pipeline = Pipeline(consume)
+        produced = []
+
+        def produce():
+            produced.append(1)
+            yield 1
+            # Waits for a message that never arrives, checking the consumer failure.
+            self.assertTrue(pipeline.stopped.wait(5))
+
+        with self.assertRaises(ValueError):
+            pipeline.run(produce())
+        self.assertEqual(produced, [1])
+
+    def test_partial_consumption(self):
+        def consume(items):
+            return next(iter(items))
+
+        self.assertEqual(Pipeline(consume).run(iter(range(5))), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+import unittest
+import os
+import sys
+import tempfile
+import shutil
+import pickle
+import concurrent.futures
+
+from worker import utils
+from worker.model_executor import ModelExecutor
+from worker.predict_server import PredictServer, PredictServerError
+
+
+THIS_DIRECTORY_PATH = os.path.dirname(os.path.abspath(__file__))
+
+PREDICT_SERVER_COMMAND = sys.executable + ' constant_predict_server.py'
+PREDICT_SERVER_EXECUTABLE_FILE = 'resources/predictors/constant_predict_server.py'
+PREDICT_COMMAND = sys.executable + ' constant_predictor.py ' \
+                  '${CCUBE_PREDICT_DATASET_FILE} ' \
+                  '${CCUBE_PREDICT_INPUT_FILES}/model.txt ' \
+                  '${CCUBE_PREDICT_PREDICTIONS_FILE}'
+PREDICT_EXECUTABLE_FILE = 'resources/predictors/constant_predictor.py'
+PREDICT_PREDICTIONS_FILE = 'predictions.csv'
+
+DATA_STRING = b'0.1,0.2\n0.3,0.4\n0.5,0.6\n'
+
+
+class PredictServerTest(unittest.TestCase):
+    def setUp(self):
+        self.__temporary_working_directory = tempfile.TemporaryDirectory()
+        shutil.copy(os.path.join(THIS_DIRECTORY_PATH, PREDICT_SERVER_EXECUTABLE_FILE), self.__temporary_working_directory.name)
+        shutil.copy(os.path.join(THIS_DIRECTORY_PATH, PREDICT_EXECUTABLE_FILE), self.__temporary_working_directory.name)
+
+        self.__data_file = tempfile.NamedTemporaryFile()
+        self.__data_file.write(DATA_STRING)
+        self.__data_file.flush()
+
+        self.__models_directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.__models_directory.cleanup()
+        self.__data_file.close()
+        self.__temporary_working_directory.cleanup()
+
+    def create_model_directory(self, value):
+        model_directory = tempfile.mkdtemp(dir=self.__models_directory.name)
+        with open(os.path.join(model_directory, 'model.txt'), 'w') as model_file:
+            model_file.write(str(value))
+        return model_directory
+
+    def create_predict_server(self, command=PREDICT_SERVER_COMMAND, **kwargs):
+        return PredictServer(
+            command=command,
+            working_directory=self.__temporary_working_directory.name,
+            environment_variables=os.environ,
+            **kwargs
+        )
+
+    def predict(self, predict_server, value, predictions_file_name='predictions.csv'):
+        predictions_file_path = os.path.join(self.__models_directory.name, predictions_file_name)
+        predict_server.predict(self.create_model_directory(value), self.__data_file.name, predictions_file_path)
+        return list(utils.read_values_from_file(predictions_file_path, 'integer'))
+
+    def test_predict(self):
+        with self.create_predict_server() as predict_server:
+            for i in range(5):
+                self.assertEqual(self.predict(predict_server, i), [i] * 3)
+            self.assertEqual(predict_server.restarts, 0)
+
+    def test_predict_error(self):
+        with self.create_predict_server() as predict_server:
+            with self.assertRaises(PredictServerError):
+                self.predict(predict_server, 'error')
+            self.assertEqual(self.predict(predict_server, 1), [1] * 3)
+            self.assertEqual(predict_server.restarts, 0)
+
+    def test_restart(self):
+        with self.create_predict_server() as predict_server:
+            self.assertEqual(self.predict(predict_server, 1), [1] * 3)
+            with self.assertRaises(PredictServerError):
+                self.predict(predict_server, 'crash')
+            self.assertEqual(self.predict(predict_server, 2), [2] * 3)
+            self.assertEqual(predict_server.restarts, 2)
+
+    def test_restarts_reset(self):
+        with self.create_predict_server(restarts_number=2) as predict_server:
+            for i in range(3):
+                with self.assertRaises(PredictServerError):
+                    self.predict(predict_server, 'crash')
+                self.assertEqual(self.predict(predict_server, i), [i] * 3)
+            self.assertEqual(predict_server.restarts, 6)
+
+    def test_concurrent_predict(self):
+        with self.create_predict_server(processes_number=2) as predict_server:
+            with concurrent.futures.ThreadPoolExecutor(2) as executor:
+                predictions = executor.map(
+                    lambda i: self.predict(predict_server, i, 'predictions_{}.csv'.format(i)),
+                    range(8),
+                )
+                self.assertEqual(list(predictions), [[i] * 3 for i in range(8)])
+            self.assertEqual(predict_server.restarts, 0)
+
+    def test_response_timeout(self):
+        with self.create_predict_server(response_timeout=1) as predict_server:
+            with self.assertRaises(PredictServerError):
+                self.predict(predict_server, 'hang')
+            self.assertEqual(self.predict(predict_server, 1), [1] * 3)
+            self.assertEqual(predict_server.restarts, 1)
+
+    def test_restarts_exceeded(self):
+        with self.create_predict_server(command='exit 1', restarts_number=1) as predict_server:
+            with self.assertRaises(PredictServerError):
+                self.predict(predict_server, 1)
+            with self.assertRaises(PredictServerError):
+                self.predict(predict_server, 1)
+
+    def test_model_executor(self):
+        with self.create_predict_server() as predict_server:
+            model_executor = self.create_model_executor(3, 'exit 1', predict_server)
+            self.assertEqual(list(model_executor.execute(self.__data_file.name)), [3] * 3)
+
+    def test_model_executor_fallback(self):
+        with self.create_predict_server(command='exit 1', restarts_number=0) as predict_server:
+            model_executor = self.create_model_executor(4, PREDICT_COMMAND, predict_server)
+            self.assertEqual(list(model_executor.execute(self.__data_file.name)), [4] * 3)
+
+    def test_model_executor_copy(self):
+        with self.create_predict_server(command='exit 1') as predict_server:
+            model_executor = pickle.loads(pickle.dumps(self.create_model_executor(5, PREDICT_COMMAND, predict_server)))
+            self.assertEqual(list(model_executor.execute(self.__data_file.name)), [5] * 3)
+            self.assertEqual(predict_server.restarts, 0)
+
+    def create_model_executor(self, value, execution_command, predict_server):
+        model_directory = self.create_model_directory(value)
+        return ModelExecutor(
+            model_files_stream=utils.create_zip_base64_string([model_directory]),
+            model_parameters=None,
+            predictions_file_path=os.path.join(self.__temporary_working_directory.name, PREDICT_PREDICTIONS_FILE),
+            execution_command=execution_command,
+            working_directory=self.__temporary_working_directory.name,
+            environment_variables=os.environ,
+            values_type='integer',
+            predict_server=predict_server,
+        )
@@ -0,0 +1,113 @@
+import unittest
+import os
+import tempfile
+
+import numpy
+
+from worker.prediction_cache import PredictionCache, compute_file_hash
+from worker.execution_pool import ExecutionPool
+
+
+class CountingModelExecutor(object):
+    def __init__(self, value):
+        self.__value = value
+        self.executions_number = 0
+
+    @property
+    def prediction_key(self):
+        return str(self.__value)
+
+    def execute(self, data_file_path):
+        self.executions_number += 1
+        return numpy.full(3, self.__value, dtype=numpy.int8)
+
+
+class PredictionCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.__directory = tempfile.TemporaryDirectory()
+
+        self.__data_file = tempfile.NamedTemporaryFile()
+        self.__data_file.write(b'0.1,0.2\n0.3,0.4\n0.5,0.6\n')
+        self.__data_file.flush()
+
+    def tearDown(self):
+        self.__data_file.close()
+        self.__directory.cleanup()
+
+    def test_put_get(self):
+        prediction_cache = PredictionCache(self.__directory.name)
+        key = PredictionCache.compute_key('model', compute_file_hash(self.__data_file.name))
+
+        self.assertIsNone(prediction_cache.get(key))
+        self.assertTrue(prediction_cache.put(key, numpy.array([0, 1, 1], dtype=numpy.int8)))
+        predicted_values = prediction_cache.get(key)
+
+        self.assertEqual(predicted_values.dtype, numpy.int8)
+        self.assertEqual(list(predicted_values), [0, 1, 1])
+        self.assertEqual(prediction_cache.statistics, {'hits': 1, 'misses': 1})
+
+        # The values of object type are not cached.
+        self.assertFalse(prediction_cache.put('object', numpy.array([1, 'a', None], dtype=object)))
+        self.assertIsNone(prediction_cache.get('object'))
+
+        prediction_cache.clear_statistics()
+        self.assertEqual(prediction_cache.statistics, {'hits': 0, 'misses': 0})
+
+    def test_bypass(self):
+        prediction_cache = PredictionCache(self.__directory.name, bypass=True)
+
+        self.assertFalse(prediction_cache.put('key', [1, 2, 3]))
+        self.assertIsNone(prediction_cache.get('key'))
+        self.assertEqual(os.listdir(self.__directory.name), [])
+
+    def test_evict(self):
+        prediction_cache = PredictionCache(self.__directory.name, maximum_size=2500)
+        for i in range(4):
+            prediction_cache.put(str(i), numpy.zeros(100, dtype=numpy.int64))
+            os.utime(os.path.join(self.__directory.name, str(i) + '.npy'), (i, i))
+
+        # Each file takes 928 bytes, so only the two most recent ones fit.
+        self.assertIsNone(prediction_cache.get('0'))
+        self.assertIsNone(prediction_cache.get('1'))
+        self.assertIsNotNone(prediction_cache.get('2'))
+        self.assertIsNotNone(prediction_cache.get('3'))
+
+    def test_execution_pool(self):
+        prediction_cache = PredictionCache(self.__directory.name)
+        models_executors = [CountingModelExecutor(i) for i in range(4)]
+
+        execution_pool = ExecutionPool('serial', prediction_cache=prediction_cache)
+        execution_pool.execute(models_executors[:2], self.__data_file.name)
+        models_predicted_values = execution_pool.execute(models_executors, self.__data_file.name)
+
+        self.assertEqual([list(predicted_values) for predicted_values in models_predicted_values], [[i] * 3 for i in range(4)])
+        self.assertEqual([model_executor.executions_number for model_executor in models_executors], [1, 1, 1, 1])
+        self.assertEqual(prediction_cache.statistics, {'hits': 2, 'misses': 4})
+
+        # The same models on different data are executed again.
+        with tempfile.NamedTemporaryFile() as other_data_file:
+            other_data_file.write(b'0.7,0.8\n')
+            other_data_file.flush()
+            execution_pool.execute(models_executors[:1], other_data_file.name)
+        self.assertEqual(models_executors[0].executions_number, 2)
+
+    def test_compute_data_key(self):
+        execution_pool = ExecutionPool('serial', prediction_cache=PredictionCache(self.__directory.name))
+        data_key = execution_pool.compute_data_key(self.__data_file.name)
+        self.assertEqual(data_key, compute_file_hash(self.__data_file.name))
+
+        # The same version of the file is not hashed again.
+        stat = os.stat(self.__data_file.name)
+        with open(self.__data_file.name, 'r+b') as data_file:
+            data_file.write(b'0.9')
+        os.utime(self.__data_file.name, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertEqual(execution_pool.compute_data_key(self.__data_file.name), data_key)
+
+        # A modified file is hashed again.
+        with open(self.__data_file.name, 'ab') as data_file:
+            data_file.write(b'0.7,0.8\n')
+        self.assertEqual(
+            execution_pool.compute_data_key(self.__data_file.name),
+            compute_file_hash(self.__data_file.name),
+        )
+        self.assertNotEqual(execution_pool.compute_data_key(self.__data_file.name), data_key)
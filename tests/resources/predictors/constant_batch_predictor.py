@@ -0,0 +1,37 @@
+"""
+Predicts, for each model of the manifest and each row of the dataset file, the constant value contained in the model
+file.
+
+Usage: constant_batch_predictor.py <dataset file> <manifest file>
+
+A model value 'skip' leaves the model without predictions file, and a model value 'fail' makes the command exit with
+an error once all the predictions files are written.
+"""
+import os
+import sys
+
+
+if __name__ == '__main__':
+    dataset_file_path, manifest_file_path = sys.argv[1:3]
+
+    # Loads the dataset once.
+    with open(dataset_file_path) as dataset_file:
+        rows_number = sum(1 for line in dataset_file if line.strip())
+
+    failed = False
+    with open(manifest_file_path) as manifest_file:
+        for line in manifest_file:
+            model_files_directory, predictions_file_path, _ = line.rstrip('\n').split('\t')
+
+            with open(os.path.join(model_files_directory, 'model.txt')) as model_file:
+                value = model_file.read().strip()
+            if value == 'skip':
+                continue
+            failed = failed or value == 'fail'
+
+            with open(predictions_file_path, 'w') as predictions_file:
+                for _ in range(rows_number):
+                    predictions_file.write(value + '\n')
+
+    if failed:
+        sys.exit(1)
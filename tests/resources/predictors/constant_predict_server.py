@@ -0,0 +1,40 @@
+"""
+Serves the requests of the predict server protocol, predicting for each row of the dataset file the constant value
+contained in the model file.
+
+Usage: constant_predict_server.py
+
+A model value 'crash' makes the server exit, a model value 'error' makes it answer with an error, and a model value
+'hang' makes it never answer.
+"""
+import os
+import sys
+import time
+
+
+if __name__ == '__main__':
+    for request in sys.stdin:
+        model_files_directory, dataset_file_path, predictions_file_path, _ = request.rstrip('\n').split('\t')
+
+        with open(os.path.join(model_files_directory, 'model.txt')) as model_file:
+            value = model_file.read().strip()
+
+        if value == 'crash':
+            sys.exit(1)
+        if value == 'hang':
+            time.sleep(3600)
+        if value == 'error':
+            print('ERROR Cannot predict')
+            sys.stdout.flush()
+            continue
+
+        with open(dataset_file_path) as dataset_file:
+            rows_number = sum(1 for line in dataset_file if line.strip())
+
+        with open(predictions_file_path, 'w') as predictions_file:
+            for _ in range(rows_number):
+                predictions_file.write(value + '\n')
+
+        print('Predicted {} rows in process {}'.format(rows_number, os.getpid()))
+        print('OK')
+        sys.stdout.flush()
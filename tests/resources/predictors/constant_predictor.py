@@ -0,0 +1,34 @@
+"""
+Predicts, for each row of the dataset file, the constant value contained in the model file.
+
+Usage: constant_predictor.py <dataset file> <model file> <predictions file>
+
+The predictions are written as text, or in the binary format declared by CCUBE_PREDICT_PREDICTIONS_FORMAT.
+"""
+import os
+import sys
+import time
+
+import numpy
+
+
+if __name__ == '__main__':
+    dataset_file_path, model_file_path, predictions_file_path = sys.argv[1:4]
+
+    with open(model_file_path) as model_file:
+        value = model_file.read().strip()
+
+    with open(dataset_file_path) as dataset_file:
+        rows_number = sum(1 for line in dataset_file if line.strip())
+
+    predictions_format = os.environ.get('CCUBE_PREDICT_PREDICTIONS_FORMAT', 'text')
+    if predictions_format == 'npy':
+        with open(predictions_file_path, 'wb') as predictions_file:
+            numpy.save(predictions_file, numpy.full(rows_number, int(value), dtype=numpy.int8))
+    elif predictions_format == 'raw':
+        numpy.full(rows_number, int(value), dtype=numpy.int32).tofile(predictions_file_path)
+    else:
+        with open(predictions_file_path, 'w') as predictions_file:
+            for _ in range(rows_number):
+                predictions_file.write(value + '\n')
+                time.sleep(0.001)
@@ -0,0 +1,21 @@
+"""
+Predicts, for each row of the dataset file, the integer value of its first column plus the value contained in the
+model file, skipping the header lines.
+
+Usage: row_predictor.py <dataset file> <model file> <predictions file>
+"""
+import sys
+
+
+if __name__ == '__main__':
+    dataset_file_path, model_file_path, predictions_file_path = sys.argv[1:4]
+
+    with open(model_file_path) as model_file:
+        value = int(model_file.read().strip())
+
+    with open(dataset_file_path) as dataset_file, open(predictions_file_path, 'w') as predictions_file:
+        for line in dataset_file:
+            first_column = line.split(',')[0].strip()
+            if not first_column.lstrip('-').isdigit():
+                continue
+            predictions_file.write('{}\n'.format(int(first_column) + value))
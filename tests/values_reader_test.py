@@ -0,0 +1,53 @@
+import unittest
+import io
+import tempfile
+
+import numpy
+
+from worker.values_reader import ValuesReader
+
+
+class ValuesReaderTest(unittest.TestCase):
+    def test_read_integer(self):
+        values = ValuesReader('integer').read(io.BytesIO(b'1.000000\n0.000000\n\n1\n'))
+
+        self.assertEqual(values.dtype, numpy.int8)
+        self.assertEqual(list(values), [1, 0, 1])
+
+    def test_read_integer_widening(self):
+        values = ValuesReader('integer').read(io.BytesIO(b'1\n-1000\n'))
+
+        self.assertEqual(values.dtype, numpy.int32)
+        self.assertEqual(list(values), [1, -1000])
+
+    def test_read_non_integer(self):
+        with self.assertRaises(ValueError):
+            ValuesReader('integer').read(io.BytesIO(b'1\n0.5\n'))
+
+    def test_read_real(self):
+        values = ValuesReader('real').read(io.BytesIO(b'0.25\n-1e3\n'))
+
+        self.assertEqual(values.dtype, numpy.float64)
+        self.assertEqual(list(values), [0.25, -1000.0])
+
+    def test_read_text_codes(self):
+        codes, labels = ValuesReader('text').read_codes([b'yes\nno', b'\nmaybe\n', 'yes\n'])
+
+        self.assertEqual(list(labels), ['maybe', 'no', 'yes'])
+        self.assertEqual(list(codes), [2, 1, 0, 2])
+        self.assertEqual(list(ValuesReader('text').read([b'yes\nno\n'])), ['yes', 'no'])
+
+    def test_read_chunks_split_inside_lines(self):
+        data = b''.join(b'%d.000\n' % (i % 3) for i in range(1000))
+        with tempfile.NamedTemporaryFile() as values_file:
+            values_file.write(data)
+            values_file.flush()
+
+            values = ValuesReader('integer', chunk_size=7).read(values_file.name)
+
+        self.assertEqual(list(values), [i % 3 for i in range(1000)])
+        self.assertTrue(numpy.array_equal(values, numpy.genfromtxt(io.BytesIO(data), dtype=None)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+
+import numpy
+from sklearn.ensemble import VotingClassifier
+from sklearn.base import BaseEstimator, ClassifierMixin
+
+from worker.vote_aggregator import VoteAggregator
+
+
+class ConstantPredictionsClassifier(ClassifierMixin, BaseEstimator):
+    def __init__(self, predictions=None):
+        self.predictions = predictions
+
+    def fit(self, X, y):
+        self.fitted_ = True
+        return self
+
+    def predict(self, X):
+        return self.predictions
+
+
+def vote_with_voting_classifier(predicted_values, actual_values, weights=None):
+    estimators = [
+        (str(i), ConstantPredictionsClassifier(predictor_values))
+        for i, predictor_values in enumerate(predicted_values)
+    ]
+    ensemble = VotingClassifier(estimators, voting='hard', weights=weights)
+    ensemble = ensemble.fit(actual_values.reshape(-1, 1), actual_values)
+    return ensemble.predict(actual_values.reshape(-1, 1))
+
+
+class VoteAggregatorTest(unittest.TestCase):
+    def setUp(self):
+        random_state = numpy.random.RandomState(0)
+        self.__actual_values = random_state.randint(0, 3, 500)
+        self.__predicted_values = random_state.randint(0, 3, (10, 500))
+        self.__weights = random_state.rand(10)
+
+    def test_aggregate_matches_voting_classifier(self):
+        labels = numpy.unique(self.__actual_values)
+        vote_aggregator = VoteAggregator(len(labels), chunk_size=64)
+
+        self.assertEqual(
+            list(labels[vote_aggregator.aggregate(self.__predicted_values)]),
+            list(vote_with_voting_classifier(self.__predicted_values, self.__actual_values)),
+        )
+
+    def test_aggregate_weighted_matches_voting_classifier(self):
+        labels = numpy.unique(self.__actual_values)
+        vote_aggregator = VoteAggregator(len(labels), weights=self.__weights, chunk_size=64)
+
+        self.assertEqual(
+            list(labels[vote_aggregator.aggregate(self.__predicted_values)]),
+            list(vote_with_voting_classifier(self.__predicted_values, self.__actual_values, self.__weights)),
+        )
+
+    def test_tie_goes_to_lowest_code(self):
+        vote_aggregator = VoteAggregator(3)
+
+        winning_codes = vote_aggregator.aggregate(numpy.array([[2, 1, 0], [1, 2, -1]]))
+
+        self.assertEqual(list(winning_codes), [1, 1, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,10 +5,15 @@ import shutil
 import os
 from pprint import pprint
 
+import numpy
+from sklearn import metrics as sklearn_metrics
+
 from worker import utils
 from worker.fuser_policies.voting_fuser_policy import VotingFuserPolicy
 from worker.model_executor import ModelExecutor
 
+from helpers import ValuesModelExecutor
+
 
 THIS_DIRECTORY_PATH = os.path.dirname(os.path.abspath(__file__))
 
@@ -79,3 +84,96 @@ class VotingFuserPolicyTest(unittest.TestCase):
         )
         metrics = fuser_policy.fuse()
         pprint(metrics)
+
+    def test_fuse_matches_sklearn(self):
+        random_state = numpy.random.RandomState(0)
+        test_actual_values = random_state.randint(0, 2, 300)
+        models_predicted_values = [
+            numpy.where(random_state.rand(300) < 0.7, test_actual_values, 1 - test_actual_values)
+            for _ in range(8)
+        ]
+
+        fuser_policy = VotingFuserPolicy(
+            models_executors=[ValuesModelExecutor(predicted_values) for predicted_values in models_predicted_values],
+            training_data=None,
+            training_actual_values=None,
+            test_data=None,
+            test_actual_values=test_actual_values,
+            true_class_value=TRUE_CLASS_VALUE,
+            class_attribute_type=CLASS_ATTRIBUTE_TYPE,
+            configuration=None,
+        )
+        metrics = fuser_policy.fuse()
+
+        # Ties go to the lowest class value.
+        ensemble_predictions = (numpy.sum(models_predicted_values, axis=0) > len(models_predicted_values) / 2).astype(int)
+        self.assertEqual(metrics['accuracy'], sklearn_metrics.accuracy_score(test_actual_values, ensemble_predictions))
+        self.assertAlmostEqual(metrics['f-measure'], sklearn_metrics.f1_score(test_actual_values, ensemble_predictions))
+        self.assertAlmostEqual(metrics['mcc'], sklearn_metrics.matthews_corrcoef(test_actual_values, ensemble_predictions))
+        self.assertEqual(
+            metrics['true_positives'],
+            numpy.count_nonzero((test_actual_values == 1) & (ensemble_predictions == 1)),
+        )
+
+    def test_fuse_weights_match_duplicates(self):
+        random_state = numpy.random.RandomState(1)
+        test_actual_values = random_state.randint(0, 2, 300)
+        models_predicted_values = [
+            numpy.where(random_state.rand(300) < 0.7, test_actual_values, 1 - test_actual_values)
+            for _ in range(4)
+        ]
+        models_weights = [3, 1, 2, 2]
+
+        duplicated_models_executors = [
+            ValuesModelExecutor(predicted_values)
+            for predicted_values, weight in zip(models_predicted_values, models_weights)
+            for _ in range(weight)
+        ]
+
+        metrics = [
+            VotingFuserPolicy(
+                models_executors=models_executors,
+                training_data=None,
+                training_actual_values=None,
+                test_data=None,
+                test_actual_values=test_actual_values,
+                true_class_value=TRUE_CLASS_VALUE,
+                class_attribute_type=CLASS_ATTRIBUTE_TYPE,
+                configuration=configuration,
+            ).fuse()
+            for models_executors, configuration in [
+                (duplicated_models_executors, None),
+                ([ValuesModelExecutor(predicted_values) for predicted_values in models_predicted_values], {'weights': models_weights}),
+            ]
+        ]
+
+        self.assertEqual(metrics[0], metrics[1])
+
+    def test_fuse_unknown_predicted_values(self):
+        test_actual_values = numpy.array([0, 1, 1, 0, 1, 0])
+        models_predicted_values = [
+            numpy.array([0, 1, 1, 0, 0, 0]),
+            numpy.array([2, 2, 1, 2, 1, 2]),
+            numpy.array([2, 1, 2, 2, 1, 0]),
+            numpy.array([0, 1, 1, 1, 1, 0]),
+        ]
+
+        fuser_policy = VotingFuserPolicy(
+            models_executors=[ValuesModelExecutor(predicted_values) for predicted_values in models_predicted_values],
+            training_data=None,
+            training_actual_values=None,
+            test_data=None,
+            test_actual_values=test_actual_values,
+            true_class_value=TRUE_CLASS_VALUE,
+            class_attribute_type=CLASS_ATTRIBUTE_TYPE,
+            configuration=None,
+        )
+
+        # Frees some memory with invalid codes, likely reused by the predicted codes not yet filled.
+        invalid_codes = numpy.full((len(models_predicted_values), len(test_actual_values)), 100, dtype=numpy.int8)
+        del invalid_codes
+        metrics = fuser_policy.fuse()
+
+        # The label 2, not among the actual values, wins the fourth row.
+        self.assertEqual(metrics['true_positives'], 3)
+        self.assertEqual(metrics['false_positives'], 0)
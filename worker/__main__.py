@@ -1,20 +1,37 @@
 import os
-import tempfile
-import io
 import datetime
+import functools
+import math
 import socket
 import json
+import signal
+import threading
+import time
+import urllib.parse
 
 import click
-import requests
 import pymongo
 
 from worker.process_manager import ProcessManager
 from worker.amqp_manager import AMQPManager
+from worker.message_codec import MessageCodec
 from worker.filter_policies.majority_class_threshold_filter_policy import MajorityCostThresholdFilterPolicy
 from worker.fuser_policies.voting_fuser_policy import VotingFuserPolicy
 from worker import utils
 from worker.model_executor import ModelExecutor
+from worker.predict_server import PredictServer
+from worker.batch_model_executor import BatchModelExecutor
+from worker.model_deduplicator import ModelDeduplicator
+from worker.expression_model_executor import ExpressionModelExecutor
+from worker.expression_graph import ExpressionGraphExecutor
+from worker.execution_pool import BATCH_EXECUTION_MODE
+from worker.artifact_stores.artifact_store import Artifact, InlineArtifact
+from worker.artifact_stores.file_system_artifact_store import FileSystemArtifactStore
+from worker.dataset_cache import DatasetCache
+from worker.dataset_fetcher import DatasetFetcher
+from worker.pipeline import Pipeline
+from worker.extraction_cache import ExtractionCache, DEFAULT_MAXIMUM_SIZE as EXTRACTION_CACHE_DEFAULT_SIZE
+from worker.prediction_cache import PredictionCache
 
 
 LEARN_COMMAND_VARIABLE_NAME = 'CCUBE_LEARN_COMMAND'
@@ -32,23 +49,55 @@ PREDICT_COMMAND_VARIABLE_NAME = 'CCUBE_PREDICT_COMMAND'
 PREDICT_WORKING_DIRECTORY_VARIABLE_NAME = 'CCUBE_PREDICT_WORKING_DIRECTORY'
 PREDICT_INPUT_FILES_VARIABLE_NAME = 'CCUBE_PREDICT_INPUT_FILES'
 PREDICT_PREDICTIONS_FILE_VARIABLE_NAME = 'CCUBE_PREDICT_PREDICTIONS_FILE'
+PREDICT_PREDICTIONS_FORMAT_VARIABLE_NAME = 'CCUBE_PREDICT_PREDICTIONS_FORMAT'
+PREDICT_PREDICTIONS_DTYPE_VARIABLE_NAME = 'CCUBE_PREDICT_PREDICTIONS_DTYPE'
+PREDICT_SHARDS_VARIABLE_NAME = 'CCUBE_PREDICT_SHARDS'
+PREDICT_SERVER_COMMAND_VARIABLE_NAME = 'CCUBE_PREDICT_SERVER_COMMAND'
+PREDICT_SERVER_PROCESSES_VARIABLE_NAME = 'CCUBE_PREDICT_SERVER_PROCESSES'
+PREDICT_SERVER_TIMEOUT_VARIABLE_NAME = 'CCUBE_PREDICT_SERVER_TIMEOUT'
+PREDICT_BATCH_COMMAND_VARIABLE_NAME = 'CCUBE_PREDICT_BATCH_COMMAND'
+PREDICT_BACKEND_VARIABLE_NAME = 'CCUBE_PREDICT_BACKEND'
+PREDICT_EXPRESSION_MODEL_FILE_VARIABLE_NAME = 'CCUBE_PREDICT_EXPRESSION_MODEL_FILE'
 
 PREDICT_DATASET_FILE_VARIABLE_NAME = 'CCUBE_PREDICT_DATASET_FILE'
 PREDICT_PARAMETERS_PROPERTIES_FILE_VARIABLE_NAME = 'CCUBE_PREDICT_PARAMETERS_PROPERTIES_FILE'
 
+SCRATCH_DIRECTORY_VARIABLE_NAME = 'CCUBE_SCRATCH_DIRECTORY'
+ARTIFACT_STORE_URL_VARIABLE_NAME = 'CCUBE_ARTIFACT_STORE_URL'
+AMQP_CODEC_VARIABLE_NAME = 'CCUBE_AMQP_CODEC'
+AMQP_COMPRESSION_VARIABLE_NAME = 'CCUBE_AMQP_COMPRESSION'
+DATASET_CACHE_DIRECTORY_VARIABLE_NAME = 'CCUBE_DATASET_CACHE_DIRECTORY'
+DATASET_CACHE_SIZE_VARIABLE_NAME = 'CCUBE_DATASET_CACHE_SIZE'
+EXTRACTION_CACHE_DIRECTORY_VARIABLE_NAME = 'CCUBE_EXTRACTION_CACHE_DIRECTORY'
+EXTRACTION_CACHE_SIZE_VARIABLE_NAME = 'CCUBE_EXTRACTION_CACHE_SIZE'
+PREDICTION_CACHE_DIRECTORY_VARIABLE_NAME = 'CCUBE_PREDICTION_CACHE_DIRECTORY'
+PREDICTION_CACHE_SIZE_VARIABLE_NAME = 'CCUBE_PREDICTION_CACHE_SIZE'
+PREDICTION_CACHE_BYPASS_VARIABLE_NAME = 'CCUBE_PREDICTION_CACHE_BYPASS'
+
+FILTER_STREAMING_VARIABLE_NAME = 'CCUBE_FILTER_STREAMING'
+FILTER_COLLAPSE_DUPLICATES_VARIABLE_NAME = 'CCUBE_FILTER_COLLAPSE_DUPLICATES'
+
+COMMAND_PREDICT_BACKEND = 'command'
+EXPRESSION_PREDICT_BACKEND = 'expression'
+
+
+EXECUTION_MODE_VARIABLE_NAME = 'CCUBE_EXECUTION_MODE'
+EXECUTION_WORKERS_VARIABLE_NAME = 'CCUBE_EXECUTION_WORKERS'
+EXECUTION_BATCH_SIZE_VARIABLE_NAME = 'CCUBE_EXECUTION_BATCH_SIZE'
+
 GET_DATASET_FUSION_SPLIT_REQUEST_URL = 'http://{hostname_}:{port_}/dataset/{dataset_name_}/split/fusion'
 GET_DATASET_FUSION_SPLIT_CLASS_REQUEST_URL = 'http://{hostname_}:{port_}/dataset/{dataset_name_}/split/fusion/class'
 GET_DATASET_TEST_SPLIT_REQUEST_URL = 'http://{hostname_}:{port_}/dataset/{dataset_name_}/split/test'
 GET_DATASET_TEST_SPLIT_CLASS_REQUEST_URL = 'http://{hostname_}:{port_}/dataset/{dataset_name_}/split/test/class'
 
-DATA_CHUNK_SIZE = 4096
-
 LEARN_TASKS_QUEUE_NAME = '{job_name_}@learner.tasks'
 LEARN_OUTPUTS_QUEUE_NAME = '{job_name_}@learner.outputs'
 FILTER_TASKS_QUEUE_NAME = '{job_name_}@filter.tasks'
 FILTER_OUTPUTS_QUEUE_NAME = '{job_name_}@filter.outputs'
 FUSER_TASKS_QUEUE_NAME = '{job_name_}@fuser.tasks'
 
+DAEMON_POLLING_SECONDS = 1
+
 
 @click.group()
 def cli():
@@ -57,7 +106,10 @@ def cli():
 
 @cli.command()
 @click.option('--job', '-j', 'job_name', type=str, required=True)
-def learn(job_name):
+@click.option('--daemon', '-d', 'daemon', is_flag=True, default=False)
+@click.option('--prefetch', '-p', 'prefetch_count', type=int, default=1)
+@click.option('--idle-timeout', '-i', 'idle_timeout', type=float, default=None)
+def learn(job_name, daemon, prefetch_count, idle_timeout):
     """
     Start the learning phase.
 
@@ -79,9 +131,16 @@ def learn(job_name):
 
     :param job_name: the name of the job
     :type job_name: str
-    """
-    learner_start_time = datetime.datetime.utcnow()
 
+    :param daemon: if True, keeps consuming tasks until idle or stopped
+    :type daemon: bool
+
+    :param prefetch_count: the number of tasks the broker can deliver in advance
+    :type prefetch_count: int
+
+    :param idle_timeout: the seconds without tasks after which the daemon stops, never if not provided
+    :type idle_timeout: float
+    """
     # Get ip and hostname
     hostname = socket.gethostname()
     ip = socket.gethostbyname(hostname)
@@ -107,118 +166,128 @@ def learn(job_name):
     learner_outputs_queue_name = LEARN_OUTPUTS_QUEUE_NAME.format(job_name_=job_name)
 
     # Creates the queues, if they do not exist.
-    amqp_manager = AMQPManager(environment_variables.get('AMQP_HOSTNAME', 'rabbitmq'))
+    amqp_manager = AMQPManager(
+        environment_variables.get('AMQP_HOSTNAME', 'rabbitmq'),
+        message_codec=create_message_codec(environment_variables),
+    )
     amqp_manager.create_queue(learner_tasks_queue_name)
     amqp_manager.create_queue(learner_outputs_queue_name)
 
-    # Consumes a task.
-    tasks, delivery_tags = amqp_manager.consume_messages(learner_tasks_queue_name, 1)
-    task = tasks[0]
+    # Opens the dataset fetcher, shared by the tasks.
+    dataset_fetcher = create_dataset_fetcher(environment_variables)
 
-    # Stores the start time.
-    times.insert_one({
-        'ip': ip,
-        'hostname': hostname,
-        'random_seed': task.get('random_seed'),
-        'type': 'learner_start',
-        'time': learner_start_time,
-    })
+    # Opens the artifact store.
+    artifact_store = create_artifact_store(environment_variables)
 
-    # Gets the sample.
-    request_params = {
-        'training_rate': task.get('training_rate'),
-        'sample_rate': task.get('sample_rate'),
-        'sample_number': task.get('task_number'),
-        'class_attribute': task.get('class_attribute'),
-        'include_attributes': task.get('include_attributes'),
-        'exclude_attributes': task.get('exclude_attributes'),
-        'attributes_rate': task.get('attributes_rate'),
-        'random_seed': task.get('random_seed'),
-        'include_header': task.get('include_header'),
-    }
-    response = requests.get(
-        GET_DATASET_TRAINING_SAMPLE_REQUEST_URL.format(
-            hostname_=environment_variables.get('FACTORIZER_HOSTNAME', 'factorizer'),
-            port_=environment_variables.get('FACTORIZER_PORT', '5000'),
-            dataset_name_=task.get('dataset_name'),
-        ),
-        params=request_params,
-        stream=True,
-    )
+    # Consumes the tasks.
+    tasks = iterate_tasks(amqp_manager, learner_tasks_queue_name, daemon, prefetch_count, idle_timeout)
+    for task, delivery_tags in tasks:
+        # Stores the start time, once the task is received.
+        times.insert_one({
+            'ip': ip,
+            'hostname': hostname,
+            'random_seed': task.get('random_seed'),
+            'type': 'learner_start',
+            'time': datetime.datetime.utcnow(),
+        })
 
-    # Saves the response into a temporary file.
-    training_file = tempfile.NamedTemporaryFile()
-    for chunk in response.iter_content(chunk_size=DATA_CHUNK_SIZE):
-        if chunk:
-            training_file.write(chunk)
-    training_file.flush()
-    training_file.seek(0)
-
-    # Extracts the learn parameters.
-    learn_parameters = task.get('learn_parameters')
-
-    # Prepares the process manager.
-    process_manager = ProcessManager(
-        command=learn_command,
-        working_directory=learn_working_directory,
-        environment_variables=environment_variables,
-    )
+        # Gets the sample.
+        request_params = {
+            'training_rate': task.get('training_rate'),
+            'sample_rate': task.get('sample_rate'),
+            'sample_number': task.get('task_number'),
+            'class_attribute': task.get('class_attribute'),
+            'include_attributes': task.get('include_attributes'),
+            'exclude_attributes': task.get('exclude_attributes'),
+            'attributes_rate': task.get('attributes_rate'),
+            'random_seed': task.get('random_seed'),
+            'include_header': task.get('include_header'),
+        }
+        training_file = dataset_fetcher.fetch(
+            GET_DATASET_TRAINING_SAMPLE_REQUEST_URL,
+            task.get('dataset_name'),
+            request_params,
+        )
 
-    # Adds the environment variables.
-    process_manager.add_environment_variables(get_duration_variables(task.get('duration')))
-    process_manager.add_environment_variables({LEARN_DATASET_FILE_VARIABLE_NAME: training_file.name})
+        # Extracts the learn parameters.
+        learn_parameters = task.get('learn_parameters')
 
-    # Prepares the learn properties.
-    string_learn_properties = utils.convert_values_to_string(learn_parameters)
+        # Prepares the process manager.
+        process_manager = ProcessManager(
+            command=learn_command,
+            working_directory=learn_working_directory,
+            environment_variables=environment_variables,
+        )
 
-    process_manager.add_environment_variables(string_learn_properties)
+        # Adds the environment variables.
+        process_manager.add_environment_variables(get_duration_variables(task.get('duration')))
+        process_manager.add_environment_variables({LEARN_DATASET_FILE_VARIABLE_NAME: training_file.name})
 
-    properties_file = utils.create_temporary_properties_file(string_learn_properties)
-    process_manager.add_environment_variables({LEARN_PARAMETERS_PROPERTIES_FILE_VARIABLE_NAME: properties_file.name})
+        # Prepares the learn properties.
+        string_learn_properties = utils.convert_values_to_string(learn_parameters)
 
-    # Echoes the command.
-    process_manager.echo()
+        process_manager.add_environment_variables(string_learn_properties)
 
-    # Runs the process.
-    stdout, return_code = process_manager.run()
+        properties_file = utils.create_temporary_properties_file(string_learn_properties)
+        process_manager.add_environment_variables({LEARN_PARAMETERS_PROPERTIES_FILE_VARIABLE_NAME: properties_file.name})
 
-    # Prepares the output message.
-    learner_success = (return_code == 0)
-    learner_output_zip_stream = None
+        # Echoes the command.
+        process_manager.echo()
 
-    if learner_success:
-        learner_output_zip_stream = utils.create_zip_base64_string(learn_output_files)
-    learner_output_message = {
-        'success': learner_success,
-        'files': learner_output_zip_stream,
-    }
+        # Runs the process.
+        stdout, return_code = process_manager.run()
 
-    # Writes the output message in the outputs queue.
-    amqp_manager.publish_messages(learner_outputs_queue_name, [learner_output_message])
+        # Prepares the output message, referring to the stored artifact if the artifact store is configured.
+        learner_success = (return_code == 0)
+        learner_output_message = {
+            'success': learner_success,
+        }
 
-    # Closes the temporary files.
-    properties_file.close()
-    training_file.close()
+        if artifact_store is not None:
+            learner_output_message['artifact'] = None
+            if learner_success:
+                learner_output_message['artifact'] = artifact_store.put(utils.create_zip_bytes(learn_output_files))
+        else:
+            # Sends the zip bytes, that the message codec encodes as base64 strings or raw binary segments.
+            learner_output_message['files'] = None
+            if learner_success:
+                learner_output_message['files'] = utils.create_zip_bytes(learn_output_files)
 
-    # Acknowledges the task.
-    amqp_manager.acknowledge_messages(learner_tasks_queue_name, delivery_tags)
+        # Writes the output message in the outputs queue.
+        amqp_manager.publish_messages(learner_outputs_queue_name, [learner_output_message])
 
-    # Closes the connection with AMQP.
-    amqp_manager.close()
+        # Closes the temporary files.
+        properties_file.close()
+        training_file.close()
 
-    # Stores the finish time.
-    times.insert_one({
-        'ip': ip,
-        'hostname': hostname,
-        'random_seed': task.get('random_seed'),
-        'type': 'learner_finish',
-        'time': datetime.datetime.utcnow(),
-    })
+        # Acknowledges the task.
+        amqp_manager.acknowledge_messages(learner_tasks_queue_name, delivery_tags)
+
+        # Stores the finish time.
+        times.insert_one({
+            'ip': ip,
+            'hostname': hostname,
+            'random_seed': task.get('random_seed'),
+            'type': 'learner_finish',
+            'time': datetime.datetime.utcnow(),
+            'downloads': dataset_fetcher.statistics,
+        })
+
+        # Clears the statistics for the next task.
+        dataset_fetcher.clear_statistics()
+
+    # Closes the connections.
+    dataset_fetcher.close()
+    amqp_manager.close()
+    mongodb_client.close()
 
 
 @cli.command()
 @click.option('--job', '-j', 'job_name', type=str, required=True)
-def filter(job_name):
+@click.option('--daemon', '-d', 'daemon', is_flag=True, default=False)
+@click.option('--prefetch', '-p', 'prefetch_count', type=int, default=1)
+@click.option('--idle-timeout', '-i', 'idle_timeout', type=float, default=None)
+def filter(job_name, daemon, prefetch_count, idle_timeout):
     """
     Filters the models and sends the selected to the Fuser queue.
 
@@ -239,9 +308,16 @@ def filter(job_name):
 
     :param job_name: the name of the job
     :type job_name: str
-    """
-    filter_start_time = datetime.datetime.utcnow()
 
+    :param daemon: if True, keeps consuming tasks until idle or stopped
+    :type daemon: bool
+
+    :param prefetch_count: the number of tasks the broker can deliver in advance
+    :type prefetch_count: int
+
+    :param idle_timeout: the seconds without tasks after which the daemon stops, never if not provided
+    :type idle_timeout: float
+    """
     # Get ip and hostname
     hostname = socket.gethostname()
     ip = socket.gethostbyname(hostname)
@@ -259,6 +335,13 @@ def filter(job_name):
 
     predict_predictions_file = environment_variables.get(PREDICT_PREDICTIONS_FILE_VARIABLE_NAME, "")
     predict_predictions_file = os.path.expandvars(predict_predictions_file)
+    predict_predictions_format = environment_variables.get(PREDICT_PREDICTIONS_FORMAT_VARIABLE_NAME) or None
+    predict_predictions_dtype = environment_variables.get(PREDICT_PREDICTIONS_DTYPE_VARIABLE_NAME) or None
+
+    scratch_directory = environment_variables.get(SCRATCH_DIRECTORY_VARIABLE_NAME)
+    extraction_cache = create_extraction_cache(environment_variables)
+    prediction_cache = create_prediction_cache(environment_variables)
+    predict_server = create_predict_server(environment_variables)
 
     # Retrieves the queues names.
     learner_outputs_queue_name = LEARN_OUTPUTS_QUEUE_NAME.format(job_name_=job_name)
@@ -266,149 +349,139 @@ def filter(job_name):
     filter_outputs_queue_name = FILTER_OUTPUTS_QUEUE_NAME.format(job_name_=job_name)
 
     # Creates the queues, if they do not exist.
-    amqp_manager = AMQPManager(environment_variables.get('AMQP_HOSTNAME', 'rabbitmq'))
+    amqp_manager = AMQPManager(
+        environment_variables.get('AMQP_HOSTNAME', 'rabbitmq'),
+        message_codec=create_message_codec(environment_variables),
+    )
     amqp_manager.create_queue(filter_tasks_queue_name)
     amqp_manager.create_queue(filter_outputs_queue_name)
 
-    # Consumes a task.
-    tasks, filter_tasks_delivery_tags = amqp_manager.consume_messages(filter_tasks_queue_name, 1)
-    task = tasks[0]
-
-    # Stores the start time.
-    times.insert_one({
-        'ip': ip,
-        'hostname': hostname,
-        'random_seed': task.get('random_seed'),
-        'type': 'filter_start',
-        'time': filter_start_time,
-    })
-
-    # Gets the fusion split.
-    request_params = {
-        'training_rate': task.get('training_rate'),
-        'fusion_rate': task.get('fusion_rate'),
-        'class_attribute': task.get('class_attribute'),
-        'include_attributes': task.get('include_attributes'),
-        'exclude_attributes': task.get('exclude_attributes'),
-        'attributes_rate': task.get('attributes_rate'),
-        'random_seed': task.get('random_seed'),
-        'include_header': task.get('include_header'),
-    }
-
-    response = requests.get(
-        GET_DATASET_FUSION_SPLIT_REQUEST_URL.format(
-            hostname_=environment_variables.get('FACTORIZER_HOSTNAME', 'factorizer'),
-            port_=environment_variables.get('FACTORIZER_PORT', '5000'),
-            dataset_name_=task.get('dataset_name'),
-        ),
-        params=request_params,
-        stream=True,
-    )
-
-    # Saves the response into a temporary file.
-    fusion_file = tempfile.NamedTemporaryFile()
-    for chunk in response.iter_content(chunk_size=DATA_CHUNK_SIZE):
-        if chunk:
-            fusion_file.write(chunk)
-    fusion_file.flush()
-    fusion_file.seek(0)
-
-    # Gets the fusion split class column, the actual values.
-    request_params = {
-        'training_rate': task.get('training_rate'),
-        'fusion_rate': task.get('fusion_rate'),
-        'class_attribute': task.get('class_attribute'),
-        'random_seed': task.get('random_seed'),
-        'include_header': task.get('include_header'),
-    }
-
-    response = requests.get(
-        GET_DATASET_FUSION_SPLIT_CLASS_REQUEST_URL.format(
-            hostname_=environment_variables.get('FACTORIZER_HOSTNAME', 'factorizer'),
-            port_=environment_variables.get('FACTORIZER_PORT', '5000'),
-            dataset_name_=task.get('dataset_name'),
-        ),
-        params=request_params,
-        stream=True,
-    )
-
-    # Retrieves the actual values.
-    actual_values = utils.read_values_from_file(io.BytesIO(response.content))
-
-    # Extracts the predict parameters.
-    predict_parameters = task.get('predict_parameters')
-
-    # Consumes the learner outputs.
-    learner_outputs_number = task.get('learner_outputs_number')
-    learner_outputs, learner_outputs_delivery_tags = amqp_manager.consume_messages(learner_outputs_queue_name, learner_outputs_number)
-
-    # Iterates all the learner outputs.
-    learner_output_zip_streams = []
-    models_executors = []
+    # Opens the dataset fetcher, shared by the tasks.
+    dataset_fetcher = create_dataset_fetcher(environment_variables)
 
-    for learner_output in learner_outputs:
-        if not learner_output.get('success'):
-            continue
+    # Opens the artifact store.
+    artifact_store = create_artifact_store(environment_variables)
 
-        # Creates the model executor.
-        models_executors.append(
-            ModelExecutor(
-                model_files_stream=learner_output.get('files'),
-                model_parameters=predict_parameters,
+    # Consumes the tasks.
+    tasks = iterate_tasks(amqp_manager, filter_tasks_queue_name, daemon, prefetch_count, idle_timeout)
+    for task, filter_tasks_delivery_tags in tasks:
+        # Stores the start time, once the task is received.
+        times.insert_one({
+            'ip': ip,
+            'hostname': hostname,
+            'random_seed': task.get('random_seed'),
+            'type': 'filter_start',
+            'time': datetime.datetime.utcnow(),
+        })
+
+        # Prepares the model executors factory, evaluating the expression models in the worker if requested.
+        if get_predict_backend(task, environment_variables) == EXPRESSION_PREDICT_BACKEND:
+            create_model_executor = functools.partial(
+                ExpressionModelExecutor,
+                model_file_name=environment_variables.get(PREDICT_EXPRESSION_MODEL_FILE_VARIABLE_NAME),
+                header_lines_number=get_header_lines_number(task),
+            )
+        else:
+            create_model_executor = functools.partial(
+                ModelExecutor,
+                model_files_stream=None,
+                model_parameters=task.get('predict_parameters'),
                 predictions_file_path=predict_predictions_file,
                 execution_command=predict_command,
                 working_directory=predict_working_directory,
                 environment_variables=environment_variables,
+                scratch_directory=scratch_directory,
+                extraction_cache=extraction_cache,
+                values_type=task.get('class_attribute_type'),
+                predictions_format=predict_predictions_format,
+                predictions_dtype=predict_predictions_dtype,
+                shards_number=get_predict_shards_number(task, environment_variables),
+                header_lines_number=get_header_lines_number(task),
+                predict_server=predict_server,
             )
-        )
-
-        # Saves the learner output zip stream.
-        learner_output_zip_streams.append(learner_output.get('files'))
-
-    # Applies the filter policy.
-    filter_policy = MajorityCostThresholdFilterPolicy(
-        models_executors=models_executors,
-        training_data=fusion_file.name,
-        actual_values=actual_values,
-        true_class_value=task.get('true_class_value'),
-        class_attribute_type=task.get('class_attribute_type'),
-        configuration={'threshold': task.get('threshold')},
-    )
-    filtered_models = filter_policy.filter()
 
-    # Sends the filtered model to the fuser.
-    filtered_learner_output_zip_streams = []
-    for i in range(len(filtered_models)):
-        if filtered_models[i]:
-            filtered_learner_output_zip_streams.append(learner_output_zip_streams[i])
-
-    filter_output_message = [{'files': stream} for stream in filtered_learner_output_zip_streams]
-
-    amqp_manager.publish_messages(filter_outputs_queue_name, [filter_output_message])
-
-    # Closes the temporary files.
-    fusion_file.close()
-
-    # Acknowledges the task.
-    amqp_manager.acknowledge_messages(filter_tasks_queue_name, filter_tasks_delivery_tags)
-    amqp_manager.acknowledge_messages(learner_outputs_queue_name, learner_outputs_delivery_tags)
+        # Prepares the filter of the learner outputs.
+        filter_learner_outputs_task = functools.partial(
+            filter_learner_outputs,
+            task=task,
+            dataset_fetcher=dataset_fetcher,
+            artifact_store=artifact_store,
+            create_model_executor=create_model_executor,
+            environment_variables=environment_variables,
+            prediction_cache=prediction_cache,
+        )
 
-    # Closes the connection with AMQP.
+        # Evaluates each learner output as soon as it arrives in streaming mode.
+        pipeline = None
+        if is_streaming(task, environment_variables):
+            pipeline = Pipeline(filter_learner_outputs_task)
+
+        # Consumes the learner outputs, until the quorum or the deadline if any, or until the filter fails.
+        learner_outputs_number = task.get('learner_outputs_number')
+        learner_outputs = amqp_manager.iterate_messages(
+            learner_outputs_queue_name,
+            get_quorum_number(task),
+            deadline=get_deadline(task),
+            stop_event=pipeline.stopped if pipeline is not None else None,
+        )
+        learner_outputs_delivery_tags = []
+        learner_outputs = collect_delivery_tags(learner_outputs, learner_outputs_delivery_tags)
+
+        # Filters the models.
+        if pipeline is not None:
+            filter_output_message = pipeline.run(learner_outputs)
+        else:
+            filter_output_message = filter_learner_outputs_task(list(learner_outputs))
+
+        # Sends the filtered model to the fuser.
+        amqp_manager.publish_messages(filter_outputs_queue_name, [filter_output_message])
+
+        # Cancels the consumer, requeuing the learner outputs delivered but not consumed, so that the late ones are
+        # left to the other filter tasks and the next task starts a new consumer.
+        missing_learner_outputs_number = learner_outputs_number - len(learner_outputs_delivery_tags)
+        amqp_manager.cancel_consumer(learner_outputs_queue_name)
+
+        # Acknowledges the task.
+        amqp_manager.acknowledge_messages(filter_tasks_queue_name, filter_tasks_delivery_tags)
+        amqp_manager.acknowledge_messages(learner_outputs_queue_name, learner_outputs_delivery_tags)
+
+        # Stores the finish time.
+        times.insert_one({
+            'ip': ip,
+            'hostname': hostname,
+            'random_seed': task.get('random_seed'),
+            'type': 'filter_finish',
+            'time': datetime.datetime.utcnow(),
+            'downloads': dataset_fetcher.statistics,
+            'predictions': prediction_cache.statistics if prediction_cache is not None else None,
+            'missing_learner_outputs': missing_learner_outputs_number,
+        })
+
+        # Clears the statistics for the next task.
+        dataset_fetcher.clear_statistics()
+        if prediction_cache is not None:
+            prediction_cache.clear_statistics()
+
+    # Stops the predict server.
+    if predict_server is not None:
+        predict_server.close()
+
+    # Removes the extracted model files.
+    if extraction_cache is not None:
+        extraction_cache.close()
+
+    # Closes the connections.
+    dataset_fetcher.close()
     amqp_manager.close()
-
-    # Stores the finish time.
-    times.insert_one({
-        'ip': ip,
-        'hostname': hostname,
-        'random_seed': task.get('random_seed'),
-        'type': 'filter_finish',
-        'time': datetime.datetime.utcnow(),
-    })
+    mongodb_client.close()
 
 
 @cli.command()
 @click.option('--job', '-j', 'job_name', type=str, required=True)
-def fuser(job_name):
+@click.option('--daemon', '-d', 'daemon', is_flag=True, default=False)
+@click.option('--prefetch', '-p', 'prefetch_count', type=int, default=1)
+@click.option('--idle-timeout', '-i', 'idle_timeout', type=float, default=None)
+def fuser(job_name, daemon, prefetch_count, idle_timeout):
     """
     Fuses the models and sends the ensemble.
 
@@ -429,9 +502,16 @@ def fuser(job_name):
 
     :param job_name: the name of the job
     :type job_name: str
-    """
-    fuser_start_time = datetime.datetime.utcnow()
 
+    :param daemon: if True, keeps consuming tasks until idle or stopped
+    :type daemon: bool
+
+    :param prefetch_count: the number of tasks the broker can deliver in advance
+    :type prefetch_count: int
+
+    :param idle_timeout: the seconds without tasks after which the daemon stops, never if not provided
+    :type idle_timeout: float
+    """
     # Get ip and hostname
     hostname = socket.gethostname()
     ip = socket.gethostbyname(hostname)
@@ -450,179 +530,761 @@ def fuser(job_name):
 
     predict_predictions_file = environment_variables.get(PREDICT_PREDICTIONS_FILE_VARIABLE_NAME, "")
     predict_predictions_file = os.path.expandvars(predict_predictions_file)
+    predict_predictions_format = environment_variables.get(PREDICT_PREDICTIONS_FORMAT_VARIABLE_NAME) or None
+    predict_predictions_dtype = environment_variables.get(PREDICT_PREDICTIONS_DTYPE_VARIABLE_NAME) or None
+
+    scratch_directory = environment_variables.get(SCRATCH_DIRECTORY_VARIABLE_NAME)
+    extraction_cache = create_extraction_cache(environment_variables)
+    prediction_cache = create_prediction_cache(environment_variables)
+    predict_server = create_predict_server(environment_variables)
 
     # Retrieves the queues names.
     filter_outputs_queue_name = FILTER_OUTPUTS_QUEUE_NAME.format(job_name_=job_name)
     fuser_tasks_queue_name = FUSER_TASKS_QUEUE_NAME.format(job_name_=job_name)
 
     # Creates the queues, if they do not exist.
-    amqp_manager = AMQPManager(environment_variables.get('AMQP_HOSTNAME', 'rabbitmq'))
+    amqp_manager = AMQPManager(
+        environment_variables.get('AMQP_HOSTNAME', 'rabbitmq'),
+        message_codec=create_message_codec(environment_variables),
+    )
     amqp_manager.create_queue(filter_outputs_queue_name)
     amqp_manager.create_queue(fuser_tasks_queue_name)
 
-    # Consumes a task.
-    tasks, fuser_tasks_delivery_tags = amqp_manager.consume_messages(fuser_tasks_queue_name, 1)
-    task = tasks[0]
+    # Opens the dataset fetcher, shared by the tasks.
+    dataset_fetcher = create_dataset_fetcher(environment_variables)
 
-    # Stores the start time.
-    times.insert_one({
-        'ip': ip,
-        'hostname': hostname,
-        'random_seed': task.get('random_seed'),
-        'type': 'fuser_start',
-        'time': fuser_start_time,
-    })
-
-    # Gets the fusion split.
-    fusion_response = requests.get(
-        GET_DATASET_FUSION_SPLIT_REQUEST_URL.format(
-            hostname_=environment_variables.get('FACTORIZER_HOSTNAME', 'factorizer'),
-            port_=environment_variables.get('FACTORIZER_PORT', '5000'),
-            dataset_name_=task.get('dataset_name'),
-        ),
-        params={
-            'training_rate': task.get('training_rate'),
-            'fusion_rate': task.get('fusion_rate'),
-            'class_attribute': task.get('class_attribute'),
-            'include_attributes': task.get('include_attributes'),
-            'exclude_attributes': task.get('exclude_attributes'),
-            'attributes_rate': task.get('attributes_rate'),
-            'random_seed': task.get('random_seed'),
-            'include_header': task.get('include_header'),
-        },
-        stream=True,
-    )
-    fusion_file = tempfile.NamedTemporaryFile()
-    for chunk in fusion_response.iter_content(chunk_size=DATA_CHUNK_SIZE):
-        if chunk:
-            fusion_file.write(chunk)
-    fusion_file.flush()
-    fusion_file.seek(0)
-
-    # Gets the fusion split actual values.
-    fusion_response = requests.get(
-        GET_DATASET_FUSION_SPLIT_CLASS_REQUEST_URL.format(
-            hostname_=environment_variables.get('FACTORIZER_HOSTNAME', 'factorizer'),
-            port_=environment_variables.get('FACTORIZER_PORT', '5000'),
-            dataset_name_=task.get('dataset_name'),
-        ),
-        params={
-            'training_rate': task.get('training_rate'),
-            'fusion_rate': task.get('fusion_rate'),
-            'class_attribute': task.get('class_attribute'),
-            'random_seed': task.get('random_seed'),
-            'include_header': task.get('include_header'),
-        },
-        stream=True,
-    )
-    fusion_actual_values = utils.read_values_from_file(io.BytesIO(fusion_response.content))
-
-    # Gets the test split.
-    test_response = requests.get(
-        GET_DATASET_TEST_SPLIT_REQUEST_URL.format(
-            hostname_=environment_variables.get('FACTORIZER_HOSTNAME', 'factorizer'),
-            port_=environment_variables.get('FACTORIZER_PORT', '5000'),
-            dataset_name_=task.get('dataset_name'),
-        ),
-        params={
-            'training_rate': task.get('training_rate'),
-            'fusion_rate': task.get('fusion_rate'),
-            'class_attribute': task.get('class_attribute'),
-            'include_attributes': task.get('include_attributes'),
-            'exclude_attributes': task.get('exclude_attributes'),
-            'attributes_rate': task.get('attributes_rate'),
-            'random_seed': task.get('random_seed'),
-            'include_header': task.get('include_header'),
-        },
-        stream=True,
-    )
-    test_file = tempfile.NamedTemporaryFile()
-    for chunk in test_response.iter_content(chunk_size=DATA_CHUNK_SIZE):
-        if chunk:
-            test_file.write(chunk)
-    test_file.flush()
-    test_file.seek(0)
-
-    # Gets the fusion split actual values.
-    test_response = requests.get(
-        GET_DATASET_TEST_SPLIT_CLASS_REQUEST_URL.format(
-            hostname_=environment_variables.get('FACTORIZER_HOSTNAME', 'factorizer'),
-            port_=environment_variables.get('FACTORIZER_PORT', '5000'),
-            dataset_name_=task.get('dataset_name'),
-        ),
-        params={
-            'training_rate': task.get('training_rate'),
-            'fusion_rate': task.get('fusion_rate'),
-            'class_attribute': task.get('class_attribute'),
+    # Opens the artifact store.
+    artifact_store = create_artifact_store(environment_variables)
+
+    # Consumes the tasks.
+    tasks = iterate_tasks(amqp_manager, fuser_tasks_queue_name, daemon, prefetch_count, idle_timeout)
+    for task, fuser_tasks_delivery_tags in tasks:
+        # Stores the start time, once the task is received.
+        times.insert_one({
+            'ip': ip,
+            'hostname': hostname,
             'random_seed': task.get('random_seed'),
-            'include_header': task.get('include_header'),
-        },
-        stream=True,
-    )
-    test_actual_values = utils.read_values_from_file(io.BytesIO(test_response.content))
-
-    # Extracts the predict parameters.
-    predict_parameters = task.get('predict_parameters')
-
-    # Consumes one filter output from the filter queue.
-    filter_outputs, filter_outputs_delivery_tags = amqp_manager.consume_messages(filter_outputs_queue_name, 1)
-    filter_output = filter_outputs[0]
-
-    # Iterates all the filter outputs.
-    models_executors = []
-    for model_message in filter_output:
-        # Creates the model executor.
-        models_executors.append(
-            ModelExecutor(
-                model_files_stream=model_message.get('files'),
+            'type': 'fuser_start',
+            'time': datetime.datetime.utcnow(),
+        })
+
+        # Gets the fusion and test splits, with their class columns.
+        fusion_file, fusion_class_file, test_file, test_class_file = dataset_fetcher.fetch_all(
+            task.get('dataset_name'),
+            [
+                (GET_DATASET_FUSION_SPLIT_REQUEST_URL, get_split_request_params(task)),
+                (GET_DATASET_FUSION_SPLIT_CLASS_REQUEST_URL, get_split_class_request_params(task)),
+                (GET_DATASET_TEST_SPLIT_REQUEST_URL, get_split_request_params(task)),
+                (GET_DATASET_TEST_SPLIT_CLASS_REQUEST_URL, get_split_class_request_params(task)),
+            ],
+        )
+
+        # Retrieves the actual values.
+        fusion_actual_values = utils.read_values_from_file(fusion_class_file.name, task.get('class_attribute_type'))
+        fusion_class_file.close()
+        test_actual_values = utils.read_values_from_file(test_class_file.name, task.get('class_attribute_type'))
+        test_class_file.close()
+
+        # Extracts the predict parameters.
+        predict_parameters = task.get('predict_parameters')
+
+        # Consumes one filter output from the filter queue.
+        filter_outputs, filter_outputs_delivery_tags = amqp_manager.consume_messages(filter_outputs_queue_name, 1)
+        filter_output = filter_outputs[0]
+
+        # Prepares the model executors factory, evaluating the expression models in the worker if requested.
+        if get_predict_backend(task, environment_variables) == EXPRESSION_PREDICT_BACKEND:
+            create_model_executor = functools.partial(
+                ExpressionModelExecutor,
+                model_file_name=environment_variables.get(PREDICT_EXPRESSION_MODEL_FILE_VARIABLE_NAME),
+                header_lines_number=get_header_lines_number(task),
+            )
+        else:
+            create_model_executor = functools.partial(
+                ModelExecutor,
+                model_files_stream=None,
                 model_parameters=predict_parameters,
                 predictions_file_path=predict_predictions_file,
                 execution_command=predict_command,
                 working_directory=predict_working_directory,
                 environment_variables=environment_variables,
+                scratch_directory=scratch_directory,
+                extraction_cache=extraction_cache,
+                values_type=task.get('class_attribute_type'),
+                predictions_format=predict_predictions_format,
+                predictions_dtype=predict_predictions_dtype,
+                shards_number=get_predict_shards_number(task, environment_variables),
+                header_lines_number=get_header_lines_number(task),
+                predict_server=predict_server,
+            )
+
+        # Iterates all the filter outputs, executing once the same models and summing their weights.
+        models_executors = []
+        models_weights = []
+        model_deduplicator = ModelDeduplicator()
+        for model_message in filter_output:
+            model_artifact = create_model_artifact(model_message, artifact_store)
+            model_index, new_model = model_deduplicator.add(model_artifact)
+
+            # Creates the model executor.
+            if new_model:
+                models_executors.append(create_model_executor(model_artifact=model_artifact))
+                models_weights.append(0)
+            models_weights[model_index] += model_message.get('weight', 1)
+
+        # Applies the fuser policy.
+        fuser_policy = VotingFuserPolicy(
+            models_executors=models_executors,
+            training_data=fusion_file.name,
+            training_actual_values=fusion_actual_values,
+            test_data=test_file.name,
+            test_actual_values=test_actual_values,
+            true_class_value=task.get('true_class_value'),
+            class_attribute_type=task.get('class_attribute_type'),
+            configuration=dict(
+                {
+                    'threshold': task.get('threshold'),
+                    'weights': models_weights,
+                },
+                **get_execution_configuration(task, environment_variables, prediction_cache)
+            ),
+        )
+        metrics = fuser_policy.fuse()
+
+        # Stores the metrics.
+        models.insert_one({
+            'ip': ip,
+            'hostname': hostname,
+            'random_seed': task.get('random_seed')
+            #'metrics': json.dumps(metrics)
+        })
+
+        # Closes the temporary files.
+        fusion_file.close()
+        test_file.close()
+
+        # Acknowledges the task.
+        amqp_manager.acknowledge_messages(fuser_tasks_queue_name, fuser_tasks_delivery_tags)
+        amqp_manager.acknowledge_messages(filter_outputs_queue_name, filter_outputs_delivery_tags)
+
+        # Stores the finish time.
+        times.insert_one({
+            'ip': ip,
+            'hostname': hostname,
+            'random_seed': task.get('random_seed'),
+            'type': 'fuser_finish',
+            'time': datetime.datetime.utcnow(),
+            'downloads': dataset_fetcher.statistics,
+            'predictions': prediction_cache.statistics if prediction_cache is not None else None,
+        })
+
+        # Clears the statistics for the next task.
+        dataset_fetcher.clear_statistics()
+        if prediction_cache is not None:
+            prediction_cache.clear_statistics()
+
+    # Stops the predict server.
+    if predict_server is not None:
+        predict_server.close()
+
+    # Removes the extracted model files.
+    if extraction_cache is not None:
+        extraction_cache.close()
+
+    # Closes the connections.
+    dataset_fetcher.close()
+    amqp_manager.close()
+    mongodb_client.close()
+
+
+def iterate_tasks(
+        amqp_manager,
+        tasks_queue_name,
+        daemon,
+        prefetch_count,
+        idle_timeout,
+):
+    """
+    Consumes the tasks from the queue, one at a time.
+
+    Without the daemon mode, it waits for exactly one task.
+    In daemon mode, it keeps consuming tasks until no task arrives for idle_timeout seconds, or until the process
+    receives SIGTERM or SIGINT, finishing the current task before stopping.
+
+    :param amqp_manager: the AMQP manager
+    :type amqp_manager: worker.amqp_manager.AMQPManager
+
+    :param tasks_queue_name: the tasks queue name
+    :type tasks_queue_name: str
+
+    :param daemon: if True, keeps consuming tasks until idle or stopped
+    :type daemon: bool
+
+    :param prefetch_count: the number of tasks the broker can deliver in advance
+    :type prefetch_count: int
+
+    :param idle_timeout: the seconds without tasks after which the daemon stops, never if not provided
+    :type idle_timeout: float
+
+    :return: the task and its delivery tags
+    :rtype: collections.Iterator[(dict, list[str])]
+    """
+    if not daemon:
+        tasks, delivery_tags = amqp_manager.consume_messages(tasks_queue_name, 1, prefetch_count=prefetch_count)
+        yield tasks[0], delivery_tags
+        return
+
+    # Stops gracefully when requested.
+    stop_requested = threading.Event()
+    previous_handlers = {}
+    for signal_number in (signal.SIGTERM, signal.SIGINT):
+        previous_handlers[signal_number] = signal.signal(signal_number, lambda *_: stop_requested.set())
+
+    try:
+        idle_start_time = time.monotonic()
+        while not stop_requested.is_set():
+            tasks, delivery_tags = amqp_manager.consume_messages(
+                tasks_queue_name,
+                1,
+                inactivity_timeout=DAEMON_POLLING_SECONDS,
+                prefetch_count=prefetch_count,
             )
+
+            if not tasks:
+                if idle_timeout is not None and time.monotonic() - idle_start_time >= idle_timeout:
+                    break
+                continue
+
+            yield tasks[0], delivery_tags
+            idle_start_time = time.monotonic()
+    finally:
+        for signal_number, previous_handler in previous_handlers.items():
+            signal.signal(signal_number, previous_handler)
+
+
+def collect_delivery_tags(messages, delivery_tags):
+    """
+    Iterates the messages, collecting their delivery tags.
+
+    :param messages: the messages and their delivery tags
+    :type messages: collections.Iterable[(dict, str)]
+
+    :param delivery_tags: the list in which appending the delivery tags
+    :type delivery_tags: list[str]
+
+    :return: the messages
+    :rtype: collections.Iterator[dict]
+    """
+    for message, delivery_tag in messages:
+        delivery_tags.append(delivery_tag)
+        yield message
+
+
+def get_quorum_number(task):
+    """
+    Computes the number of learner outputs after which the filter proceeds, from the optional 'quorum' fraction.
+
+    :param task: the filter task
+    :type task: dict
+
+    :return: the number of learner outputs
+    :rtype: int
+    """
+    learner_outputs_number = task.get('learner_outputs_number')
+
+    quorum = task.get('quorum')
+    if quorum is None:
+        return learner_outputs_number
+    return min(learner_outputs_number, max(1, int(math.ceil(float(quorum) * learner_outputs_number))))
+
+
+def get_deadline(task):
+    """
+    Computes the time after which the filter proceeds, from the optional 'deadline_seconds' since now.
+
+    :param task: the filter task
+    :type task: dict
+
+    :return: the time.monotonic() deadline, None if there is no deadline
+    :rtype: float
+    """
+    deadline_seconds = task.get('deadline_seconds')
+    if deadline_seconds is None:
+        return None
+    return time.monotonic() + float(deadline_seconds)
+
+
+def is_streaming(task, environment_variables):
+    """
+    Checks if the filter evaluates each learner output as soon as it arrives, while consuming the others.
+
+    Racing disables streaming, since the racing filter needs all the models before evaluating them.
+
+    :param task: the task, optionally containing 'streaming' and 'racing_delta'
+    :type task: dict
+
+    :param environment_variables: the environment variables
+    :type environment_variables: dict[str, str]
+
+    :return: True if streaming, False otherwise
+    :rtype: bool
+    """
+    if task.get('racing_delta') is not None:
+        return False
+
+    streaming = task.get('streaming')
+    if streaming is None:
+        streaming = environment_variables.get(FILTER_STREAMING_VARIABLE_NAME, '').lower() in ('1', 'true', 'yes')
+    return bool(streaming)
+
+
+def is_collapsing_duplicates(task, environment_variables):
+    """
+    Checks if the filter sends the learner outputs with the same model as a single model, with their number as weight.
+
+    :param task: the task, optionally containing 'collapse_duplicates'
+    :type task: dict
+
+    :param environment_variables: the environment variables
+    :type environment_variables: dict[str, str]
+
+    :return: True if collapsing, False otherwise
+    :rtype: bool
+    """
+    collapse_duplicates = task.get('collapse_duplicates')
+    if collapse_duplicates is None:
+        collapse_duplicates = environment_variables.get(FILTER_COLLAPSE_DUPLICATES_VARIABLE_NAME, '').lower() in (
+            '1',
+            'true',
+            'yes',
         )
+    return bool(collapse_duplicates)
+
+
+def get_predict_backend(task, environment_variables):
+    """
+    Retrieves how the models are executed, by the predict command or by evaluating their expression in the worker.
+
+    :param task: the task, optionally containing 'predict_backend'
+    :type task: dict
+
+    :param environment_variables: the environment variables
+    :type environment_variables: dict[str, str]
+
+    :return: the backend between 'command' and 'expression'
+    :rtype: str
+    """
+    predict_backend = task.get('predict_backend', environment_variables.get(PREDICT_BACKEND_VARIABLE_NAME))
+    if not predict_backend:
+        return COMMAND_PREDICT_BACKEND
+    if predict_backend not in (COMMAND_PREDICT_BACKEND, EXPRESSION_PREDICT_BACKEND):
+        raise ValueError('Unknown predict backend: {}'.format(predict_backend))
+    return predict_backend
 
-    # Applies the fuser policy.
-    fuser_policy = VotingFuserPolicy(
-        models_executors=models_executors,
-        training_data=fusion_file.name,
-        training_actual_values=fusion_actual_values,
-        test_data=test_file.name,
-        test_actual_values=test_actual_values,
-        true_class_value=task.get('true_class_value'),
-        class_attribute_type=task.get('class_attribute_type'),
-        configuration={'threshold': task.get('threshold')},
+
+def get_predict_shards_number(task, environment_variables):
+    """
+    Retrieves the number of row shards of the data on which each model is executed concurrently.
+
+    :param task: the task, optionally containing 'predict_shards'
+    :type task: dict
+
+    :param environment_variables: the environment variables
+    :type environment_variables: dict[str, str]
+
+    :return: the number of shards, None if not sharded
+    :rtype: int
+    """
+    shards_number = task.get('predict_shards', environment_variables.get(PREDICT_SHARDS_VARIABLE_NAME))
+    if not shards_number:
+        return None
+    return int(shards_number)
+
+
+def get_header_lines_number(task):
+    """
+    Retrieves the number of header lines of the split files.
+
+    :param task: the task, optionally containing 'include_header'
+    :type task: dict
+
+    :return: 1 if the header is included, 0 otherwise
+    :rtype: int
+    """
+    return 1 if task.get('include_header') else 0
+
+
+def filter_learner_outputs(
+        learner_outputs,
+        task,
+        dataset_fetcher,
+        artifact_store,
+        create_model_executor,
+        environment_variables,
+        prediction_cache=None,
+):
+    """
+    Filters the models of the learner outputs on the fusion split, consuming the learner outputs lazily.
+
+    :param learner_outputs: the learner outputs
+    :type learner_outputs: collections.Iterable[dict]
+
+    :param task: the filter task
+    :type task: dict
+
+    :param dataset_fetcher: the dataset fetcher
+    :type dataset_fetcher: worker.dataset_fetcher.DatasetFetcher
+
+    :param artifact_store: the artifact store
+    :type artifact_store: worker.artifact_stores.artifact_store.ArtifactStore
+
+    :param create_model_executor: the function creating a model executor from its model artifact
+    :type create_model_executor: callable
+
+    :param environment_variables: the environment variables
+    :type environment_variables: dict[str, str]
+
+    :param prediction_cache: the cache of the predicted values, None to always execute the models
+    :type prediction_cache: worker.prediction_cache.PredictionCache
+
+    :return: the model part of the learner outputs of the filtered models, in order of arrival, with the number of
+        learner outputs with the same model as 'duplicates_number', and, collapsing the duplicates, their 'weight'
+    :rtype: list[dict]
+    """
+    # Gets the fusion split and its class column, the actual values.
+    fusion_file, fusion_class_file = dataset_fetcher.fetch_all(
+        task.get('dataset_name'),
+        [
+            (GET_DATASET_FUSION_SPLIT_REQUEST_URL, get_split_request_params(task)),
+            (GET_DATASET_FUSION_SPLIT_CLASS_REQUEST_URL, get_split_class_request_params(task)),
+        ],
     )
-    metrics = fuser_policy.fuse()
 
-    # Stores the metrics.
-    models.insert_one({
-        'ip': ip,
-        'hostname': hostname,
-        'random_seed': task.get('random_seed')
-        #'metrics': json.dumps(metrics)
-    })
+    try:
+        # Retrieves the actual values.
+        actual_values = utils.read_values_from_file(fusion_class_file.name, task.get('class_attribute_type'))
+        fusion_class_file.close()
+
+        # Creates the model executors of the distinct models of the successful learner outputs, saving their model part.
+        models_messages = []
+        model_deduplicator = ModelDeduplicator()
+        models_executors = iterate_models_executors(
+            learner_outputs,
+            artifact_store,
+            create_model_executor,
+            models_messages,
+            model_deduplicator,
+        )
+
+        # Applies the filter policy.
+        filter_policy = MajorityCostThresholdFilterPolicy(
+            models_executors=models_executors,
+            training_data=fusion_file.name,
+            actual_values=actual_values,
+            true_class_value=task.get('true_class_value'),
+            class_attribute_type=task.get('class_attribute_type'),
+            configuration=dict(
+                {
+                    'threshold': task.get('threshold'),
+                    'racing_delta': task.get('racing_delta'),
+                    'racing_initial_fraction': task.get('racing_initial_fraction'),
+                    'random_seed': task.get('random_seed'),
+                    'header_lines_number': get_header_lines_number(task),
+                },
+                **get_execution_configuration(task, environment_variables, prediction_cache)
+            ),
+        )
+        filtered_models = filter_policy.filter()
+    finally:
+        # Closes the temporary files.
+        fusion_file.close()
+
+    # Records the number of learner outputs with the same model, and collapses them into a weighted vote if requested.
+    models_counts = model_deduplicator.models_counts
+    if is_collapsing_duplicates(task, environment_variables):
+        collapsed_models_messages = {}
+        for model_index, model_message in models_messages:
+            if filtered_models[model_index] and model_index not in collapsed_models_messages:
+                collapsed_models_messages[model_index] = dict(
+                    model_message,
+                    duplicates_number=models_counts[model_index],
+                    weight=models_counts[model_index],
+                )
+        return list(collapsed_models_messages.values())
+
+    return [
+        dict(model_message, duplicates_number=models_counts[model_index])
+        for model_index, model_message in models_messages
+        if filtered_models[model_index]
+    ]
+
+
+def iterate_models_executors(
+        learner_outputs,
+        artifact_store,
+        create_model_executor,
+        models_messages,
+        model_deduplicator,
+):
+    """
+    Creates the model executors of the successful learner outputs, as they arrive, once per distinct model.
 
-    # Closes the temporary files.
-    fusion_file.close()
-    test_file.close()
+    :param learner_outputs: the learner outputs
+    :type learner_outputs: collections.Iterable[dict]
 
-    # Acknowledges the task.
-    amqp_manager.acknowledge_messages(fuser_tasks_queue_name, fuser_tasks_delivery_tags)
-    amqp_manager.acknowledge_messages(filter_outputs_queue_name, filter_outputs_delivery_tags)
+    :param artifact_store: the artifact store
+    :type artifact_store: worker.artifact_stores.artifact_store.ArtifactStore
 
-    # Closes the connection with AMQP.
-    amqp_manager.close()
+    :param create_model_executor: the function creating a model executor from its model artifact
+    :type create_model_executor: callable
+
+    :param models_messages: the list in which appending the distinct model index and the model part of each
+        successful learner output
+    :type models_messages: list[(int, dict)]
+
+    :param model_deduplicator: the deduplicator finding the distinct models
+    :type model_deduplicator: worker.model_deduplicator.ModelDeduplicator
+
+    :return: the model executors of the distinct models
+    :rtype: collections.Iterator[worker.model_executor.ModelExecutor]
+    """
+    for learner_output in learner_outputs:
+        if not learner_output.get('success'):
+            continue
+
+        model_artifact = create_model_artifact(learner_output, artifact_store)
+        model_index, new_model = model_deduplicator.add(model_artifact)
+
+        models_messages.append((model_index, get_model_message(learner_output)))
+        if new_model:
+            yield create_model_executor(model_artifact=model_artifact)
+
+
+def create_message_codec(environment_variables):
+    """
+    Creates the codec of the published messages.
+
+    :param environment_variables: the environment variables
+    :type environment_variables: dict[str, str]
+
+    :return: the message codec
+    :rtype: worker.message_codec.MessageCodec
+    """
+    compression = environment_variables.get(AMQP_COMPRESSION_VARIABLE_NAME)
+    if compression in ('', 'none'):
+        compression = None
+
+    return MessageCodec(
+        codec=environment_variables.get(AMQP_CODEC_VARIABLE_NAME) or None,
+        compression=compression,
+    )
+
+
+def create_artifact_store(environment_variables):
+    """
+    Creates the artifact store from its URL, currently supporting the file scheme for a shared directory.
+
+    :param environment_variables: the environment variables
+    :type environment_variables: dict[str, str]
+
+    :return: the artifact store, None if not configured
+    :rtype: worker.artifact_stores.artifact_store.ArtifactStore
+    """
+    url = environment_variables.get(ARTIFACT_STORE_URL_VARIABLE_NAME)
+    if not url:
+        return None
+
+    parsed_url = urllib.parse.urlparse(url)
+    if parsed_url.scheme in ('', 'file'):
+        return FileSystemArtifactStore(parsed_url.path)
+
+    raise ValueError('Unsupported artifact store: {}'.format(url))
+
+
+def create_model_artifact(message, artifact_store):
+    """
+    Creates the artifact of a model from its message, either referring to the artifact store or carrying the files.
+
+    :param message: the message
+    :type message: dict
+
+    :param artifact_store: the artifact store
+    :type artifact_store: worker.artifact_stores.artifact_store.ArtifactStore
+
+    :return: the artifact, lazily loaded
+    :rtype: worker.artifact_stores.artifact_store.Artifact
+    """
+    reference = message.get('artifact')
+    if reference is None:
+        return InlineArtifact(message.get('files'))
+
+    if artifact_store is None:
+        raise ValueError('The message refers to an artifact, but the artifact store is not configured')
+    return Artifact(artifact_store, reference.get('hash'), reference.get('size'))
+
+
+def get_model_message(message):
+    """
+    Retrieves the part of a message describing the model.
+
+    :param message: the message
+    :type message: dict
+
+    :return: the model message, containing either the artifact reference or the files
+    :rtype: dict
+    """
+    if message.get('artifact') is not None:
+        return {'artifact': message.get('artifact')}
+    return {'files': message.get('files')}
 
-    # Stores the finish time.
-    times.insert_one({
-        'ip': ip,
-        'hostname': hostname,
+
+def get_split_request_params(task):
+    """
+    Retrieves the parameters of the requests for the fusion and test splits.
+
+    :param task: the task
+    :type task: dict
+
+    :return: the request parameters
+    :rtype: dict
+    """
+    return {
+        'training_rate': task.get('training_rate'),
+        'fusion_rate': task.get('fusion_rate'),
+        'class_attribute': task.get('class_attribute'),
+        'include_attributes': task.get('include_attributes'),
+        'exclude_attributes': task.get('exclude_attributes'),
+        'attributes_rate': task.get('attributes_rate'),
+        'random_seed': task.get('random_seed'),
+        'include_header': task.get('include_header'),
+    }
+
+
+def get_split_class_request_params(task):
+    """
+    Retrieves the parameters of the requests for the class columns of the fusion and test splits.
+
+    :param task: the task
+    :type task: dict
+
+    :return: the request parameters
+    :rtype: dict
+    """
+    return {
+        'training_rate': task.get('training_rate'),
+        'fusion_rate': task.get('fusion_rate'),
+        'class_attribute': task.get('class_attribute'),
         'random_seed': task.get('random_seed'),
-        'type': 'fuser_finish',
-        'time': datetime.datetime.utcnow(),
-    })
+        'include_header': task.get('include_header'),
+    }
+
+
+def create_dataset_fetcher(environment_variables):
+    """
+    Creates the dataset fetcher, using the dataset cache if configured.
+
+    :param environment_variables: the environment variables
+    :type environment_variables: dict[str, str]
+
+    :return: the fetcher
+    :rtype: worker.dataset_fetcher.DatasetFetcher
+    """
+    return DatasetFetcher(
+        hostname=environment_variables.get('FACTORIZER_HOSTNAME', 'factorizer'),
+        port=environment_variables.get('FACTORIZER_PORT', '5000'),
+        dataset_cache=create_dataset_cache(environment_variables),
+    )
+
+
+def create_dataset_cache(environment_variables):
+    """
+    Creates the dataset cache, if its directory is configured.
+
+    :param environment_variables: the environment variables
+    :type environment_variables: dict[str, str]
+
+    :return: the cache, None if not configured
+    :rtype: worker.dataset_cache.DatasetCache
+    """
+    directory = environment_variables.get(DATASET_CACHE_DIRECTORY_VARIABLE_NAME)
+    if not directory:
+        return None
+
+    maximum_size = environment_variables.get(DATASET_CACHE_SIZE_VARIABLE_NAME)
+    if maximum_size is None:
+        return DatasetCache(directory)
+    return DatasetCache(directory, int(maximum_size))
+
+
+def create_extraction_cache(environment_variables):
+    """
+    Creates the cache of the extracted model files.
+
+    :param environment_variables: the environment variables
+    :type environment_variables: dict[str, str]
+
+    :return: the cache, None if disabled by a zero size
+    :rtype: worker.extraction_cache.ExtractionCache
+    """
+    maximum_size = environment_variables.get(EXTRACTION_CACHE_SIZE_VARIABLE_NAME)
+    if maximum_size is not None and int(maximum_size) <= 0:
+        return None
+
+    return ExtractionCache(
+        directory=environment_variables.get(
+            EXTRACTION_CACHE_DIRECTORY_VARIABLE_NAME,
+            environment_variables.get(SCRATCH_DIRECTORY_VARIABLE_NAME),
+        ),
+        maximum_size=int(maximum_size or EXTRACTION_CACHE_DEFAULT_SIZE),
+    )
+
+
+def create_prediction_cache(environment_variables):
+    """
+    Creates the cache of the predicted values, shared by the workers on the same host.
+
+    :param environment_variables: the environment variables
+    :type environment_variables: dict[str, str]
+
+    :return: the cache, None if not configured
+    :rtype: worker.prediction_cache.PredictionCache
+    """
+    directory = environment_variables.get(PREDICTION_CACHE_DIRECTORY_VARIABLE_NAME)
+    if not directory:
+        return None
+
+    maximum_size = environment_variables.get(PREDICTION_CACHE_SIZE_VARIABLE_NAME)
+    bypass = environment_variables.get(PREDICTION_CACHE_BYPASS_VARIABLE_NAME, '').lower() in ('1', 'true', 'yes')
+    if maximum_size is None:
+        return PredictionCache(directory, bypass=bypass)
+    return PredictionCache(directory, int(maximum_size), bypass=bypass)
+
+
+def create_predict_server(environment_variables):
+    """
+    Creates the long-lived predict processes, shared by the model executors, as many as the concurrent executions
+    by default.
+
+    :param environment_variables: the environment variables
+    :type environment_variables: dict[str, str]
+
+    :return: the predict server, None if no server command is configured
+    :rtype: worker.predict_server.PredictServer
+    """
+    predict_server_command = environment_variables.get(PREDICT_SERVER_COMMAND_VARIABLE_NAME)
+    if not predict_server_command:
+        return None
+
+    return PredictServer(
+        command=predict_server_command,
+        working_directory=environment_variables.get(PREDICT_WORKING_DIRECTORY_VARIABLE_NAME),
+        environment_variables=environment_variables,
+        processes_number=environment_variables.get(
+            PREDICT_SERVER_PROCESSES_VARIABLE_NAME,
+            environment_variables.get(EXECUTION_WORKERS_VARIABLE_NAME),
+        ),
+        response_timeout=environment_variables.get(PREDICT_SERVER_TIMEOUT_VARIABLE_NAME),
+    )
 
 
 def get_duration_variables(seconds):
@@ -641,5 +1303,65 @@ def get_duration_variables(seconds):
     }
 
 
+def get_execution_configuration(task, environment_variables, prediction_cache=None):
+    """
+    Retrieves the configuration of the models execution, preferring the task values to the environment variables.
+
+    :param task: the task, optionally containing 'bypass_prediction_cache' for non-deterministic predictors
+    :type task: dict
+
+    :param environment_variables: the environment variables
+    :type environment_variables: dict[str, str]
+
+    :param prediction_cache: the cache of the predicted values, if any
+    :type prediction_cache: worker.prediction_cache.PredictionCache
+
+    :return: the configuration dictionary
+    :rtype: dict
+    """
+    execution_mode = task.get('execution_mode', environment_variables.get(EXECUTION_MODE_VARIABLE_NAME))
+
+    # Evaluates the expression models together in batches, sharing their common subexpressions.
+    if get_predict_backend(task, environment_variables) == EXPRESSION_PREDICT_BACKEND:
+        batch_model_executor = ExpressionGraphExecutor(header_lines_number=get_header_lines_number(task))
+        if not execution_mode:
+            execution_mode = BATCH_EXECUTION_MODE
+    else:
+        batch_model_executor = create_batch_model_executor(environment_variables)
+
+    return {
+        'execution_mode': execution_mode,
+        'execution_workers': task.get('execution_workers', environment_variables.get(EXECUTION_WORKERS_VARIABLE_NAME)),
+        'execution_batch_size': task.get(
+            'execution_batch_size',
+            environment_variables.get(EXECUTION_BATCH_SIZE_VARIABLE_NAME),
+        ),
+        'batch_model_executor': batch_model_executor,
+        'prediction_cache': None if task.get('bypass_prediction_cache') else prediction_cache,
+    }
+
+
+def create_batch_model_executor(environment_variables):
+    """
+    Creates the executor of the batches of models, executing the batch command once per batch.
+
+    :param environment_variables: the environment variables
+    :type environment_variables: dict[str, str]
+
+    :return: the batch model executor, None if no batch command is configured
+    :rtype: worker.batch_model_executor.BatchModelExecutor
+    """
+    predict_batch_command = environment_variables.get(PREDICT_BATCH_COMMAND_VARIABLE_NAME)
+    if not predict_batch_command:
+        return None
+
+    return BatchModelExecutor(
+        execution_command=predict_batch_command,
+        working_directory=environment_variables.get(PREDICT_WORKING_DIRECTORY_VARIABLE_NAME),
+        environment_variables=environment_variables,
+        scratch_directory=environment_variables.get(SCRATCH_DIRECTORY_VARIABLE_NAME),
+    )
+
+
 if __name__ == '__main__':
     cli()
@@ -1,20 +1,29 @@
-import json
+import time
 
 import pika
 
+from worker.message_codec import MessageCodec
+
+
+DEADLINE_POLLING_SECONDS = 1
+
 
 class AMQPManager(object):
     """
     Implements a manager for the AMQP protocol.
     """
 
-    def __init__(self, hostname):
+    def __init__(self, hostname, message_codec=None):
         """
         Initializes a manager connecting to the AMQP message broker.
 
         :param hostname: the hostname of the message broker
         :type hostname: str
+
+        :param message_codec: the codec of the published messages, JSON if not provided
+        :type message_codec: worker.message_codec.MessageCodec
         """
+        self.__message_codec = message_codec or MessageCodec()
         self.__connection = pika.BlockingConnection(
             pika.ConnectionParameters(host=hostname, heartbeat_interval=0),
         )
@@ -109,7 +118,7 @@ class AMQPManager(object):
             messages,
     ):
         """
-        Publishes a message on the queue.
+        Publishes a message on the queue, encoded by the message codec.
 
         :param queue_name: the name of the queue
         :type queue_name: str
@@ -120,12 +129,14 @@ class AMQPManager(object):
         channel = self.__get_channel(queue_name)
 
         for message in messages:
+            body, content_type, content_encoding = self.__message_codec.encode(message)
             channel.basic_publish(
                 exchange='',
                 routing_key=queue_name,
-                body=json.dumps(message),
+                body=body,
                 properties=pika.BasicProperties(
-                    content_type='application/json',
+                    content_type=content_type,
+                    content_encoding=content_encoding,
                     delivery_mode=2  # Persistent message,
                 ),
             )
@@ -134,9 +145,11 @@ class AMQPManager(object):
             self,
             queue_name,
             messages_number,
+            inactivity_timeout=None,
+            prefetch_count=None,
     ):
         """
-        Consumes the messages from the queue.
+        Consumes the messages from the queue, decoded according to their content type and encoding.
 
         :param queue_name: the queue name
         :type queue_name: str
@@ -144,25 +157,112 @@ class AMQPManager(object):
         :param messages_number: the number of messages to consume
         :type messages_number: int
 
+        :param inactivity_timeout: the seconds to wait for a message before returning the messages consumed so far
+        :type inactivity_timeout: float
+
+        :param prefetch_count: the number of unacknowledged messages the broker can deliver, at least messages_number
+        :type prefetch_count: int
+
         :return: the messages and the delivery tags
         :rtype: (list[dict], list[str])
         """
+        messages = []
+        delivery_tags = []
+
+        for message, delivery_tag in self.iterate_messages(queue_name, messages_number, inactivity_timeout, prefetch_count):
+            messages.append(message)
+            delivery_tags.append(delivery_tag)
+
+        return messages, delivery_tags
+
+    def iterate_messages(
+            self,
+            queue_name,
+            messages_number,
+            inactivity_timeout=None,
+            prefetch_count=None,
+            deadline=None,
+            stop_event=None,
+    ):
+        """
+        Consumes the messages from the queue, yielding each one as soon as it arrives.
+
+        :param queue_name: the queue name
+        :type queue_name: str
+
+        :param messages_number: the number of messages to consume
+        :type messages_number: int
+
+        :param inactivity_timeout: the seconds to wait for a message before stopping
+        :type inactivity_timeout: float
+
+        :param prefetch_count: the number of unacknowledged messages the broker can deliver, at least messages_number
+        :type prefetch_count: int
+
+        :param deadline: the time.monotonic() time after which stopping, even if fewer messages have been consumed
+        :type deadline: float
+
+        :param stop_event: the event after which stopping, e.g. when the messages consumer fails
+        :type stop_event: threading.Event
+
+        :return: the messages and their delivery tags
+        :rtype: collections.Iterator[(dict, str)]
+        """
+        if messages_number <= 0:
+            return
+
         channel = self.__get_channel(queue_name)
 
-        channel.basic_qos(prefetch_count=messages_number)
+        channel.basic_qos(prefetch_count=max(messages_number, prefetch_count or 0))
 
-        messages = []
-        delivery_tags = []
+        # Polls the queue to check the deadline and the stop event.
+        polling_timeout = inactivity_timeout
+        if deadline is not None or stop_event is not None:
+            polling_timeout = min(inactivity_timeout or DEADLINE_POLLING_SECONDS, DEADLINE_POLLING_SECONDS)
 
         messages_count = 0
-        for method_frame, properties, body in channel.consume(queue=queue_name):
-            delivery_tags.append(method_frame.delivery_tag)
-            messages.append(json.loads(body.decode()))
+        last_message_time = time.monotonic()
+        for method_frame, properties, body in channel.consume(queue=queue_name, inactivity_timeout=polling_timeout):
+            if stop_event is not None and stop_event.is_set():
+                break
+
+            if method_frame is None:
+                current_time = time.monotonic()
+                if deadline is None and stop_event is None:
+                    break
+                if deadline is not None and current_time >= deadline:
+                    break
+                if inactivity_timeout is not None and current_time - last_message_time >= inactivity_timeout:
+                    break
+                continue
+
+            yield (
+                MessageCodec.decode(body, properties.content_type, properties.content_encoding),
+                method_frame.delivery_tag,
+            )
             messages_count += 1
+            last_message_time = time.monotonic()
             if messages_count >= messages_number:
                 break
+            if deadline is not None and last_message_time >= deadline:
+                break
 
-        return messages, delivery_tags
+    def cancel_consumer(
+            self,
+            queue_name,
+    ):
+        """
+        Cancels the consumer of the queue, requeuing the messages delivered but not consumed.
+
+        :param queue_name: the queue name
+        :type queue_name: str
+
+        :return: the number of requeued messages
+        :rtype: int
+        """
+        channel = self.__get_channel(queue_name)
+
+        return channel.cancel()
 
     def acknowledge_messages(
             self,
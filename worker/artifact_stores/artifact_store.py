@@ -0,0 +1,299 @@
+from abc import ABCMeta, abstractmethod
+import io
+import re
+import hashlib
+import zipfile
+import posixpath
+
+from worker import utils
+
+
+HASH_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+
+class ArtifactStore(object):
+    """
+    Defines a store of artifacts, the zip files of the models, addressed by the hash of their content.
+
+    The messages exchanged among learners, filters and fusers carry only the artifact references, i.e. the content
+    hash and size, instead of the whole zip files.
+    """
+
+    __metaclass__ = ABCMeta
+
+    @abstractmethod
+    def exists(
+            self,
+            artifact_hash,
+    ):
+        """
+        Checks if an artifact is stored.
+
+        :param artifact_hash: the hash of the artifact
+        :type artifact_hash: str
+
+        :return: True if exists, False otherwise
+        :rtype: bool
+        """
+        pass
+
+    @abstractmethod
+    def write(
+            self,
+            artifact_hash,
+            data,
+    ):
+        """
+        Writes the content of an artifact.
+
+        :param artifact_hash: the hash of the artifact
+        :type artifact_hash: str
+
+        :param data: the content
+        :type data: bytes
+        """
+        pass
+
+    @abstractmethod
+    def read(
+            self,
+            artifact_hash,
+    ):
+        """
+        Reads the content of an artifact.
+
+        :param artifact_hash: the hash of the artifact
+        :type artifact_hash: str
+
+        :return: the content
+        :rtype: bytes
+        """
+        pass
+
+    def put(
+            self,
+            data,
+    ):
+        """
+        Stores an artifact, if not already stored.
+
+        :param data: the content
+        :type data: bytes
+
+        :return: the reference to the artifact, with its 'hash' and 'size'
+        :rtype: dict
+        """
+        artifact_hash = compute_hash(data)
+        if not self.exists(artifact_hash):
+            self.write(artifact_hash, data)
+
+        return {
+            'hash': artifact_hash,
+            'size': len(data),
+        }
+
+
+class Artifact(object):
+    """
+    A reference to an artifact, lazily loaded from the store once, and checked against its hash and size.
+    """
+
+    def __init__(
+            self,
+            artifact_store,
+            artifact_hash,
+            size=None,
+    ):
+        """
+        Initializes the reference.
+
+        :param artifact_store: the store containing the artifact
+        :type artifact_store: ArtifactStore
+
+        :param artifact_hash: the hash of the artifact
+        :type artifact_hash: str
+
+        :param size: the size of the artifact in bytes
+        :type size: int
+        """
+        validate_hash(artifact_hash)
+
+        self.__artifact_store = artifact_store
+        self.__hash = artifact_hash
+        self.__size = size
+        self.__data = None
+        self.__content_hash = None
+
+    @property
+    def hash(self):
+        """
+        Returns the hash of the artifact content.
+
+        :return: the hash
+        :rtype: str
+        """
+        return self.__hash
+
+    @property
+    def size(self):
+        """
+        Returns the size of the artifact.
+
+        :return: the size in bytes
+        :rtype: int
+        """
+        return self.__size
+
+    @property
+    def content_hash(self):
+        """
+        Returns the hash of the model files in the artifact, ignoring the zip metadata, e.g. the timestamps.
+
+        :return: the hash
+        :rtype: str
+        """
+        if self.__content_hash is None:
+            self.__content_hash = compute_content_hash(self.load())
+        return self.__content_hash
+
+    def load(self):
+        """
+        Loads the artifact content from the store, at the first call.
+
+        :return: the content
+        :rtype: bytes
+        """
+        if self.__data is None:
+            data = self.__artifact_store.read(self.__hash)
+            if self.__size is not None and len(data) != int(self.__size):
+                raise ValueError(
+                    'Found {} bytes instead of {} in the artifact {}'.format(len(data), self.__size, self.__hash)
+                )
+            if compute_hash(data) != self.__hash:
+                raise ValueError('The content of the artifact {} does not match its hash'.format(self.__hash))
+            self.__data = data
+
+        return self.__data
+
+
+class InlineArtifact(object):
+    """
+    An artifact carried by the message itself, as a base64 zip string or as raw zip bytes.
+    """
+
+    def __init__(
+            self,
+            stream,
+    ):
+        """
+        Initializes the artifact.
+
+        :param stream: the base64 zip string, or the zip bytes
+        :type stream: str | bytes
+        """
+        self.__stream = stream
+        self.__data = None
+        self.__hash = None
+        self.__content_hash = None
+
+    @property
+    def hash(self):
+        """
+        Returns the hash of the artifact content.
+
+        :return: the hash
+        :rtype: str
+        """
+        if self.__hash is None:
+            self.__hash = compute_hash(self.load())
+        return self.__hash
+
+    @property
+    def size(self):
+        """
+        Returns the size of the artifact.
+
+        :return: the size in bytes
+        :rtype: int
+        """
+        return len(self.load())
+
+    @property
+    def content_hash(self):
+        """
+        Returns the hash of the model files in the artifact, ignoring the zip metadata, e.g. the timestamps.
+
+        :return: the hash
+        :rtype: str
+        """
+        if self.__content_hash is None:
+            self.__content_hash = compute_content_hash(self.load())
+        return self.__content_hash
+
+    def load(self):
+        """
+        Decodes the artifact content, at the first call.
+
+        :return: the content
+        :rtype: bytes
+        """
+        if self.__data is None:
+            if isinstance(self.__stream, bytes):
+                self.__data = self.__stream
+            else:
+                self.__data = utils.decode_base64_string(self.__stream)
+
+        return self.__data
+
+
+def compute_hash(data):
+    """
+    Computes the hash addressing an artifact content.
+
+    :param data: the content
+    :type data: bytes
+
+    :return: the hexadecimal SHA-256 digest
+    :rtype: str
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
+def validate_hash(artifact_hash):
+    """
+    Checks that a hash addressing an artifact is a hexadecimal SHA-256 digest, e.g. before building a path from it.
+
+    :param artifact_hash: the hash of the artifact
+    :type artifact_hash: str
+    """
+    if not isinstance(artifact_hash, str) or not HASH_PATTERN.match(artifact_hash):
+        raise ValueError('Invalid artifact hash: {!r}'.format(artifact_hash))
+
+
+def compute_content_hash(data):
+    """
+    Computes the hash of the files in a zip content, so that the zip files of the same files are equal even if created
+    at different times.
+
+    The hash covers the normalized name and the content of each file, in order of name.
+
+    :param data: the zip content
+    :type data: bytes
+
+    :return: the hexadecimal SHA-256 digest
+    :rtype: str
+    """
+    content_hash = hashlib.sha256()
+    with zipfile.ZipFile(io.BytesIO(data)) as zip_file:
+        files_infos = [file_info for file_info in zip_file.infolist() if not file_info.is_dir()]
+        for file_info in sorted(files_infos, key=lambda file_info: posixpath.normpath(file_info.filename)):
+            name = posixpath.normpath(file_info.filename).encode('utf-8')
+            file_data = zip_file.read(file_info)
+
+            # Prefixes the lengths, so that the boundaries between names and contents are unambiguous.
+            content_hash.update(len(name).to_bytes(8, 'big'))
+            content_hash.update(name)
+            content_hash.update(len(file_data).to_bytes(8, 'big'))
+            content_hash.update(file_data)
+
+    return content_hash.hexdigest()
@@ -0,0 +1,72 @@
+import os
+import tempfile
+
+from worker.artifact_stores.artifact_store import ArtifactStore, validate_hash
+
+
+class FileSystemArtifactStore(ArtifactStore):
+    """
+    Stores the artifacts into a directory shared among the workers, e.g. a network file system mount.
+    """
+
+    def __init__(
+            self,
+            directory,
+    ):
+        """
+        Initializes the store, creating its directory if it does not exist.
+
+        :param directory: the shared directory
+        :type directory: str
+        """
+        self.__directory = directory
+
+        os.makedirs(self.__directory, exist_ok=True)
+
+    @property
+    def directory(self):
+        """
+        Returns the shared directory.
+
+        :return: the directory path
+        :rtype: str
+        """
+        return self.__directory
+
+    def exists(self, artifact_hash):
+        return os.path.exists(self.__get_path(artifact_hash))
+
+    def write(self, artifact_hash, data):
+        path = self.__get_path(artifact_hash)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Writes atomically, so that the readers never find a partial artifact.
+        temporary_file = tempfile.NamedTemporaryFile(prefix='.', dir=os.path.dirname(path), delete=False)
+        try:
+            with temporary_file:
+                temporary_file.write(data)
+                temporary_file.flush()
+                os.fsync(temporary_file.fileno())
+            os.replace(temporary_file.name, path)
+        except BaseException:
+            os.remove(temporary_file.name)
+            raise
+
+    def read(self, artifact_hash):
+        with open(self.__get_path(artifact_hash), 'rb') as artifact_file:
+            return artifact_file.read()
+
+    def __get_path(self, artifact_hash):
+        """
+        Computes the path of an artifact, spreading the artifacts in subdirectories by their hash prefix.
+
+        The hash is validated, so that a hash received in a message cannot refer to a path outside the directory.
+
+        :param artifact_hash: the hash of the artifact
+        :type artifact_hash: str
+
+        :return: the artifact path
+        :rtype: str
+        """
+        validate_hash(artifact_hash)
+        return os.path.join(self.__directory, artifact_hash[:2], artifact_hash)
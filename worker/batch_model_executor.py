@@ -0,0 +1,136 @@
+import os
+import contextlib
+
+from worker.execution_context import ExecutionContext
+from worker import utils
+
+
+PREDICT_WORKING_DIRECTORY_VARIABLE_NAME = 'CCUBE_PREDICT_WORKING_DIRECTORY'
+PREDICT_PREDICTIONS_FORMAT_VARIABLE_NAME = 'CCUBE_PREDICT_PREDICTIONS_FORMAT'
+PREDICT_DATASET_FILE_VARIABLE_NAME = 'CCUBE_PREDICT_DATASET_FILE'
+PREDICT_INPUT_MANIFEST_VARIABLE_NAME = 'CCUBE_PREDICT_INPUT_MANIFEST'
+
+
+class BatchModelExecutor(object):
+    """
+    Executes several models in a single process, so that the dataset is loaded and the runtime is started only once.
+
+    The model files of each model are extracted into their own directory, and the command receives a manifest file
+    with one line per model, made of the tab-separated model files directory, predictions file and parameters
+    properties file. The command must write the predictions file of each model.
+    The models whose predictions file is missing are executed one at a time by their own model executor, as all the
+    models if the command fails, since their predictions files may be incomplete.
+    """
+
+    def __init__(
+            self,
+            execution_command,
+            working_directory,
+            environment_variables,
+            scratch_directory=None,
+    ):
+        """
+        Initializes the executor.
+
+        :param execution_command: the command to execute
+        :type execution_command: str
+
+        :param working_directory: the working directory for the command
+        :type working_directory: str
+
+        :param environment_variables: the environment variables to set
+        :type environment_variables: dict
+
+        :param scratch_directory: the directory in which creating the private execution directories
+        :type scratch_directory: str
+        """
+        self.__execution_command = execution_command
+        self.__working_directory = working_directory
+        self.__environment_variables = dict(environment_variables)
+        self.__scratch_directory = scratch_directory
+
+    def execute(
+            self,
+            models_executors,
+            data_file_path,
+    ):
+        """
+        Executes the models with the command, returning the predicted values of each one.
+
+        :param models_executors: the model executors
+        :type models_executors: list[worker.model_executor.ModelExecutor]
+
+        :param data_file_path: the data file to test the models
+        :type data_file_path: str
+
+        :return: the predicted values of each model, in the same order of the model executors
+        :rtype: list
+        """
+        models_executors = list(models_executors)
+        if not models_executors:
+            return []
+
+        execution_context = ExecutionContext(
+            working_directory=self.__working_directory,
+            environment_variables=self.__environment_variables,
+            scratch_directory=self.__scratch_directory,
+        )
+        with execution_context, contextlib.ExitStack() as exit_stack:
+            process_manager = execution_context.create_process_manager(self.__execution_command)
+
+            # Extracts the model files and writes the manifest, one line per model.
+            predictions_files_paths = []
+            manifest_file_path = os.path.join(execution_context.directory, 'manifest.tsv')
+            with open(manifest_file_path, 'w') as manifest_file:
+                for i, model_executor in enumerate(models_executors):
+                    model_directory = os.path.join(execution_context.directory, 'models', str(i))
+                    model_files_directory = exit_stack.enter_context(
+                        model_executor.extract_model_files(model_directory)
+                    )
+
+                    _, extension = os.path.splitext(model_executor.predictions_file_path or '')
+                    predictions_file_path = os.path.join(model_directory, 'predictions' + extension)
+                    os.makedirs(model_directory, exist_ok=True)
+                    predictions_files_paths.append(predictions_file_path)
+
+                    string_properties = utils.convert_values_to_string(model_executor.model_parameters)
+                    properties_file = exit_stack.enter_context(
+                        utils.create_temporary_properties_file(string_properties)
+                    )
+
+                    manifest_file.write('\t'.join([
+                        model_files_directory,
+                        predictions_file_path,
+                        properties_file.name,
+                    ]) + '\n')
+
+            # Adds the environment variables.
+            process_manager.add_environment_variables(
+                {
+                    PREDICT_WORKING_DIRECTORY_VARIABLE_NAME: execution_context.working_directory,
+                    PREDICT_PREDICTIONS_FORMAT_VARIABLE_NAME: models_executors[0].predictions_format,
+                    PREDICT_DATASET_FILE_VARIABLE_NAME: data_file_path,
+                    PREDICT_INPUT_MANIFEST_VARIABLE_NAME: manifest_file_path,
+                }
+            )
+
+            # Echoes the command.
+            stdout, return_code = process_manager.echo()
+
+            # Runs the process.
+            stdout, return_code = process_manager.run()
+
+            if return_code != 0:
+                print('Batch command failed with return code {}, executing the models alone'.format(return_code))
+
+            # Reads the predicted values into memory before removing the context, executing alone the models without
+            # predictions.
+            models_predicted_values = []
+            for model_executor, predictions_file_path in zip(models_executors, predictions_files_paths):
+                if return_code == 0 and os.path.exists(predictions_file_path):
+                    models_predicted_values.append(model_executor.read_predictions(predictions_file_path))
+                else:
+                    models_predicted_values.append(model_executor.execute(data_file_path))
+
+        # Returns the predicted values.
+        return models_predicted_values
@@ -0,0 +1,290 @@
+import os
+import uuid
+import json
+import fcntl
+import hashlib
+import tempfile
+import contextlib
+
+
+DEFAULT_MAXIMUM_SIZE = 4 * 1024 * 1024 * 1024
+
+LOCK_FILE_SUFFIX = '.lock'
+EVICTION_LOCK_FILE_NAME = '.eviction.lock'
+TEMPORARY_FILE_PREFIX = '.download-'
+LINK_FILE_PREFIX = '.link-'
+
+
+class DatasetCache(object):
+    """
+    Caches the dataset splits on the host file system, so that several tasks and workers share the same download.
+
+    The splits are stored by a key computed from the request, written atomically once their size is checked, and
+    evicted in least recently used order when the total size exceeds the maximum size.
+    The readers get a private hard link to the cached file, so an eviction never removes a file in use. Each link is
+    locked by its reader, so the links and the lock files left by the crashed readers are removed by the evictions.
+    """
+
+    def __init__(
+            self,
+            directory,
+            maximum_size=DEFAULT_MAXIMUM_SIZE,
+    ):
+        """
+        Initializes the cache, creating its directory if it does not exist.
+
+        :param directory: the directory of the cache, shared by the workers on the same host
+        :type directory: str
+
+        :param maximum_size: the maximum size in bytes of the cached splits
+        :type maximum_size: int
+        """
+        self.__directory = directory
+        self.__maximum_size = int(maximum_size)
+
+        os.makedirs(self.__directory, exist_ok=True)
+
+    @property
+    def directory(self):
+        """
+        Returns the directory of the cache.
+
+        :return: the directory path
+        :rtype: str
+        """
+        return self.__directory
+
+    @staticmethod
+    def compute_key(url, request_params):
+        """
+        Computes the key of a split from its request.
+
+        :param url: the URL of the request, including the dataset name and the endpoint
+        :type url: str
+
+        :param request_params: the parameters of the request
+        :type request_params: dict
+
+        :return: the key
+        :rtype: str
+        """
+        request = json.dumps([url, request_params], sort_keys=True)
+        return hashlib.sha256(request.encode('utf-8')).hexdigest()
+
+    def open(self, key, download):
+        """
+        Opens a cached split, downloading it if not cached.
+
+        :param key: the key of the split
+        :type key: str
+
+        :param download: the function writing the split into the file object it receives, and returning the expected
+            size in bytes, None if unknown
+        :type download: callable
+
+        :return: the split file, whose path is in the name attribute, to close when no longer needed
+        :rtype: CachedFile
+        """
+        path = os.path.join(self.__directory, key)
+
+        downloaded = False
+        while True:
+            if self.__touch(path):
+                cached_file = self.__link(path)
+                if cached_file is not None:
+                    break
+
+            # Only one worker per host downloads the split.
+            with self.__lock(path + LOCK_FILE_SUFFIX):
+                if not self.__touch(path):
+                    self.__download(path, download)
+                    downloaded = True
+                cached_file = self.__link(path)
+                if cached_file is not None:
+                    break
+
+        if downloaded:
+            try:
+                self.__evict()
+            except BaseException:
+                cached_file.close()
+                raise
+
+        return cached_file
+
+    def __link(self, path):
+        """
+        Links a split to a private path, locked until closed, to keep it available even if evicted.
+
+        :param path: the path of the cached split
+        :type path: str
+
+        :return: the split file, None if the split has been evicted meanwhile
+        :rtype: CachedFile
+        """
+        link_path = os.path.join(self.__directory, LINK_FILE_PREFIX + uuid.uuid4().hex)
+
+        # Prevents the evictions from removing the link before it is locked.
+        with self.__lock(os.path.join(self.__directory, EVICTION_LOCK_FILE_NAME), fcntl.LOCK_SH):
+            try:
+                os.link(path, link_path)
+            except FileNotFoundError:
+                return None
+
+            try:
+                link_file = open(link_path, 'rb')
+                fcntl.flock(link_file, fcntl.LOCK_SH)
+            except BaseException:
+                os.remove(link_path)
+                raise
+
+        return CachedFile(link_path, link_file)
+
+    def __download(self, path, download):
+        """
+        Downloads a split, atomically moving it into the cache when complete.
+
+        :param path: the path of the cached split
+        :type path: str
+
+        :param download: the function writing the split into the file object it receives, and returning the expected
+            size in bytes, None if unknown
+        :type download: callable
+        """
+        temporary_file = tempfile.NamedTemporaryFile(prefix=TEMPORARY_FILE_PREFIX, dir=self.__directory, delete=False)
+        try:
+            with temporary_file:
+                expected_size = download(temporary_file)
+                temporary_file.flush()
+                os.fsync(temporary_file.fileno())
+
+                # Checks the size, so that an empty or truncated split is never cached.
+                size = os.fstat(temporary_file.fileno()).st_size
+                if size == 0:
+                    raise IOError('Downloaded an empty split')
+                if expected_size is not None and size != int(expected_size):
+                    raise IOError('Downloaded {} bytes instead of {}'.format(size, expected_size))
+            os.replace(temporary_file.name, path)
+        except BaseException:
+            os.remove(temporary_file.name)
+            raise
+
+    def __evict(self):
+        """
+        Removes the least recently used splits, until the size is within the maximum, together with the links no
+        longer locked by their readers and the lock files of the splits not cached.
+        """
+        with self.__lock(os.path.join(self.__directory, EVICTION_LOCK_FILE_NAME)):
+            entries = []
+            size = 0
+            links_paths = []
+            locks_paths = []
+            for entry in os.scandir(self.__directory):
+                if entry.name.startswith(LINK_FILE_PREFIX):
+                    links_paths.append(entry.path)
+                    continue
+                if entry.name.startswith('.') or not entry.is_file():
+                    continue
+                if entry.name.endswith(LOCK_FILE_SUFFIX):
+                    locks_paths.append(entry.path)
+                    continue
+                with contextlib.suppress(FileNotFoundError):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, entry.path, stat.st_size))
+                    size += stat.st_size
+
+            for _, path, file_size in sorted(entries):
+                if size <= self.__maximum_size:
+                    break
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(path)
+                size -= file_size
+
+            for link_path in links_paths:
+                self.__remove_unlocked(link_path)
+            for lock_path in locks_paths:
+                if not os.path.exists(lock_path[:-len(LOCK_FILE_SUFFIX)]):
+                    self.__remove_unlocked(lock_path)
+
+    @staticmethod
+    def __remove_unlocked(path):
+        """
+        Removes a file if not locked, e.g. a link whose reader crashed, or a lock file no download holds.
+
+        The links of a split share its lock, so the links left by the crashed readers are removed once no reader uses
+        the split. A worker waiting on a removed lock file may download a split again, which is replaced atomically.
+
+        :param path: the file path
+        :type path: str
+        """
+        with contextlib.suppress(FileNotFoundError), open(path, 'rb') as file:
+            try:
+                fcntl.flock(file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return
+            os.remove(path)
+
+    @staticmethod
+    def __touch(path):
+        """
+        Marks a split as recently used.
+
+        :param path: the path of the cached split
+        :type path: str
+
+        :return: True if the split is cached, False otherwise
+        :rtype: bool
+        """
+        try:
+            os.utime(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    @staticmethod
+    @contextlib.contextmanager
+    def __lock(path, operation=fcntl.LOCK_EX):
+        """
+        Acquires a lock shared among the processes of the host.
+
+        :param path: the lock file path
+        :type path: str
+
+        :param operation: the lock operation, exclusive by default
+        :type operation: int
+        """
+        with open(path, 'a') as lock_file:
+            fcntl.flock(lock_file, operation)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class CachedFile(object):
+    """
+    A private link to a cached split, locked while open, and removed when closed.
+    """
+
+    def __init__(self, name, link_file):
+        """
+        Initializes the file.
+
+        :param name: the path of the link
+        :type name: str
+
+        :param link_file: the link opened with a shared lock, released when closed
+        :type link_file: file
+        """
+        self.name = name
+        self.__link_file = link_file
+
+    def close(self):
+        """
+        Removes the link, and releases its lock.
+        """
+        try:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(self.name)
+        finally:
+            self.__link_file.close()
@@ -0,0 +1,215 @@
+import time
+import threading
+import tempfile
+import concurrent.futures
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from worker.dataset_cache import DatasetCache
+
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+DEFAULT_WORKERS_NUMBER = 4
+
+
+class DatasetFetcher(object):
+    """
+    Downloads the dataset splits from the factorizer, sharing a pool of HTTP connections.
+
+    Independent splits are downloaded concurrently, and the time and size of every download are recorded.
+    """
+
+    def __init__(
+            self,
+            hostname,
+            port,
+            dataset_cache=None,
+            workers_number=DEFAULT_WORKERS_NUMBER,
+            chunk_size=DEFAULT_CHUNK_SIZE,
+    ):
+        """
+        Initializes the fetcher.
+
+        :param hostname: the hostname of the factorizer
+        :type hostname: str
+
+        :param port: the port of the factorizer
+        :type port: str
+
+        :param dataset_cache: the dataset cache, None to always download the splits
+        :type dataset_cache: worker.dataset_cache.DatasetCache
+
+        :param workers_number: the maximum number of concurrent downloads
+        :type workers_number: int
+
+        :param chunk_size: the size in bytes of the chunks read from the responses and written into the files
+        :type chunk_size: int
+        """
+        self.__hostname = hostname
+        self.__port = port
+        self.__dataset_cache = dataset_cache
+        self.__chunk_size = chunk_size
+
+        self.__session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers_number)
+        self.__session.mount('http://', adapter)
+        self.__session.mount('https://', adapter)
+
+        self.__pool_executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers_number)
+
+        self.__statistics = []
+        self.__statistics_lock = threading.Lock()
+
+    @property
+    def statistics(self):
+        """
+        Returns the statistics of the downloads since the last clearing.
+
+        Each download is described by its 'url', 'params', the 'bytes' transferred, the 'seconds' elapsed, and if it
+        has been served by the dataset 'cached'.
+
+        :return: the statistics
+        :rtype: list[dict]
+        """
+        with self.__statistics_lock:
+            return list(self.__statistics)
+
+    def clear_statistics(self):
+        """
+        Clears the statistics of the downloads.
+        """
+        with self.__statistics_lock:
+            self.__statistics = []
+
+    def fetch(
+            self,
+            url_template,
+            dataset_name,
+            request_params,
+    ):
+        """
+        Downloads a split into a file.
+
+        :param url_template: the URL template of the split, with the hostname_, port_ and dataset_name_ fields
+        :type url_template: str
+
+        :param dataset_name: the name of the dataset
+        :type dataset_name: str
+
+        :param request_params: the parameters of the request
+        :type request_params: dict
+
+        :return: the split file, whose path is in the name attribute, to close when no longer needed
+        :rtype: file
+        """
+        url = url_template.format(
+            hostname_=self.__hostname,
+            port_=self.__port,
+            dataset_name_=dataset_name,
+        )
+
+        start_time = time.monotonic()
+        downloaded_bytes = []
+
+        def download(file):
+            response = self.__session.get(url, params=request_params, stream=True)
+            response.raise_for_status()
+            for chunk in response.iter_content(chunk_size=self.__chunk_size):
+                if chunk:
+                    file.write(chunk)
+                    downloaded_bytes.append(len(chunk))
+
+            # Returns the expected size, unknown if the content is decompressed.
+            if response.headers.get('Content-Encoding'):
+                return None
+            return response.headers.get('Content-Length')
+
+        if self.__dataset_cache is not None:
+            dataset_file = self.__dataset_cache.open(DatasetCache.compute_key(url, request_params), download)
+        else:
+            # Saves the response into a temporary file.
+            dataset_file = tempfile.NamedTemporaryFile(buffering=self.__chunk_size)
+            download(dataset_file)
+            dataset_file.flush()
+            dataset_file.seek(0)
+
+        with self.__statistics_lock:
+            self.__statistics.append({
+                'url': url,
+                'params': request_params,
+                'bytes': sum(downloaded_bytes),
+                'seconds': time.monotonic() - start_time,
+                'cached': not downloaded_bytes,
+            })
+
+        return dataset_file
+
+    def submit(
+            self,
+            url_template,
+            dataset_name,
+            request_params,
+    ):
+        """
+        Starts downloading a split in background.
+
+        :param url_template: the URL template of the split, with the hostname_, port_ and dataset_name_ fields
+        :type url_template: str
+
+        :param dataset_name: the name of the dataset
+        :type dataset_name: str
+
+        :param request_params: the parameters of the request
+        :type request_params: dict
+
+        :return: the future split file
+        :rtype: concurrent.futures.Future
+        """
+        return self.__pool_executor.submit(self.fetch, url_template, dataset_name, request_params)
+
+    def fetch_all(
+            self,
+            dataset_name,
+            requests_params,
+    ):
+        """
+        Downloads several splits of a dataset concurrently.
+
+        :param dataset_name: the name of the dataset
+        :type dataset_name: str
+
+        :param requests_params: the URL template and the parameters of each request
+        :type requests_params: list[(str, dict)]
+
+        :return: the split files, in the same order of the requests
+        :rtype: list[file]
+        """
+        futures = [
+            self.submit(url_template, dataset_name, request_params)
+            for url_template, request_params in requests_params
+        ]
+
+        # Waits for all the downloads, before raising any error.
+        concurrent.futures.wait(futures)
+
+        dataset_files = []
+        errors = []
+        for future in futures:
+            if future.exception() is None:
+                dataset_files.append(future.result())
+            else:
+                errors.append(future.exception())
+        if errors:
+            for dataset_file in dataset_files:
+                dataset_file.close()
+            raise errors[0]
+
+        return dataset_files
+
+    def close(self):
+        """
+        Closes the HTTP connections.
+        """
+        self.__pool_executor.shutdown()
+        self.__session.close()
@@ -0,0 +1,159 @@
+import os
+import tempfile
+
+from worker.process_manager import ProcessManager
+
+
+class ExecutionContext(object):
+    """
+    Isolates a single execution of a command, so that several executions can run concurrently.
+
+    Each execution gets a copy-on-write view of the environment variables and a private scratch working directory,
+    mirroring the entries of the shared working directory by means of symbolic links.
+    The paths inside the shared working directory declared as private are not mirrored, and they are relocated into
+    the private working directory, while the ones outside it are relocated into the private directory, so that no
+    private path is shared by the executions.
+    """
+
+    def __init__(
+            self,
+            working_directory,
+            environment_variables,
+            private_paths=None,
+            scratch_directory=None,
+    ):
+        """
+        Initializes the context.
+
+        :param working_directory: the shared working directory, the current one if not provided
+        :type working_directory: str
+
+        :param environment_variables: the shared environment variables, never modified
+        :type environment_variables: dict[str, str]
+
+        :param private_paths: the paths that each execution writes, relocated into the private working directory
+        :type private_paths: list[str]
+
+        :param scratch_directory: the directory in which creating the private directories, the system one by default
+        :type scratch_directory: str
+        """
+        self.__working_directory = os.path.abspath(working_directory or os.getcwd())
+        self.__environment_variables = environment_variables
+        self.__private_paths = [os.path.abspath(path) for path in private_paths or [] if path]
+        self.__scratch_directory = scratch_directory
+
+        self.__directory = None
+        self.__private_working_directory = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def directory(self):
+        """
+        Returns the private directory of the execution, containing the private working directory.
+
+        :return: the directory path
+        :rtype: str
+        """
+        return self.__directory.name
+
+    @property
+    def working_directory(self):
+        """
+        Returns the private working directory of the execution.
+
+        :return: the directory path
+        :rtype: str
+        """
+        return self.__private_working_directory
+
+    def open(self):
+        """
+        Creates the private working directory, mirroring the shared one.
+        """
+        self.__directory = tempfile.TemporaryDirectory(prefix='ccube-execution-', dir=self.__scratch_directory)
+        self.__private_working_directory = os.path.join(self.__directory.name, 'work')
+        os.mkdir(self.__private_working_directory)
+
+        # Does not mirror the first path component of each private path.
+        excluded_names = set()
+        for path in self.__private_paths:
+            relative_path = self.__get_relative_path(path)
+            if relative_path is not None:
+                excluded_names.add(relative_path.split(os.sep)[0])
+
+        # Mirrors the shared working directory.
+        if os.path.isdir(self.__working_directory):
+            for entry in os.scandir(self.__working_directory):
+                if entry.name not in excluded_names:
+                    os.symlink(entry.path, os.path.join(self.__private_working_directory, entry.name))
+
+        # Creates the parent directories of the private paths.
+        for path in self.__private_paths:
+            os.makedirs(os.path.dirname(self.relocate_path(path)), exist_ok=True)
+
+    def close(self):
+        """
+        Removes the private working directory.
+        """
+        if self.__directory is not None:
+            self.__directory.cleanup()
+            self.__directory = None
+            self.__private_working_directory = None
+
+    def relocate_path(self, path):
+        """
+        Relocates a path into the private directory, into the private working directory if inside the shared one.
+
+        :param path: the path to relocate
+        :type path: str
+
+        :return: the relocated path
+        :rtype: str
+        """
+        if not path:
+            return path
+
+        path = os.path.abspath(path)
+        relative_path = self.__get_relative_path(path)
+        if relative_path is None:
+            return os.path.join(self.__directory.name, 'paths', os.path.splitdrive(path)[1].lstrip(os.sep))
+        return os.path.join(self.__private_working_directory, relative_path)
+
+    def create_process_manager(self, command):
+        """
+        Creates a process manager running in the private working directory, with a private copy of the environment.
+
+        :param command: the command to execute
+        :type command: str
+
+        :return: the process manager
+        :rtype: worker.process_manager.ProcessManager
+        """
+        return ProcessManager(
+            command=command,
+            working_directory=self.__private_working_directory,
+            environment_variables=self.__environment_variables,
+        )
+
+    def __get_relative_path(self, path):
+        """
+        Computes the path relative to the shared working directory.
+
+        :param path: the absolute path
+        :type path: str
+
+        :return: the relative path, None if outside the shared working directory
+        :rtype: str
+        """
+        if os.path.commonpath([path, self.__working_directory]) != self.__working_directory:
+            return None
+        relative_path = os.path.relpath(path, self.__working_directory)
+        if relative_path == os.curdir:
+            return None
+        return relative_path
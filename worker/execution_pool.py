@@ -0,0 +1,308 @@
+import os
+import threading
+import collections
+import concurrent.futures
+
+from worker.prediction_cache import PredictionCache, compute_file_hash
+
+
+SERIAL_EXECUTION_MODE = 'serial'
+THREAD_EXECUTION_MODE = 'thread'
+PROCESS_EXECUTION_MODE = 'process'
+BATCH_EXECUTION_MODE = 'batch'
+
+DEFAULT_BATCH_SIZE = 64
+
+EXECUTION_MODES = [
+    SERIAL_EXECUTION_MODE,
+    THREAD_EXECUTION_MODE,
+    PROCESS_EXECUTION_MODE,
+    BATCH_EXECUTION_MODE,
+]
+
+
+class ExecutionPool(object):
+    """
+    Executes a set of models on the same data, serially, concurrently, or in batches executed by a single process.
+    """
+
+    def __init__(
+            self,
+            execution_mode=SERIAL_EXECUTION_MODE,
+            workers_number=None,
+            batch_model_executor=None,
+            batch_size=DEFAULT_BATCH_SIZE,
+            prediction_cache=None,
+    ):
+        """
+        Initializes the pool.
+
+        :param execution_mode: the execution mode between 'serial', 'thread', 'process' and 'batch'
+        :type execution_mode: str
+
+        :param workers_number: the number of concurrent executions, the number of CPUs if not provided
+        :type workers_number: int
+
+        :param batch_model_executor: the executor of the batches of models, required by the batch mode
+        :type batch_model_executor: worker.batch_model_executor.BatchModelExecutor
+
+        :param batch_size: the maximum number of models of a batch, bounding the models executors consumed at once
+        :type batch_size: int
+
+        :param prediction_cache: the cache of the predicted values, None to always execute the models
+        :type prediction_cache: worker.prediction_cache.PredictionCache
+        """
+        if execution_mode is None:
+            execution_mode = SERIAL_EXECUTION_MODE
+        if execution_mode not in EXECUTION_MODES:
+            raise ValueError('Unknown execution mode: {}'.format(execution_mode))
+        if execution_mode == BATCH_EXECUTION_MODE and batch_model_executor is None:
+            raise ValueError('The batch execution mode requires a batch model executor')
+
+        if not workers_number:
+            workers_number = os.cpu_count() or 1
+
+        self.__execution_mode = execution_mode
+        self.__workers_number = int(workers_number)
+        self.__batch_model_executor = batch_model_executor
+        self.__batch_size = int(batch_size or DEFAULT_BATCH_SIZE)
+        self.__prediction_cache = prediction_cache
+
+        self.__data_keys = {}
+        self.__data_keys_lock = threading.Lock()
+
+    @property
+    def execution_mode(self):
+        """
+        Returns the execution mode.
+
+        :return: the execution mode
+        :rtype: str
+        """
+        return self.__execution_mode
+
+    @property
+    def workers_number(self):
+        """
+        Returns the number of concurrent executions.
+
+        :return: the number of workers
+        :rtype: int
+        """
+        return self.__workers_number
+
+    def compute_data_key(self, data_file_path):
+        """
+        Computes the key of a data file, the hash of its content, once per version of the file.
+
+        The file is identified by its path, device, inode, size and modification time, so the file is hashed again
+        only if it is replaced or modified.
+
+        :param data_file_path: the data file
+        :type data_file_path: str
+
+        :return: the key
+        :rtype: str
+        """
+        stat = os.stat(data_file_path)
+        version = (os.path.abspath(data_file_path), stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+        with self.__data_keys_lock:
+            data_key = self.__data_keys.get(version)
+        if data_key is None:
+            data_key = compute_file_hash(data_file_path)
+            with self.__data_keys_lock:
+                self.__data_keys[version] = data_key
+        return data_key
+
+    def execute(
+            self,
+            models_executors,
+            data_file_path,
+    ):
+        """
+        Executes all the models on the data file.
+
+        :param models_executors: the model executors
+        :type models_executors: list[worker.model_executor.ModelExecutor]
+
+        :param data_file_path: the data file to test the models
+        :type data_file_path: str
+
+        :return: the predicted values of each model, in the same order of the model executors
+        :rtype: list
+        """
+        return list(self.iterate_executions(models_executors, data_file_path))
+
+    def iterate_executions(
+            self,
+            models_executors,
+            data_file_path,
+    ):
+        """
+        Executes the models on the data file, yielding the predicted values as soon as they are available in order.
+
+        At most twice the number of workers executions are pending at the same time, so the model executors are
+        consumed lazily and the predicted values not yet consumed by the caller stay bounded.
+
+        :param models_executors: the model executors
+        :type models_executors: collections.Iterable[worker.model_executor.ModelExecutor]
+
+        :param data_file_path: the data file to test the models
+        :type data_file_path: str
+
+        :return: the predicted values of each model, in the same order of the model executors
+        :rtype: collections.Iterator
+        """
+        if self.__prediction_cache is not None and not self.__prediction_cache.bypass:
+            yield from self.__iterate_cached_executions(models_executors, data_file_path)
+            return
+
+        yield from self.__iterate_executions(models_executors, data_file_path)
+
+    def __iterate_executions(self, models_executors, data_file_path):
+        """
+        Executes the models according to the execution mode, yielding the predicted values in order.
+
+        :param models_executors: the model executors
+        :type models_executors: collections.Iterable[worker.model_executor.ModelExecutor]
+
+        :param data_file_path: the data file to test the models
+        :type data_file_path: str
+
+        :return: the predicted values of each model, in the same order of the model executors
+        :rtype: collections.Iterator
+        """
+        if self.__execution_mode == BATCH_EXECUTION_MODE:
+            yield from self.__iterate_batch_executions(models_executors, data_file_path)
+            return
+
+        if self.__execution_mode == SERIAL_EXECUTION_MODE or self.__workers_number == 1:
+            for model_executor in models_executors:
+                yield model_executor.execute(data_file_path)
+            return
+
+        if self.__execution_mode == THREAD_EXECUTION_MODE:
+            pool_executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.__workers_number)
+        else:
+            pool_executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.__workers_number)
+
+        pending_limit = 2 * self.__workers_number
+        with pool_executor:
+            pending_futures = collections.deque()
+            for model_executor in models_executors:
+                if len(pending_futures) >= pending_limit:
+                    yield pending_futures.popleft().result()
+                pending_futures.append(pool_executor.submit(execute_model, model_executor, data_file_path))
+
+            while pending_futures:
+                yield pending_futures.popleft().result()
+
+    def __iterate_cached_executions(self, models_executors, data_file_path):
+        """
+        Executes the models whose predicted values on the data are not cached, yielding the predicted values in order.
+
+        The data is identified by the hash of its content, computed once per version of the file, so the same split
+        fetched again is found.
+
+        :param models_executors: the model executors
+        :type models_executors: collections.Iterable[worker.model_executor.ModelExecutor]
+
+        :param data_file_path: the data file to test the models
+        :type data_file_path: str
+
+        :return: the predicted values of each model, in the same order of the model executors
+        :rtype: collections.Iterator
+        """
+        data_key = self.compute_data_key(data_file_path)
+
+        keys = []
+        models_predicted_values = []
+        missing_indices = []
+
+        def iterate_missing_models_executors():
+            for model_executor in models_executors:
+                key = PredictionCache.compute_key(model_executor.prediction_key, data_key)
+                keys.append(key)
+                models_predicted_values.append(self.__prediction_cache.get(key))
+                if models_predicted_values[-1] is None:
+                    missing_indices.append(len(keys) - 1)
+                    yield model_executor
+
+        # Yields the predicted values in order, as soon as the ones of the previous models are available.
+        position = 0
+        executions = self.__iterate_executions(iterate_missing_models_executors(), data_file_path)
+        for missing_index, predicted_values in enumerate(executions):
+            model_index = missing_indices[missing_index]
+            models_predicted_values[model_index] = predicted_values
+            self.__prediction_cache.put(keys[model_index], predicted_values)
+
+            while position < len(models_predicted_values) and models_predicted_values[position] is not None:
+                yield models_predicted_values[position]
+                models_predicted_values[position] = None
+                position += 1
+
+        while position < len(models_predicted_values):
+            yield models_predicted_values[position]
+            models_predicted_values[position] = None
+            position += 1
+
+    def __iterate_batch_executions(self, models_executors, data_file_path):
+        """
+        Executes the models in batches, yielding the predicted values of each batch in order.
+
+        :param models_executors: the model executors
+        :type models_executors: collections.Iterable[worker.model_executor.ModelExecutor]
+
+        :param data_file_path: the data file to test the models
+        :type data_file_path: str
+
+        :return: the predicted values of each model, in the same order of the model executors
+        :rtype: collections.Iterator
+        """
+        batch = []
+        for model_executor in models_executors:
+            batch.append(model_executor)
+            if len(batch) >= self.__batch_size:
+                yield from self.__batch_model_executor.execute(batch, data_file_path)
+                batch = []
+
+        if batch:
+            yield from self.__batch_model_executor.execute(batch, data_file_path)
+
+
+def execute_model(model_executor, data_file_path):
+    """
+    Executes a model on a data file, defined at module level to be usable by a process pool.
+
+    :param model_executor: the model executor
+    :type model_executor: worker.model_executor.ModelExecutor
+
+    :param data_file_path: the data file to test the model
+    :type data_file_path: str
+
+    :return: the predicted values
+    :rtype: object
+    """
+    return model_executor.execute(data_file_path)
+
+
+def create_execution_pool(configuration):
+    """
+    Creates the execution pool from a policy configuration.
+
+    :param configuration: the configuration, optionally containing 'execution_mode', 'execution_workers',
+        'batch_model_executor', 'execution_batch_size' and 'prediction_cache'
+    :type configuration: dict
+
+    :return: the execution pool
+    :rtype: ExecutionPool
+    """
+    configuration = configuration or {}
+    return ExecutionPool(
+        execution_mode=configuration.get('execution_mode'),
+        workers_number=configuration.get('execution_workers'),
+        batch_model_executor=configuration.get('batch_model_executor'),
+        batch_size=configuration.get('execution_batch_size'),
+        prediction_cache=configuration.get('prediction_cache'),
+    )
@@ -0,0 +1,272 @@
+import numpy
+
+from worker.expression_model import OPERATORS, VARIABLE_NODE, CONSTANT_NODE, get_variable_values
+from worker.expression_model_executor import iterate_attributes_values, DEFAULT_CHUNK_ROWS_NUMBER
+
+
+DEFAULT_MEMORY_BUDGET = 256 * 1024 * 1024
+
+
+class ExpressionGraph(object):
+    """
+    Merges the expressions of several models into a single directed acyclic graph, so that the subexpressions shared
+    by the models, or repeated in the same model, are evaluated only once.
+
+    Each node is identified by its operator and the identifiers of its operands, so that equal subexpressions map to
+    the same node. The identifiers are assigned after the ones of the operands, so they are a topological order.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty graph.
+        """
+        self.__nodes = []
+        self.__nodes_identifiers = {}
+        self.__roots = []
+        self.__expressions_nodes_number = 0
+
+    def __len__(self):
+        return len(self.__nodes)
+
+    @property
+    def roots(self):
+        """
+        Returns the identifier of the root node of each added expression.
+
+        :return: the root identifiers
+        :rtype: list[int]
+        """
+        return list(self.__roots)
+
+    @property
+    def expressions_nodes_number(self):
+        """
+        Returns the total number of nodes of the added expressions, counting the shared ones once per occurrence.
+
+        :return: the number of nodes
+        :rtype: int
+        """
+        return self.__expressions_nodes_number
+
+    @property
+    def peak_outputs_number(self):
+        """
+        Returns the maximum number of node outputs alive at the same time during an evaluation, each one having a
+        value per row.
+
+        :return: the number of outputs
+        :rtype: int
+        """
+        return self.__schedule()[1]
+
+    def add(
+            self,
+            expression,
+    ):
+        """
+        Adds an expression to the graph, sharing the nodes of the equal subexpressions.
+
+        :param expression: the expression tree, as returned by worker.expression_model.parse_expression
+        :type expression: tuple
+
+        :return: the identifier of the root node
+        :rtype: int
+        """
+        root = self.__intern(expression)
+        self.__roots.append(root)
+        return root
+
+    def evaluate(
+            self,
+            attributes_values,
+    ):
+        """
+        Evaluates all the expressions on the attributes values, each node once.
+
+        :param attributes_values: the attributes values, one row per example
+        :type attributes_values: numpy.ndarray
+
+        :return: the outputs, one row per added expression
+        :rtype: numpy.ndarray
+        """
+        attributes_values = numpy.asarray(attributes_values, dtype=numpy.float64)
+
+        expressions_outputs = numpy.empty((len(self.__roots), attributes_values.shape[0]), dtype=numpy.float64)
+        for expressions_indices, outputs in self.iterate_outputs(attributes_values):
+            expressions_outputs[expressions_indices] = outputs
+        return expressions_outputs
+
+    def iterate_outputs(
+            self,
+            attributes_values,
+    ):
+        """
+        Evaluates all the expressions on the attributes values, each node once, yielding the outputs of each root as
+        soon as computed.
+
+        The outputs of each node are released as soon as their last consumer is evaluated, so the yielded outputs
+        must be consumed before continuing the iteration, e.g. thresholded.
+
+        :param attributes_values: the attributes values, one row per example
+        :type attributes_values: numpy.ndarray
+
+        :return: the indices of the expressions having the root, and its outputs
+        :rtype: collections.Iterator[(list[int], numpy.ndarray)]
+        """
+        attributes_values = numpy.asarray(attributes_values, dtype=numpy.float64)
+        rows_number = attributes_values.shape[0]
+
+        roots_expressions_indices = {}
+        for expression_index, root in enumerate(self.__roots):
+            roots_expressions_indices.setdefault(root, []).append(expression_index)
+
+        released_nodes = self.__schedule()[0]
+
+        outputs = {}
+        for identifier, node in enumerate(self.__nodes):
+            with numpy.errstate(all='ignore'):
+                if node[0] == VARIABLE_NODE:
+                    outputs[identifier] = get_variable_values(attributes_values, node[1])
+                elif node[0] == CONSTANT_NODE:
+                    outputs[identifier] = numpy.full(rows_number, node[1])
+                else:
+                    outputs[identifier] = OPERATORS[node[0]][1](*[outputs[operand] for operand in node[1:]])
+
+            if identifier in roots_expressions_indices:
+                yield roots_expressions_indices[identifier], outputs[identifier]
+
+            for released_node in released_nodes[identifier]:
+                del outputs[released_node]
+
+    def __schedule(self):
+        """
+        Finds after which node the outputs of each node can be released, i.e. after its last consumer, or after
+        itself if no node consumes it.
+
+        :return: the nodes released after each node, and the maximum number of outputs alive at the same time
+        :rtype: (list[list[int]], int)
+        """
+        last_consumers = list(range(len(self.__nodes)))
+        for identifier, node in enumerate(self.__nodes):
+            if node[0] not in (VARIABLE_NODE, CONSTANT_NODE):
+                for operand in node[1:]:
+                    last_consumers[operand] = identifier
+
+        released_nodes = [[] for _ in self.__nodes]
+        for identifier, last_consumer in enumerate(last_consumers):
+            released_nodes[last_consumer].append(identifier)
+
+        alive_outputs_number = 0
+        peak_outputs_number = 0
+        for identifier in range(len(self.__nodes)):
+            alive_outputs_number += 1
+            peak_outputs_number = max(peak_outputs_number, alive_outputs_number)
+            alive_outputs_number -= len(released_nodes[identifier])
+
+        return released_nodes, peak_outputs_number
+
+    def __intern(self, expression):
+        """
+        Finds the node of an expression, adding it and its operands if not in the graph.
+
+        :param expression: the expression tree
+        :type expression: tuple
+
+        :return: the node identifier
+        :rtype: int
+        """
+        self.__expressions_nodes_number += 1
+
+        if expression[0] in (VARIABLE_NODE, CONSTANT_NODE):
+            node = expression
+        else:
+            node = (expression[0],) + tuple(self.__intern(operand) for operand in expression[1:])
+
+        identifier = self.__nodes_identifiers.get(node)
+        if identifier is None:
+            identifier = len(self.__nodes)
+            self.__nodes.append(node)
+            self.__nodes_identifiers[node] = identifier
+        return identifier
+
+
+class ExpressionGraphExecutor(object):
+    """
+    Executes a batch of expression models together, merging them into an expression graph evaluated on each chunk of
+    the data, so that the data is loaded once and the shared subexpressions are evaluated once.
+
+    It has the interface of the batch model executor, working with expression model executors.
+    """
+
+    def __init__(
+            self,
+            header_lines_number=0,
+            chunk_rows_number=DEFAULT_CHUNK_ROWS_NUMBER,
+            memory_budget=DEFAULT_MEMORY_BUDGET,
+    ):
+        """
+        Initializes the executor.
+
+        :param header_lines_number: the number of header lines of the data
+        :type header_lines_number: int
+
+        :param chunk_rows_number: the maximum number of rows evaluated at once
+        :type chunk_rows_number: int
+
+        :param memory_budget: the maximum size in bytes of the node outputs alive at once, reducing the rows of a
+            chunk for the large graphs
+        :type memory_budget: int
+        """
+        self.__header_lines_number = int(header_lines_number or 0)
+        self.__chunk_rows_number = int(chunk_rows_number or DEFAULT_CHUNK_ROWS_NUMBER)
+        self.__memory_budget = int(memory_budget or DEFAULT_MEMORY_BUDGET)
+
+    def execute(
+            self,
+            models_executors,
+            data_file_path,
+    ):
+        """
+        Evaluates the models on the data file, returning the predicted values of each one.
+
+        The outputs of each model are thresholded as soon as computed, so that only the predicted values of the
+        models, one byte per row, are kept.
+
+        :param models_executors: the expression model executors
+        :type models_executors: list[worker.expression_model_executor.ExpressionModelExecutor]
+
+        :param data_file_path: the data file to test the models
+        :type data_file_path: str
+
+        :return: the predicted values of each model, 0 or 1, in the same order of the model executors
+        :rtype: list[numpy.ndarray]
+        """
+        models = [model_executor.model for model_executor in models_executors]
+        if not models:
+            return []
+
+        # Merges the expressions of the models.
+        expression_graph = ExpressionGraph()
+        for model in models:
+            expression_graph.add(model.expression)
+
+        # Bounds the rows of a chunk, so that the node outputs alive at once fit the memory budget.
+        row_size = numpy.dtype(numpy.float64).itemsize * expression_graph.peak_outputs_number
+        chunk_rows_number = min(self.__chunk_rows_number, max(1, self.__memory_budget // row_size))
+
+        # Evaluates the graph on each chunk, thresholding the outputs of each model.
+        models_predicted_values_chunks = [[] for _ in models]
+        attributes_values_chunks = iterate_attributes_values(
+            data_file_path,
+            self.__header_lines_number,
+            chunk_rows_number,
+        )
+        for attributes_values in attributes_values_chunks:
+            for models_indices, outputs in expression_graph.iterate_outputs(attributes_values):
+                for model_index in models_indices:
+                    models_predicted_values_chunks[model_index].append(models[model_index].threshold_outputs(outputs))
+
+        return [
+            numpy.concatenate(predicted_values_chunks) if predicted_values_chunks else numpy.empty(0, dtype=numpy.int8)
+            for predicted_values_chunks in models_predicted_values_chunks
+        ]
@@ -0,0 +1,330 @@
+import re
+
+import numpy
+
+
+VARIABLE_NODE = 'variable'
+CONSTANT_NODE = 'constant'
+
+PROTECTION_THRESHOLD = 1e-6
+
+TOKENS_PATTERN = re.compile(r'\(|\)|[^\s()]+')
+
+
+def protected_divide(dividend, divisor):
+    """
+    Divides, returning 1 where the divisor is almost zero.
+    """
+    return numpy.where(numpy.abs(divisor) < PROTECTION_THRESHOLD, 1.0, dividend / divisor)
+
+
+def protected_log(values):
+    """
+    Computes the logarithm of the absolute values, returning 0 where the value is almost zero.
+    """
+    absolute_values = numpy.abs(values)
+    return numpy.where(absolute_values < PROTECTION_THRESHOLD, 0.0, numpy.log(absolute_values))
+
+
+def protected_sqrt(values):
+    """
+    Computes the square root of the absolute values.
+    """
+    return numpy.sqrt(numpy.abs(values))
+
+
+# The operators of the gpfunction learner with their aliases, as arity and function.
+OPERATORS = {
+    '+': (2, numpy.add),
+    'plus': (2, numpy.add),
+    '-': (2, numpy.subtract),
+    'minus': (2, numpy.subtract),
+    '*': (2, numpy.multiply),
+    '.*': (2, numpy.multiply),
+    'times': (2, numpy.multiply),
+    '/': (2, protected_divide),
+    './': (2, protected_divide),
+    'mydivide': (2, protected_divide),
+    'sin': (1, numpy.sin),
+    'cos': (1, numpy.cos),
+    'log': (1, protected_log),
+    'mylog': (1, protected_log),
+    'exp': (1, numpy.exp),
+    'sqrt': (1, protected_sqrt),
+    'mysqrt': (1, protected_sqrt),
+    'square': (1, lambda values: numpy.power(values, 2.0)),
+    'cube': (1, lambda values: numpy.power(values, 3.0)),
+    'quart': (1, lambda values: numpy.power(values, 4.0)),
+}
+
+
+class ExpressionModel(object):
+    """
+    Implements a binary classifier made of a symbolic expression over the attributes, as the gpfunction learner does.
+
+    The expression is evaluated vectorized on the columns of the attributes. Its output is clipped into the range of
+    the outputs on the training data, scaled into [0, 1], and compared to the threshold: the rows whose scaled output
+    is not less than the threshold are predicted as 1, the other ones as 0.
+    """
+
+    def __init__(
+            self,
+            expression,
+            threshold,
+            minimum_output,
+            maximum_output,
+    ):
+        """
+        Initializes the model.
+
+        :param expression: the expression tree, as returned by parse_expression
+        :type expression: tuple
+
+        :param threshold: the threshold of the scaled output
+        :type threshold: float
+
+        :param minimum_output: the minimum output on the training data
+        :type minimum_output: float
+
+        :param maximum_output: the maximum output on the training data
+        :type maximum_output: float
+        """
+        self.__expression = expression
+        self.__threshold = float(threshold)
+        self.__minimum_output = float(minimum_output)
+        self.__maximum_output = float(maximum_output)
+
+    @staticmethod
+    def parse(line):
+        """
+        Parses a model line of the gpfunction learner, made of the expression, two fitness values, the threshold, and
+        the minimum and maximum training outputs, separated by commas.
+
+        :param line: the model line
+        :type line: str
+
+        :return: the model
+        :rtype: ExpressionModel
+        """
+        fields = line.strip().split(',')
+        if len(fields) < 6:
+            raise ValueError('Found {} fields instead of 6 in the expression model'.format(len(fields)))
+
+        return ExpressionModel(
+            expression=parse_expression(fields[0]),
+            threshold=float(fields[3]),
+            minimum_output=float(fields[4]),
+            maximum_output=float(fields[5]),
+        )
+
+    @property
+    def expression(self):
+        """
+        Returns the expression tree.
+
+        :return: the expression
+        :rtype: tuple
+        """
+        return self.__expression
+
+    @property
+    def threshold(self):
+        """
+        Returns the threshold of the scaled output.
+
+        :return: the threshold
+        :rtype: float
+        """
+        return self.__threshold
+
+    def evaluate(
+            self,
+            attributes_values,
+    ):
+        """
+        Evaluates the expression on the attributes values.
+
+        :param attributes_values: the attributes values, one row per example
+        :type attributes_values: numpy.ndarray
+
+        :return: the output of each row
+        :rtype: numpy.ndarray
+        """
+        return evaluate_expression(self.__expression, attributes_values)
+
+    def predict(
+            self,
+            attributes_values,
+    ):
+        """
+        Predicts the class value of each row.
+
+        :param attributes_values: the attributes values, one row per example
+        :type attributes_values: numpy.ndarray
+
+        :return: the predicted class values, 0 or 1
+        :rtype: numpy.ndarray
+        """
+        return self.threshold_outputs(self.evaluate(attributes_values))
+
+    def threshold_outputs(
+            self,
+            outputs,
+    ):
+        """
+        Converts the outputs of the expression into class values.
+
+        :param outputs: the outputs of the expression
+        :type outputs: numpy.ndarray
+
+        :return: the predicted class values, 0 or 1, the undefined outputs being 0
+        :rtype: numpy.ndarray
+        """
+        with numpy.errstate(all='ignore'):
+            outputs = numpy.where(outputs > self.__maximum_output, self.__maximum_output, outputs)
+            outputs = numpy.where(outputs < self.__minimum_output, self.__minimum_output, outputs)
+            scaled_outputs = (outputs - self.__minimum_output) / (self.__maximum_output - self.__minimum_output)
+            return (scaled_outputs >= self.__threshold).astype(numpy.int8)
+
+
+def parse_expression(string):
+    """
+    Parses a prefix expression, e.g. '(+ (exp X1) 0.5)', into a tree of tuples.
+
+    The operator nodes are tuples of the operator name followed by the operand nodes, the variable nodes are
+    ('variable', column index), with 'X1' being the first column, and the constant nodes are ('constant', value).
+
+    :param string: the expression
+    :type string: str
+
+    :return: the expression tree
+    :rtype: tuple
+    """
+    tokens = TOKENS_PATTERN.findall(string)
+    if not tokens:
+        raise ValueError('Empty expression')
+
+    position, node = parse_tokens(tokens, 0)
+    if position != len(tokens):
+        raise ValueError('Unexpected token in the expression: {}'.format(tokens[position]))
+    return node
+
+
+def parse_tokens(tokens, position):
+    """
+    Parses the node starting at a position of the tokens.
+
+    :param tokens: the tokens
+    :type tokens: list[str]
+
+    :param position: the position of the first token of the node
+    :type position: int
+
+    :return: the position following the node, and the node
+    :rtype: (int, tuple)
+    """
+    if position >= len(tokens):
+        raise ValueError('Unexpected end of the expression')
+
+    token = tokens[position]
+    if token == ')':
+        raise ValueError('Unexpected closing parenthesis in the expression')
+    if token != '(':
+        return position + 1, parse_terminal(token)
+
+    # Parses the operator and its operands.
+    position += 1
+    if position >= len(tokens) or tokens[position] not in OPERATORS:
+        raise ValueError('Unknown operator in the expression: {}'.format(tokens[position:position + 1]))
+    operator = tokens[position]
+    position += 1
+
+    operands = []
+    for _ in range(OPERATORS[operator][0]):
+        position, operand = parse_tokens(tokens, position)
+        operands.append(operand)
+
+    if position >= len(tokens) or tokens[position] != ')':
+        raise ValueError('Missing closing parenthesis after the operands of {}'.format(operator))
+    return position + 1, (operator,) + tuple(operands)
+
+
+def parse_terminal(token):
+    """
+    Parses a variable, e.g. 'X1', 'x' or 'y', or a constant.
+
+    :param token: the token
+    :type token: str
+
+    :return: the node
+    :rtype: tuple
+    """
+    if token.startswith('X'):
+        column_index = int(token[1:]) - 1
+        if column_index < 0:
+            raise ValueError('Invalid variable in the expression, the first one being X1: {}'.format(token))
+        return VARIABLE_NODE, column_index
+    if token == 'x':
+        return VARIABLE_NODE, 0
+    if token == 'y':
+        return VARIABLE_NODE, 1
+    return CONSTANT_NODE, float(token)
+
+
+def evaluate_expression(node, attributes_values):
+    """
+    Evaluates an expression tree on the attributes values.
+
+    :param node: the expression tree
+    :type node: tuple
+
+    :param attributes_values: the attributes values, one row per example
+    :type attributes_values: numpy.ndarray
+
+    :return: the output of each row
+    :rtype: numpy.ndarray
+    """
+    with numpy.errstate(all='ignore'):
+        return evaluate_node(node, numpy.asarray(attributes_values, dtype=numpy.float64))
+
+
+def evaluate_node(node, attributes_values):
+    """
+    Evaluates a node recursively.
+
+    :param node: the node
+    :type node: tuple
+
+    :param attributes_values: the attributes values, one row per example
+    :type attributes_values: numpy.ndarray
+
+    :return: the output of each row
+    :rtype: numpy.ndarray
+    """
+    if node[0] == VARIABLE_NODE:
+        return get_variable_values(attributes_values, node[1])
+    if node[0] == CONSTANT_NODE:
+        return numpy.full(attributes_values.shape[0], node[1])
+
+    return OPERATORS[node[0]][1](*[evaluate_node(operand, attributes_values) for operand in node[1:]])
+
+
+def get_variable_values(attributes_values, column_index):
+    """
+    Retrieves the values of a variable, checking that the attributes include it.
+
+    :param attributes_values: the attributes values, one row per example
+    :type attributes_values: numpy.ndarray
+
+    :param column_index: the column index of the variable
+    :type column_index: int
+
+    :return: the value of each row
+    :rtype: numpy.ndarray
+    """
+    if not 0 <= column_index < attributes_values.shape[1]:
+        raise ValueError('The expression refers to the attribute X{}, but the data has {} attributes'.format(
+            column_index + 1,
+            attributes_values.shape[1],
+        ))
+    return attributes_values[:, column_index]
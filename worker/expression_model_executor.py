@@ -0,0 +1,167 @@
+import io
+import os
+import zipfile
+import itertools
+
+import numpy
+
+from worker.artifact_stores.artifact_store import InlineArtifact
+from worker.expression_model import ExpressionModel
+from worker.prediction_cache import compute_model_key
+
+
+DEFAULT_MODEL_FILE_NAME = 'mostAccurate.txt'
+DEFAULT_CHUNK_ROWS_NUMBER = 64 * 1024
+
+
+class ExpressionModelExecutor(object):
+    """
+    Executes an expression model of the gpfunction learner in the worker process, without running the predict command.
+
+    The model file is read from the model archive, and the data file is loaded in chunks of rows, so that the memory
+    is bounded. As the gpfunction learner does, the last column of the data is the class, and it is not used.
+    """
+
+    def __init__(
+            self,
+            model_files_stream=None,
+            model_artifact=None,
+            model_file_name=DEFAULT_MODEL_FILE_NAME,
+            header_lines_number=0,
+            chunk_rows_number=DEFAULT_CHUNK_ROWS_NUMBER,
+    ):
+        """
+        Initializes the executor.
+
+        :param model_files_stream: the base64 zip string, ignored if model_artifact is provided
+        :type model_files_stream: str
+
+        :param model_artifact: the artifact containing the model files, lazily loaded
+        :type model_artifact: worker.artifact_stores.artifact_store.Artifact
+
+        :param model_file_name: the name of the model file in the model archive
+        :type model_file_name: str
+
+        :param header_lines_number: the number of header lines of the data
+        :type header_lines_number: int
+
+        :param chunk_rows_number: the maximum number of rows evaluated at once
+        :type chunk_rows_number: int
+        """
+        if model_artifact is None:
+            model_artifact = InlineArtifact(model_files_stream)
+        self.__model_artifact = model_artifact
+        self.__model_file_name = model_file_name or DEFAULT_MODEL_FILE_NAME
+        self.__header_lines_number = int(header_lines_number or 0)
+        self.__chunk_rows_number = int(chunk_rows_number or DEFAULT_CHUNK_ROWS_NUMBER)
+
+        self.__model = None
+
+    @property
+    def model_artifact(self):
+        """
+        Returns the artifact containing the model files.
+
+        :return: the artifact
+        :rtype: worker.artifact_stores.artifact_store.Artifact
+        """
+        return self.__model_artifact
+
+    @property
+    def model(self):
+        """
+        Returns the expression model, loading it at the first access.
+
+        :return: the model
+        :rtype: worker.expression_model.ExpressionModel
+        """
+        if self.__model is None:
+            self.__model = load_expression_model(self.__model_artifact.load(), self.__model_file_name)
+        return self.__model
+
+    @property
+    def prediction_key(self):
+        """
+        Returns the key of the model and of how it is executed, identifying its predicted values on the same data.
+
+        :return: the key
+        :rtype: str
+        """
+        return compute_model_key(self.__model_artifact, ['expression', self.__model_file_name])
+
+    def execute(
+            self,
+            data_file_path,
+    ):
+        """
+        Evaluates the model on the data file and returns the predicted values.
+
+        :param data_file_path: the data file to test the model
+        :type data_file_path: str
+
+        :return: the predicted values, 0 or 1
+        :rtype: numpy.ndarray
+        """
+        model = self.model
+
+        predicted_values_chunks = [
+            model.predict(attributes_values)
+            for attributes_values in iterate_attributes_values(
+                data_file_path,
+                self.__header_lines_number,
+                self.__chunk_rows_number,
+            )
+        ]
+        if not predicted_values_chunks:
+            return numpy.empty(0, dtype=numpy.int8)
+        return numpy.concatenate(predicted_values_chunks)
+
+
+def load_expression_model(model_files, model_file_name):
+    """
+    Loads the expression model from the model archive.
+
+    :param model_files: the zip bytes of the model files
+    :type model_files: bytes
+
+    :param model_file_name: the name of the model file, searched in any directory of the archive
+    :type model_file_name: str
+
+    :return: the model
+    :rtype: worker.expression_model.ExpressionModel
+    """
+    with zipfile.ZipFile(io.BytesIO(model_files)) as model_zip_file:
+        for name in model_zip_file.namelist():
+            if os.path.basename(name) == model_file_name:
+                line = model_zip_file.read(name).decode('utf-8').strip().splitlines()[0]
+                return ExpressionModel.parse(line)
+
+    raise ValueError('Model file not found: {}'.format(model_file_name))
+
+
+def iterate_attributes_values(data_file_path, header_lines_number, chunk_rows_number):
+    """
+    Loads the attributes values of a comma-separated data file in chunks of rows, excluding the last column.
+
+    :param data_file_path: the data file
+    :type data_file_path: str
+
+    :param header_lines_number: the number of header lines
+    :type header_lines_number: int
+
+    :param chunk_rows_number: the maximum number of rows of a chunk
+    :type chunk_rows_number: int
+
+    :return: the attributes values of each chunk, one row per example
+    :rtype: collections.Iterator[numpy.ndarray]
+    """
+    with open(data_file_path, 'r') as data_file:
+        lines = (line for line in data_file if line.strip())
+        lines = itertools.islice(lines, header_lines_number, None)
+        while True:
+            chunk_lines = list(itertools.islice(lines, chunk_rows_number))
+            if not chunk_lines:
+                return
+
+            values = numpy.loadtxt(chunk_lines, delimiter=',', dtype=numpy.float64, ndmin=2)
+            yield values[:, :-1]
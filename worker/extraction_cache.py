@@ -0,0 +1,213 @@
+import os
+import fcntl
+import shutil
+import tempfile
+import threading
+import contextlib
+
+from worker import utils
+
+
+DEFAULT_MAXIMUM_SIZE = 512 * 1024 * 1024
+
+LOCK_FILE_SUFFIX = '.lock'
+EVICTION_LOCK_FILE_NAME = '.eviction.lock'
+TEMPORARY_DIRECTORY_PREFIX = '.extract-'
+
+
+class ExtractionCache(object):
+    """
+    Caches the extracted model files, so that a model executed several times is extracted only once.
+
+    The directories are named by the hash of the model artifact, so the copies of the cache sent to other processes
+    share them. They are extracted atomically, and evicted in least recently used order when the total size exceeds
+    the maximum size. A directory in use holds a shared lock on its lock file, so it is never evicted by any process.
+    The cached model files are shared among the executions, so the commands must not modify them.
+    """
+
+    def __init__(
+            self,
+            directory=None,
+            maximum_size=DEFAULT_MAXIMUM_SIZE,
+    ):
+        """
+        Initializes the cache, creating its root directory.
+
+        :param directory: the directory in which creating the cache root, e.g. a tmpfs mount, the system one by default
+        :type directory: str
+
+        :param maximum_size: the maximum size in bytes of the extracted files
+        :type maximum_size: int
+        """
+        self.__directory = tempfile.mkdtemp(prefix='ccube-models-', dir=directory)
+        self.__maximum_size = int(maximum_size)
+
+        self.__initialize_sizes()
+
+    def __getstate__(self):
+        # Copies sent to other processes share the directories of the same root.
+        return {
+            'directory': self.__directory,
+            'maximum_size': self.__maximum_size,
+        }
+
+    def __setstate__(self, state):
+        self.__directory = state['directory']
+        self.__maximum_size = state['maximum_size']
+
+        self.__initialize_sizes()
+
+    @property
+    def directory(self):
+        """
+        Returns the root directory of the cache.
+
+        :return: the directory path
+        :rtype: str
+        """
+        return self.__directory
+
+    @property
+    def size(self):
+        """
+        Returns the total size of the extracted files.
+
+        :return: the size in bytes
+        :rtype: int
+        """
+        return sum(size for _, _, size in self.__scan())
+
+    @contextlib.contextmanager
+    def extract(self, model_artifact):
+        """
+        Retrieves the directory containing the extracted model files, extracting them if not cached.
+
+        :param model_artifact: the artifact containing the model files
+        :type model_artifact: worker.artifact_stores.artifact_store.Artifact
+
+        :return: a context manager providing the directory path, in use until exiting the context
+        :rtype: contextlib.AbstractContextManager[str]
+        """
+        path = os.path.join(self.__directory, model_artifact.hash)
+
+        with open(path + LOCK_FILE_SUFFIX, 'a') as lock_file:
+            # Marks the directory as in use, waiting for an eviction in progress.
+            fcntl.flock(lock_file, fcntl.LOCK_SH)
+            try:
+                if not os.path.isdir(path):
+                    self.__extract(model_artifact, path)
+
+                # Marks the directory as recently used.
+                os.utime(path)
+                yield path
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+        self.__evict()
+
+    def close(self):
+        """
+        Removes the cache root directory, with all the extracted files.
+        """
+        shutil.rmtree(self.__directory, ignore_errors=True)
+        self.__initialize_sizes()
+
+    def __initialize_sizes(self):
+        """
+        Initializes the known sizes of the extracted directories, which never change once extracted.
+        """
+        self.__sizes = {}
+        self.__sizes_lock = threading.Lock()
+
+    def __extract(self, model_artifact, path):
+        """
+        Extracts the model files into a temporary directory, atomically moved to the path when complete.
+
+        :param model_artifact: the artifact containing the model files
+        :type model_artifact: worker.artifact_stores.artifact_store.Artifact
+
+        :param path: the path of the cached directory
+        :type path: str
+        """
+        temporary_path = tempfile.mkdtemp(prefix=TEMPORARY_DIRECTORY_PREFIX, dir=self.__directory)
+        try:
+            utils.extract_zip_bytes(model_artifact.load(), temporary_path)
+            os.rename(temporary_path, path)
+        except OSError:
+            # Another execution has extracted the same files meanwhile.
+            if not os.path.isdir(path):
+                raise
+        finally:
+            shutil.rmtree(temporary_path, ignore_errors=True)
+
+    def __scan(self):
+        """
+        Lists the extracted directories.
+
+        :return: the modification time, path and size of each directory
+        :rtype: list[(float, str, int)]
+        """
+        entries = []
+        for entry in os.scandir(self.__directory):
+            if entry.name.startswith('.') or not entry.is_dir():
+                continue
+
+            with contextlib.suppress(FileNotFoundError):
+                modification_time = entry.stat().st_mtime
+                with self.__sizes_lock:
+                    size = self.__sizes.get(entry.path)
+                if size is None:
+                    size = compute_directory_size(entry.path)
+                    with self.__sizes_lock:
+                        self.__sizes[entry.path] = size
+                entries.append((modification_time, entry.path, size))
+
+        return entries
+
+    def __evict(self):
+        """
+        Removes the least recently used directories not in use, until the size is within the maximum.
+        """
+        with open(os.path.join(self.__directory, EVICTION_LOCK_FILE_NAME), 'a') as eviction_lock_file:
+            fcntl.flock(eviction_lock_file, fcntl.LOCK_EX)
+            try:
+                entries = self.__scan()
+                size = sum(entry_size for _, _, entry_size in entries)
+
+                for _, path, entry_size in sorted(entries):
+                    if size <= self.__maximum_size:
+                        break
+
+                    with open(path + LOCK_FILE_SUFFIX, 'a') as lock_file:
+                        # Skips the directories in use.
+                        try:
+                            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                        except BlockingIOError:
+                            continue
+                        try:
+                            shutil.rmtree(path, ignore_errors=True)
+                        finally:
+                            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+                    with self.__sizes_lock:
+                        self.__sizes.pop(path, None)
+                    size -= entry_size
+            finally:
+                fcntl.flock(eviction_lock_file, fcntl.LOCK_UN)
+
+
+def compute_directory_size(path):
+    """
+    Computes the total size of the files in a directory.
+
+    :param path: the directory path
+    :type path: str
+
+    :return: the size in bytes
+    :rtype: int
+    """
+    size = 0
+    for root, directories, files in os.walk(path):
+        for file in files:
+            size += os.path.getsize(os.path.join(root, file))
+    return size
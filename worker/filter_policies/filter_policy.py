@@ -1,6 +1,7 @@
 from abc import ABCMeta, abstractmethod
 
 from worker import utils
+from worker.label_dictionary import LabelDictionary
 
 
 class FilterPolicy(object):
@@ -23,8 +24,8 @@ class FilterPolicy(object):
         """
         Initializes a policy for filtering.
 
-        :param models_executors: the model executors
-        :type models_executors: object
+        :param models_executors: the model executors, possibly an iterator producing them as they are available
+        :type models_executors: collections.Iterable[worker.model_executor.ModelExecutor]
 
         :param training_data: the training data file
         :type training_data: str
@@ -47,6 +48,10 @@ class FilterPolicy(object):
         self._true_class_value = utils.convert_string(true_class_value, class_attribute_type)
         self._configuration = configuration
 
+        # Encodes the actual values once, as the codes of the label dictionary.
+        self._label_dictionary = LabelDictionary(true_class_value, class_attribute_type, actual_values)
+        self._actual_codes = self._label_dictionary.encode(actual_values)
+
     @abstractmethod
     def filter(
             self,
@@ -1,14 +1,27 @@
-from collections import Counter
+import math
+import tempfile
 
 import numpy
 
 from worker import utils
+from worker import metrics
+from worker.execution_pool import create_execution_pool
 from worker.filter_policies.filter_policy import FilterPolicy
 
 
+DEFAULT_RACING_INITIAL_FRACTION = 0.125
+
+
 class MajorityCostThresholdFilterPolicy(FilterPolicy):
     """
     Applies the majority cost thresold filtering, only working with binary class values.
+
+    If the 'racing_delta' configuration value is set, the models race on growing blocks of the rows, and the ones worse
+    than the majority classifier are rejected early with probability of wrong rejection at most delta, shared by all
+    the models and blocks by the union bound.
+    A zero delta never rejects early, giving the same result of the exact filtering.
+    Racing needs all the models before the first block, so it consumes the whole models stream and disables streaming.
+    The blocks are written with the 'header_lines_number' header lines of the training data, none by default.
     """
 
     def __init__(
@@ -31,62 +44,241 @@ class MajorityCostThresholdFilterPolicy(FilterPolicy):
 
         self.__false_negative_weight = configuration.get('threshold')
         self.__false_positive_weight = 1 - self.__false_negative_weight
+        self.__execution_pool = create_execution_pool(configuration)
+
+        self.__racing_delta = configuration.get('racing_delta')
+        self.__racing_initial_fraction = configuration.get('racing_initial_fraction') or DEFAULT_RACING_INITIAL_FRACTION
+        self.__racing_random_seed = configuration.get('random_seed') or 0
+        self.__header_lines_number = int(configuration.get('header_lines_number') or 0)
 
     def filter(self):
-        # Computes the majority cost of the naive classifier (always answering as the majority class value).
-        result = []
+        # Converts the actual codes into true and false codes.
+        actual_codes = self._label_dictionary.binarize(self._actual_codes)
 
         # Counts occurrences.
-        class_values_counter = Counter(self._actual_values)
+        true_class_value_count = numpy.count_nonzero(actual_codes == metrics.TRUE_CODE)
+        false_class_value_count = numpy.count_nonzero(actual_codes == metrics.FALSE_CODE)
+
+        # Computes the majority cost of the naive classifier (always answering as the majority class value) once.
+        # On ties, the majority class value is the first one found, as Counter.most_common does.
+        majority_is_true = true_class_value_count > false_class_value_count or (
+            true_class_value_count == false_class_value_count and len(actual_codes) > 0 and actual_codes[0]
+        )
+        majority_cost = self.__compute_costs(
+            0 if majority_is_true else true_class_value_count,
+            false_class_value_count if majority_is_true else 0,
+            true_class_value_count,
+            false_class_value_count,
+        )
+
+        if self.__racing_delta is not None:
+            return self.__filter_racing(actual_codes, majority_cost)
+
+        # Executes the models as the model executors are available, stacking their encoded predictions.
+        predicted_codes = self.__execute_models(self._models_executors, self._training_data, len(actual_codes))
+
+        # Computes the costs of all the models at once, and filters the models.
+        confusion_matrices = metrics.compute_confusion_matrices(actual_codes, predicted_codes)
+        models_costs = self.__compute_costs(
+            confusion_matrices['false_negatives'],
+            confusion_matrices['false_positives'],
+            true_class_value_count,
+            false_class_value_count,
+        )
+
+        return (models_costs < majority_cost).tolist()
+
+    def __filter_racing(self, actual_codes, majority_cost):
+        """
+        Filters the models racing them on growing stratified blocks of rows, rejecting after each block the models
+        whose cost is worse than the majority cost with probability at least 1 - delta.
 
-        # Sets the true value and counts.
-        true_class_value = self._true_class_value
-        true_class_value_count = class_values_counter.get(true_class_value)
-        false_class_value = list(set(class_values_counter.keys()) - set([true_class_value]))[0]
-        false_class_value_count = class_values_counter.get(false_class_value)
+        The surviving models are evaluated on all the rows, so their costs are exact.
 
-        # Finds the majority class value.
-        majority_class_value = class_values_counter.most_common()[0][0]
+        :param actual_codes: the actual codes, 1 for true and 0 for false
+        :type actual_codes: numpy.ndarray
 
-        # Fills the naive classifier.
-        naive_predicted_values = numpy.repeat(majority_class_value, len(self._actual_values))
+        :param majority_cost: the cost of the naive classifier
+        :type majority_cost: float
 
-        # Computes the false positive and false negative rates.
-        naive_confusion_matrix = utils.compute_confusion_matrix(
-            self._actual_values,
-            naive_predicted_values,
-            [false_class_value, true_class_value],
+        :return: a list of boolean values indicating which predictor has been selected
+        :rtype: list[bool]
+        """
+        # Collects all the models before racing, since the union bound needs their number.
+        models_executors = list(self._models_executors)
+        alive_models = numpy.ones(len(models_executors), dtype=bool)
+
+        false_negatives = numpy.zeros(len(models_executors), dtype=numpy.int64)
+        false_positives = numpy.zeros(len(models_executors), dtype=numpy.int64)
+        true_class_value_count = 0
+        false_class_value_count = 0
+
+        blocks_rows_indices = self.__split_racing_blocks(actual_codes)
+
+        # Splits delta among the two rates of each model after each block, so that the probability of any wrong
+        # rejection is at most delta.
+        tests_delta = self.__racing_delta / (2 * max(1, len(models_executors)) * max(1, len(blocks_rows_indices)))
+        for block_index, rows_indices in enumerate(blocks_rows_indices):
+            alive_models_indices = numpy.flatnonzero(alive_models)
+            if len(alive_models_indices) == 0:
+                break
+
+            # Executes the alive models on the rows of the block.
+            with tempfile.NamedTemporaryFile(mode='w', prefix='ccube-racing-', suffix='.csv') as block_file:
+                utils.write_rows_subset(self._training_data, block_file, rows_indices, self.__header_lines_number)
+                block_file.flush()
+
+                predicted_codes = self.__execute_models(
+                    [models_executors[i] for i in alive_models_indices],
+                    block_file.name,
+                    len(rows_indices),
+                )
+
+            # Accumulates the confusion matrices.
+            block_actual_codes = actual_codes[rows_indices]
+            confusion_matrices = metrics.compute_confusion_matrices(block_actual_codes, predicted_codes)
+            false_negatives[alive_models_indices] += confusion_matrices['false_negatives']
+            false_positives[alive_models_indices] += confusion_matrices['false_positives']
+            true_class_value_count += numpy.count_nonzero(block_actual_codes == metrics.TRUE_CODE)
+            false_class_value_count += numpy.count_nonzero(block_actual_codes == metrics.FALSE_CODE)
+
+            if block_index == len(blocks_rows_indices) - 1:
+                break
+
+            # Rejects the models whose cost lower bound is not better than the majority cost.
+            false_negatives_margin = compute_hoeffding_margin(true_class_value_count, tests_delta)
+            false_positives_margin = compute_hoeffding_margin(false_class_value_count, tests_delta)
+            with numpy.errstate(divide='ignore', invalid='ignore'):
+                false_negatives_rates = false_negatives[alive_models_indices] / true_class_value_count
+                false_positives_rates = false_positives[alive_models_indices] / false_class_value_count
+            models_costs_lower_bounds = \
+                self.__false_negative_weight * numpy.clip(false_negatives_rates - false_negatives_margin, 0, None) \
+                + self.__false_positive_weight * numpy.clip(false_positives_rates - false_positives_margin, 0, None)
+
+            alive_models[alive_models_indices[numpy.nan_to_num(models_costs_lower_bounds) >= majority_cost]] = False
+
+        # Computes the exact costs of the surviving models.
+        models_costs = self.__compute_costs(
+            false_negatives,
+            false_positives,
+            true_class_value_count,
+            false_class_value_count,
         )
-        naive_false_negatives_rate = naive_confusion_matrix['false_negatives'] / true_class_value_count
-        naive_false_positives_rate = naive_confusion_matrix['false_positives'] / false_class_value_count
-
-        # Computes the majority cost.
-        majority_cost =\
-            self.__false_negative_weight * naive_false_negatives_rate\
-            + self.__false_positive_weight * naive_false_positives_rate
-
-        for model_executor in self._models_executors:
-            # Execute the model.
-            predicted_values = model_executor.execute(self._training_data)
-
-            # Computes the false positive and false negative rates.
-            model_confusion_matrix = utils.compute_confusion_matrix(
-                self._actual_values,
-                predicted_values,
-                [false_class_value, true_class_value],
-            )
-            model_false_negatives_rate = model_confusion_matrix['false_negatives'] / true_class_value_count
-            model_false_positives_rate = model_confusion_matrix['false_positives'] / false_class_value_count
-
-            # Computes the cost.
-            model_cost = \
-                self.__false_negative_weight * model_false_negatives_rate \
-                + self.__false_positive_weight * model_false_positives_rate
-
-            # Filters the model.
-            if model_cost < majority_cost:
-                result.append(True)
-            else:
-                result.append(False)
-
-        return result
+
+        return (alive_models & (models_costs < majority_cost)).tolist()
+
+    def __split_racing_blocks(self, actual_codes):
+        """
+        Splits the rows in disjoint blocks of doubling size, each one keeping the proportion of the true and false
+        class values, sampling the rows of each class value in a random order.
+
+        :param actual_codes: the actual codes, 1 for true and 0 for false
+        :type actual_codes: numpy.ndarray
+
+        :return: the sorted rows indices of each block
+        :rtype: list[numpy.ndarray]
+        """
+        random_state = numpy.random.RandomState(self.__racing_random_seed)
+
+        classes_rows_indices = [
+            random_state.permutation(numpy.flatnonzero(actual_codes == code))
+            for code in (metrics.TRUE_CODE, metrics.FALSE_CODE)
+        ]
+
+        # Computes the cumulative fractions of the rows, doubling from the initial fraction until all the rows.
+        fractions = []
+        fraction = self.__racing_initial_fraction
+        while fraction < 1:
+            fractions.append(fraction)
+            fraction *= 2
+        fractions.append(1)
+
+        blocks_rows_indices = []
+        starts = [0 for _ in classes_rows_indices]
+        for fraction in fractions:
+            block_rows_indices = []
+            for i, class_rows_indices in enumerate(classes_rows_indices):
+                stop = int(math.ceil(fraction * len(class_rows_indices)))
+                block_rows_indices.append(class_rows_indices[starts[i]:stop])
+                starts[i] = stop
+            block_rows_indices = numpy.sort(numpy.concatenate(block_rows_indices))
+            if len(block_rows_indices) > 0:
+                blocks_rows_indices.append(block_rows_indices)
+
+        return blocks_rows_indices
+
+    def __execute_models(self, models_executors, data_file_path, rows_number):
+        """
+        Executes the models, stacking their encoded predictions.
+
+        :param models_executors: the model executors
+        :type models_executors: collections.Iterable[worker.model_executor.ModelExecutor]
+
+        :param data_file_path: the data file to test the models
+        :type data_file_path: str
+
+        :param rows_number: the number of rows of the data file
+        :type rows_number: int
+
+        :return: the predicted codes, 1 for true, 0 for false and -1 for unknown values, one row per model
+        :rtype: numpy.ndarray
+        """
+        models_predicted_codes = []
+        models_predicted_values = self.__execution_pool.iterate_executions(models_executors, data_file_path)
+        for predicted_values in models_predicted_values:
+            predicted_codes = self._label_dictionary.binarize(self._label_dictionary.encode(predicted_values))
+            if len(predicted_codes) != rows_number:
+                raise ValueError(
+                    'Found {} predicted values for {} actual values'.format(len(predicted_codes), rows_number)
+                )
+            models_predicted_codes.append(predicted_codes)
+
+        if not models_predicted_codes:
+            return numpy.empty((0, rows_number), dtype=numpy.int8)
+        return numpy.stack(models_predicted_codes)
+
+    def __compute_costs(self, false_negatives, false_positives, true_class_value_count, false_class_value_count):
+        """
+        Computes the weighted costs of the false negatives and false positives rates.
+
+        :param false_negatives: the number of false negatives of each predictor
+        :type false_negatives: numpy.ndarray
+
+        :param false_positives: the number of false positives of each predictor
+        :type false_positives: numpy.ndarray
+
+        :param true_class_value_count: the number of true actual values
+        :type true_class_value_count: int
+
+        :param false_class_value_count: the number of false actual values
+        :type false_class_value_count: int
+
+        :return: the cost of each predictor
+        :rtype: numpy.ndarray
+        """
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            false_negatives_rates = numpy.divide(false_negatives, true_class_value_count)
+            false_positives_rates = numpy.divide(false_positives, false_class_value_count)
+
+        return \
+            self.__false_negative_weight * false_negatives_rates \
+            + self.__false_positive_weight * false_positives_rates
+
+
+def compute_hoeffding_margin(samples_number, delta):
+    """
+    Computes the margin within which a rate estimated on a sample is from the true rate with probability at least
+    1 - delta, by the Hoeffding inequality.
+
+    :param samples_number: the number of samples
+    :type samples_number: int
+
+    :param delta: the probability of exceeding the margin, 0 for an infinite margin
+    :type delta: float
+
+    :return: the margin
+    :rtype: float
+    """
+    if samples_number <= 0 or delta <= 0:
+        return math.inf
+    return math.sqrt(math.log(1 / delta) / (2 * samples_number))
@@ -1,6 +1,7 @@
 from abc import ABCMeta, abstractmethod
 
 from worker import utils
+from worker.label_dictionary import LabelDictionary
 
 
 class FuserPolicy(object):
@@ -57,6 +58,15 @@ class FuserPolicy(object):
         self._true_class_value = utils.convert_string(true_class_value, class_attribute_type)
         self._configuration = configuration
 
+        # Encodes the actual values once, as the codes of the label dictionary.
+        self._label_dictionary = LabelDictionary(true_class_value, class_attribute_type, test_actual_values)
+        if training_actual_values is not None:
+            self._label_dictionary = self._label_dictionary.extend(training_actual_values)
+        self._training_actual_codes = None
+        if training_actual_values is not None:
+            self._training_actual_codes = self._label_dictionary.encode(training_actual_values)
+        self._test_actual_codes = self._label_dictionary.encode(test_actual_values)
+
     @abstractmethod
     def fuse(
             self,
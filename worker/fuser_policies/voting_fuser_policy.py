@@ -1,17 +1,18 @@
-from collections import Counter
+import numpy
 
-from sklearn.ensemble import VotingClassifier
-from sklearn.base import BaseEstimator
-from sklearn.utils.validation import check_is_fitted
-from sklearn import metrics
-
-from worker import utils
+from worker import metrics
+from worker.execution_pool import create_execution_pool
+from worker.vote_aggregator import VoteAggregator
+from worker.label_dictionary import UNKNOWN_CODE
 from worker.fuser_policies.fuser_policy import FuserPolicy
 
 
 class VotingFuserPolicy(FuserPolicy):
     """
     Applies the voting ensemble.
+
+    If the 'weights' configuration value is set, the vote of each model counts as its weight, e.g. the number of
+    learners producing the same model.
     """
 
     def __init__(
@@ -36,63 +37,40 @@ class VotingFuserPolicy(FuserPolicy):
             configuration,
         )
 
-    class ConstantPredictionsClassifier(BaseEstimator):
-        def __init__(self, predictions):
-            self.predictions = predictions
-
-        def fit(self, X, y):
-            self._X = None
-            self._y = None
-
-            return self
-
-        def predict(self, X):
-            check_is_fitted(self, ['_X', '_y'])
-
-            return self.predictions
+        self.__execution_pool = create_execution_pool(configuration)
+        self.__weights = (configuration or {}).get('weights')
 
     def fuse(self):
-        # Sets the true value and counts.
-        class_values_counter = Counter(self._test_actual_values)
-        true_class_value = self._true_class_value
-        false_class_value = list(set(class_values_counter.keys()) - set([true_class_value]))[0]
+        label_dictionary = self._label_dictionary
 
-        # Predicts the test data.
-        predictors_values = []
-        for model_executor in self._models_executors:
-            # Execute the model.
-            predictors_values.append(model_executor.execute(self._test_data))
+        # Predicts the test data, encoding the predicted values as they are available.
+        predicted_codes = numpy.empty(
+            (len(self._models_executors), len(self._test_actual_codes)),
+            dtype=label_dictionary.dtype,
+        )
+        models_predicted_values = self.__execution_pool.iterate_executions(self._models_executors, self._test_data)
+        for i, predicted_values in enumerate(models_predicted_values):
+            codes = label_dictionary.encode(predicted_values)
 
-        # Builds the ensemble.
-        predictors = [
-            (str(i), VotingFuserPolicy.ConstantPredictionsClassifier(predictor_values))
-            for i, predictor_values in enumerate(predictors_values)
-        ]
-        ensemble = VotingClassifier(predictors, voting='hard')
+            # Extends the dictionary with the predicted values not among the labels, which can win the vote too.
+            if numpy.any(codes == UNKNOWN_CODE):
+                extended_label_dictionary = label_dictionary.extend(predicted_values)
 
-        # Dummy fit.
-        ensemble = ensemble.fit(self._test_actual_values, self._test_actual_values)
+                # Recodes only the rows already filled, the other ones being uninitialized.
+                extended_predicted_codes = numpy.empty(predicted_codes.shape, dtype=extended_label_dictionary.dtype)
+                extended_predicted_codes[:i] = extended_label_dictionary.recode(predicted_codes[:i], label_dictionary)
+                predicted_codes = extended_predicted_codes
+                label_dictionary = extended_label_dictionary
+                codes = label_dictionary.encode(predicted_values)
 
-        # Predicts on the actual values.
-        ensemble_predictions = ensemble.predict(self._test_actual_values)
+            predicted_codes[i] = codes
 
-        # Computes the metrics.
-        confusion_matrix = utils.compute_confusion_matrix(
-            self._test_actual_values,
-            ensemble_predictions,
-            [false_class_value, true_class_value],
-        )
+        # Votes, ties going to the lowest label as with the sorted labels of scikit-learn.
+        vote_aggregator = VoteAggregator(len(label_dictionary), weights=self.__weights)
+        ensemble_codes = vote_aggregator.aggregate(predicted_codes)
 
-        ensemble_metrics = {
-            'accuracy': metrics.accuracy_score(self._test_actual_values, ensemble_predictions),
-            'f-measure': metrics.f1_score(self._test_actual_values, ensemble_predictions),
-            'mcc': metrics.matthews_corrcoef(self._test_actual_values, ensemble_predictions),
-            'precision': metrics.precision_score(self._test_actual_values, ensemble_predictions),
-            'recall': metrics.recall_score(self._test_actual_values, ensemble_predictions),
-            'true_positives': confusion_matrix['true_positives'],
-            'false_positives': confusion_matrix['false_positives'],
-            'true_negatives': confusion_matrix['true_negatives'],
-            'false_negatives': confusion_matrix['false_negatives'],
-        }
+        # Computes the metrics, the predicted labels not among the actual ones being unknown.
+        actual_codes = self._label_dictionary.binarize(self._test_actual_codes)
+        ensemble_codes = self._label_dictionary.recode(ensemble_codes, label_dictionary)
 
-        return ensemble_metrics
+        return metrics.compute_binary_metrics(actual_codes, self._label_dictionary.binarize(ensemble_codes))
@@ -0,0 +1,181 @@
+import numpy
+
+from worker import utils
+
+
+UNKNOWN_CODE = -1
+
+
+class LabelDictionary(object):
+    """
+    Encodes the class values as small integer codes, the positions of the sorted labels.
+
+    The values not among the labels are encoded as -1, so that the policies work on compact integer arrays instead of
+    the class values.
+    """
+
+    def __init__(
+            self,
+            true_class_value,
+            class_attribute_type,
+            values=None,
+    ):
+        """
+        Initializes the dictionary.
+
+        :param true_class_value: the class value to consider as true, always among the labels
+        :type true_class_value: str
+
+        :param class_attribute_type: the type of the class attribute
+        :type class_attribute_type: str
+
+        :param values: the values providing the labels, e.g. the actual values
+        :type values: numpy.ndarray
+        """
+        self.__true_class_value = utils.convert_string(true_class_value, class_attribute_type)
+        self.__class_attribute_type = class_attribute_type
+
+        labels = [numpy.atleast_1d(numpy.asarray(self.__true_class_value))]
+        if values is not None:
+            labels.append(numpy.atleast_1d(numpy.asarray(values)).ravel())
+        self.__labels = numpy.unique(numpy.concatenate(labels))
+        self.__true_code = int(numpy.searchsorted(self.__labels, self.__true_class_value))
+
+    @property
+    def labels(self):
+        """
+        Returns the sorted labels.
+
+        :return: the labels
+        :rtype: numpy.ndarray
+        """
+        return self.__labels
+
+    @property
+    def true_class_value(self):
+        """
+        Returns the class value to consider as true.
+
+        :return: the true class value
+        :rtype: object
+        """
+        return self.__true_class_value
+
+    @property
+    def true_code(self):
+        """
+        Returns the code of the true class value.
+
+        :return: the code
+        :rtype: int
+        """
+        return self.__true_code
+
+    @property
+    def dtype(self):
+        """
+        Returns the smallest type holding the codes.
+
+        :return: the type between int8 and int32
+        :rtype: type
+        """
+        if len(self.__labels) <= numpy.iinfo(numpy.int8).max:
+            return numpy.int8
+        return numpy.int32
+
+    def __len__(self):
+        return len(self.__labels)
+
+    def encode(
+            self,
+            values,
+    ):
+        """
+        Encodes the values.
+
+        :param values: the values
+        :type values: numpy.ndarray
+
+        :return: the codes, -1 for the values not among the labels
+        :rtype: numpy.ndarray
+        """
+        values = numpy.atleast_1d(numpy.asarray(values))
+
+        codes = numpy.minimum(numpy.searchsorted(self.__labels, values), len(self.__labels) - 1).astype(self.dtype)
+        codes[self.__labels[codes] != values] = UNKNOWN_CODE
+        return codes
+
+    def decode(
+            self,
+            codes,
+    ):
+        """
+        Decodes the codes, which must not be unknown.
+
+        :param codes: the codes
+        :type codes: numpy.ndarray
+
+        :return: the values
+        :rtype: numpy.ndarray
+        """
+        return self.__labels[codes]
+
+    def extend(
+            self,
+            values,
+    ):
+        """
+        Creates a dictionary including also the labels of the values.
+
+        :param values: the values providing the new labels
+        :type values: numpy.ndarray
+
+        :return: the extended dictionary
+        :rtype: LabelDictionary
+        """
+        label_dictionary = LabelDictionary.__new__(LabelDictionary)
+        label_dictionary.__true_class_value = self.__true_class_value
+        label_dictionary.__class_attribute_type = self.__class_attribute_type
+        label_dictionary.__labels = numpy.union1d(self.__labels, numpy.atleast_1d(numpy.asarray(values)).ravel())
+        label_dictionary.__true_code = int(numpy.searchsorted(label_dictionary.__labels, self.__true_class_value))
+        return label_dictionary
+
+    def recode(
+            self,
+            codes,
+            label_dictionary,
+    ):
+        """
+        Converts the codes of another dictionary into the codes of this one, -1 for the labels not in this one.
+
+        :param codes: the codes of the other dictionary
+        :type codes: numpy.ndarray
+
+        :param label_dictionary: the other dictionary
+        :type label_dictionary: LabelDictionary
+
+        :return: the codes
+        :rtype: numpy.ndarray
+        """
+        # Maps also the unknown code, indexing the last element.
+        codes_mapping = numpy.append(self.encode(label_dictionary.labels), UNKNOWN_CODE).astype(self.dtype)
+        return codes_mapping[codes]
+
+    def binarize(
+            self,
+            codes,
+    ):
+        """
+        Converts the codes into binary codes.
+
+        :param codes: the codes
+        :type codes: numpy.ndarray
+
+        :return: 1 for the true class value, 0 for the other labels and -1 for the unknown values
+        :rtype: numpy.ndarray
+        """
+        codes = numpy.asarray(codes)
+
+        binary_codes = (codes == self.__true_code).astype(numpy.int8)
+        binary_codes[codes == UNKNOWN_CODE] = UNKNOWN_CODE
+        return binary_codes
@@ -0,0 +1,262 @@
+import lzma
+import zlib
+import json
+import base64
+import struct
+
+
+JSON_CODEC = 'json'
+BINARY_CODEC = 'binary'
+
+CODECS = [
+    JSON_CODEC,
+    BINARY_CODEC,
+]
+
+JSON_CONTENT_TYPE = 'application/json'
+BINARY_CONTENT_TYPE = 'application/x-ccube-binary'
+
+ZLIB_COMPRESSION = 'zlib'
+LZMA_COMPRESSION = 'lzma'
+
+COMPRESSIONS = {
+    ZLIB_COMPRESSION: (zlib.compress, zlib.decompress),
+    LZMA_COMPRESSION: (lzma.compress, lzma.decompress),
+}
+
+BINARY_PLACEHOLDER_KEY = '$binary'
+
+LZMA_MAGIC_NUMBER = b'\xfd7zXZ\x00'
+JSON_FIRST_CHARACTERS = b'{["-0123456789tfn \t\r\n'
+
+HEADER_LENGTH_FORMAT = '>I'
+SEGMENT_LENGTH_FORMAT = '>Q'
+
+
+class MessageCodec(object):
+    """
+    Encodes and decodes the bodies of the AMQP messages, declaring the codec in the message properties.
+
+    The JSON codec produces the original messages, encoding the bytes as base64 strings.
+    The binary codec carries the bytes as raw segments after a JSON header, in which each bytes value is replaced by
+    a {"$binary": index} placeholder. Both can be compressed, and decoding is driven by the properties of each
+    message, or detected from the body if the properties are missing, so that workers using different codecs can
+    share the same queues.
+
+    The workers decoding only JSON cannot consume the binary or compressed messages, so all the consumers must be
+    upgraded before any producer enables them.
+    """
+
+    def __init__(
+            self,
+            codec=JSON_CODEC,
+            compression=None,
+    ):
+        """
+        Initializes the codec.
+
+        :param codec: the codec used to encode the messages, between 'json' and 'binary'
+        :type codec: str
+
+        :param compression: the compression of the encoded messages, between 'zlib' and 'lzma', None to not compress
+        :type compression: str
+        """
+        if codec is None:
+            codec = JSON_CODEC
+        if codec not in CODECS:
+            raise ValueError('Unknown codec: {}'.format(codec))
+        if compression is not None and compression not in COMPRESSIONS:
+            raise ValueError('Unknown compression: {}'.format(compression))
+
+        self.__codec = codec
+        self.__compression = compression
+
+    @property
+    def codec(self):
+        """
+        Returns the codec used to encode the messages.
+
+        :return: the codec
+        :rtype: str
+        """
+        return self.__codec
+
+    @property
+    def compression(self):
+        """
+        Returns the compression of the encoded messages.
+
+        :return: the compression, None if not compressed
+        :rtype: str
+        """
+        return self.__compression
+
+    def encode(
+            self,
+            message,
+    ):
+        """
+        Encodes a message.
+
+        :param message: the message, whose values can be bytes
+        :type message: object
+
+        :return: the body, the content type and the content encoding of the message
+        :rtype: (bytes, str, str)
+        """
+        if self.__codec == BINARY_CODEC:
+            body = encode_binary(message)
+            content_type = BINARY_CONTENT_TYPE
+        else:
+            body = json.dumps(message, default=encode_bytes_as_base64).encode('utf-8')
+            content_type = JSON_CONTENT_TYPE
+
+        if self.__compression is not None:
+            compress, _ = COMPRESSIONS[self.__compression]
+            body = compress(body)
+
+        return body, content_type, self.__compression
+
+    @staticmethod
+    def decode(
+            body,
+            content_type=None,
+            content_encoding=None,
+    ):
+        """
+        Decodes a message, using the codec declared by its properties, or detected from the body if not declared.
+
+        :param body: the body
+        :type body: bytes
+
+        :param content_type: the content type, detected from the body if not provided
+        :type content_type: str
+
+        :param content_encoding: the content encoding, detected from the body if neither it nor the content type are
+            provided
+        :type content_encoding: str
+
+        :return: the message
+        :rtype: object
+        """
+        if not content_type and not content_encoding:
+            content_encoding = detect_compression(body)
+        if content_encoding:
+            if content_encoding not in COMPRESSIONS:
+                raise ValueError('Unknown content encoding: {}'.format(content_encoding))
+            _, decompress = COMPRESSIONS[content_encoding]
+            body = decompress(body)
+
+        if content_type == BINARY_CONTENT_TYPE:
+            return decode_binary(body)
+        if not content_type and body[:1] not in JSON_FIRST_CHARACTERS:
+            return decode_binary(body)
+        if content_type in (None, '', JSON_CONTENT_TYPE):
+            return json.loads(body.decode('utf-8'))
+
+        raise ValueError('Unknown content type: {}'.format(content_type))
+
+
+def detect_compression(body):
+    """
+    Detects the compression of a body from its first bytes, the zlib header or the LZMA magic number, which never
+    start a JSON text or a binary body.
+
+    :param body: the body
+    :type body: bytes
+
+    :return: the compression, None if not compressed
+    :rtype: str
+    """
+    if body.startswith(LZMA_MAGIC_NUMBER):
+        return LZMA_COMPRESSION
+    if body[:1] in JSON_FIRST_CHARACTERS:
+        return None
+    if len(body) >= 2 and body[0] & 0x0f == 8 and (body[0] << 8 | body[1]) % 31 == 0:
+        return ZLIB_COMPRESSION
+    return None
+
+
+def encode_bytes_as_base64(value):
+    """
+    Encodes the bytes values as base64 strings, for the JSON codec.
+
+    :param value: the value not serializable as JSON
+    :type value: object
+
+    :return: the base64 string
+    :rtype: str
+    """
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return base64.b64encode(value).decode('utf-8')
+    raise TypeError('Object of type {} is not JSON serializable'.format(type(value).__name__))
+
+
+def encode_binary(message):
+    """
+    Encodes a message with the binary codec.
+
+    The body is the length of the header, the JSON header, and the length and the content of each segment.
+
+    :param message: the message
+    :type message: object
+
+    :return: the body
+    :rtype: bytes
+    """
+    segments = []
+
+    def replace_bytes(value):
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            segments.append(value)
+            return {BINARY_PLACEHOLDER_KEY: len(segments) - 1}
+        if isinstance(value, dict):
+            return {key: replace_bytes(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [replace_bytes(item) for item in value]
+        return value
+
+    header = json.dumps(replace_bytes(message)).encode('utf-8')
+
+    parts = [struct.pack(HEADER_LENGTH_FORMAT, len(header)), header]
+    for segment in segments:
+        parts.append(struct.pack(SEGMENT_LENGTH_FORMAT, len(segment)))
+        parts.append(segment)
+    return b''.join(parts)
+
+
+def decode_binary(body):
+    """
+    Decodes a message encoded with the binary codec.
+
+    :param body: the body
+    :type body: bytes
+
+    :return: the message, with the segments as bytes values
+    :rtype: object
+    """
+    body = memoryview(body)
+
+    offset = struct.calcsize(HEADER_LENGTH_FORMAT)
+    header_length, = struct.unpack_from(HEADER_LENGTH_FORMAT, body)
+    header = json.loads(body[offset:offset + header_length].tobytes().decode('utf-8'))
+    offset += header_length
+
+    segments = []
+    segment_length_size = struct.calcsize(SEGMENT_LENGTH_FORMAT)
+    while offset < len(body):
+        segment_length, = struct.unpack_from(SEGMENT_LENGTH_FORMAT, body, offset)
+        offset += segment_length_size
+        segments.append(body[offset:offset + segment_length].tobytes())
+        offset += segment_length
+
+    def restore_bytes(value):
+        if isinstance(value, dict):
+            if len(value) == 1 and BINARY_PLACEHOLDER_KEY in value:
+                return segments[value[BINARY_PLACEHOLDER_KEY]]
+            return {key: restore_bytes(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [restore_bytes(item) for item in value]
+        return value
+
+    return restore_bytes(header)
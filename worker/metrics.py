@@ -0,0 +1,130 @@
+import numpy
+
+
+TRUE_CODE = 1
+FALSE_CODE = 0
+UNKNOWN_CODE = -1
+
+
+def encode_binary_values(values, true_class_value, false_class_values):
+    """
+    Encodes the values of a binary class.
+
+    :param values: the values
+    :type values: numpy.ndarray
+
+    :param true_class_value: the class value to consider as true
+    :type true_class_value: object
+
+    :param false_class_values: the class values to consider as false
+    :type false_class_values: numpy.ndarray
+
+    :return: the codes, 1 for the true class value, 0 for the false ones and -1 for any other value
+    :rtype: numpy.ndarray
+    """
+    values = numpy.atleast_1d(numpy.asarray(values))
+
+    codes = numpy.full(values.shape, UNKNOWN_CODE, dtype=numpy.int8)
+    codes[numpy.isin(values, false_class_values)] = FALSE_CODE
+    codes[values == true_class_value] = TRUE_CODE
+    return codes
+
+
+def compute_confusion_matrices(actual_codes, predicted_codes):
+    """
+    Computes the binary confusion matrices of one or several predictors in a single pass.
+
+    The predictions of unknown values are not counted, as the confusion matrix of scikit-learn does for the values
+    not among its labels.
+
+    :param actual_codes: the actual codes, 1 for true and 0 for false
+    :type actual_codes: numpy.ndarray
+
+    :param predicted_codes: the predicted codes, one row per predictor
+    :type predicted_codes: numpy.ndarray
+
+    :return: the 'true_negatives', 'false_positives', 'false_negatives' and 'true_positives' of each predictor
+    :rtype: dict[str, numpy.ndarray]
+    """
+    predicted_codes = numpy.asarray(predicted_codes)
+    if predicted_codes.ndim == 1:
+        predicted_codes = predicted_codes.reshape(1, -1)
+    predictors_number, rows_number = predicted_codes.shape
+
+    actual_codes = numpy.asarray(actual_codes, dtype=numpy.int64)
+    if len(actual_codes) != rows_number:
+        raise ValueError('Found {} predicted values for {} actual values'.format(rows_number, len(actual_codes)))
+
+    # Indexes the cell of each prediction, 4 cells per predictor.
+    cells = 2 * actual_codes + predicted_codes
+    cells += 4 * numpy.arange(predictors_number, dtype=numpy.int64).reshape(-1, 1)
+    known_mask = (predicted_codes >= 0)
+
+    counts = numpy.bincount(cells[known_mask], minlength=4 * predictors_number).reshape(predictors_number, 4)
+
+    return {
+        'true_negatives': counts[:, 0],
+        'false_positives': counts[:, 1],
+        'false_negatives': counts[:, 2],
+        'true_positives': counts[:, 3],
+    }
+
+
+def compute_binary_metrics(actual_codes, predicted_codes):
+    """
+    Computes the metrics of a binary predictor from its confusion matrix.
+
+    The metrics with a null denominator are 0, as scikit-learn does.
+
+    :param actual_codes: the actual codes, 1 for true and 0 for false
+    :type actual_codes: numpy.ndarray
+
+    :param predicted_codes: the predicted codes, 1 for true, 0 for false and -1 for unknown values
+    :type predicted_codes: numpy.ndarray
+
+    :return: the accuracy, f-measure, mcc, precision, recall and confusion matrix
+    :rtype: dict
+    """
+    confusion_matrix = compute_confusion_matrices(actual_codes, predicted_codes)
+    true_positives = int(confusion_matrix['true_positives'][0])
+    false_positives = int(confusion_matrix['false_positives'][0])
+    true_negatives = int(confusion_matrix['true_negatives'][0])
+    false_negatives = int(confusion_matrix['false_negatives'][0])
+
+    rows_number = len(actual_codes)
+    mcc_denominator = \
+        (true_positives + false_positives) * (true_positives + false_negatives) \
+        * (true_negatives + false_positives) * (true_negatives + false_negatives)
+
+    return {
+        'accuracy': divide(true_positives + true_negatives, rows_number),
+        'f-measure': divide(2 * true_positives, 2 * true_positives + false_positives + false_negatives),
+        'mcc': divide(
+            true_positives * true_negatives - false_positives * false_negatives,
+            mcc_denominator ** 0.5,
+        ),
+        'precision': divide(true_positives, true_positives + false_positives),
+        'recall': divide(true_positives, true_positives + false_negatives),
+        'true_positives': true_positives,
+        'false_positives': false_positives,
+        'true_negatives': true_negatives,
+        'false_negatives': false_negatives,
+    }
+
+
+def divide(numerator, denominator):
+    """
+    Divides two numbers, returning 0 if the denominator is 0.
+
+    :param numerator: the numerator
+    :type numerator: float
+
+    :param denominator: the denominator
+    :type denominator: float
+
+    :return: the quotient
+    :rtype: float
+    """
+    if denominator == 0:
+        return 0.0
+    return float(numerator) / float(denominator)
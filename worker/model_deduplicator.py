@@ -0,0 +1,74 @@
+from worker.artifact_stores.artifact_store import InlineArtifact
+
+
+class ModelDeduplicator(object):
+    """
+    Detects the models with the same files, e.g. the byte-identical outputs of independent learners converging to the
+    same model, so that each distinct model is executed once.
+
+    The models are compared by the key of their artifacts, so the artifacts in the store are not loaded.
+    """
+
+    def __init__(self):
+        """
+        Initializes the deduplicator, with no models.
+        """
+        self.__models_indices = {}
+        self.__models_counts = []
+
+    def __len__(self):
+        return len(self.__models_counts)
+
+    @property
+    def models_counts(self):
+        """
+        Returns the number of added models equal to each distinct model, including itself.
+
+        :return: the counts, in order of first addition
+        :rtype: list[int]
+        """
+        return list(self.__models_counts)
+
+    def add(
+            self,
+            model_artifact,
+    ):
+        """
+        Adds a model, finding the distinct model it is equal to.
+
+        :param model_artifact: the artifact containing the model files
+        :type model_artifact: worker.artifact_stores.artifact_store.Artifact
+
+        :return: the index of the distinct model, in order of first addition, and True if the model is new
+        :rtype: (int, bool)
+        """
+        model_key = compute_artifact_key(model_artifact)
+
+        model_index = self.__models_indices.get(model_key)
+        if model_index is not None:
+            self.__models_counts[model_index] += 1
+            return model_index, False
+
+        model_index = len(self.__models_counts)
+        self.__models_indices[model_key] = model_index
+        self.__models_counts.append(1)
+        return model_index, True
+
+
+def compute_artifact_key(model_artifact):
+    """
+    Computes the key identifying the model files of an artifact.
+
+    The artifacts in the store are keyed by their reference hash, already addressing their content, so they are not
+    loaded. The inline artifacts, already loaded, are keyed by the content hash of their files, ignoring the zip
+    metadata such as the timestamps.
+
+    :param model_artifact: the artifact containing the model files
+    :type model_artifact: worker.artifact_stores.artifact_store.Artifact
+
+    :return: the key
+    :rtype: str
+    """
+    if isinstance(model_artifact, InlineArtifact):
+        return 'content:' + model_artifact.content_hash
+    return 'artifact:' + model_artifact.hash
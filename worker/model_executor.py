@@ -1,9 +1,23 @@
+import os
+import sys
+import contextlib
 import tempfile
+import concurrent.futures
 
-from worker.process_manager import ProcessManager
+import numpy
+
+from worker.execution_context import ExecutionContext
+from worker.artifact_stores.artifact_store import InlineArtifact
+from worker.predict_server import PredictServerError
+from worker.prediction_cache import compute_model_key
 from worker import utils
+from worker import values_reader
 
 
+PREDICT_WORKING_DIRECTORY_VARIABLE_NAME = 'CCUBE_PREDICT_WORKING_DIRECTORY'
+PREDICT_PREDICTIONS_FILE_VARIABLE_NAME = 'CCUBE_PREDICT_PREDICTIONS_FILE'
+PREDICT_PREDICTIONS_FORMAT_VARIABLE_NAME = 'CCUBE_PREDICT_PREDICTIONS_FORMAT'
+PREDICT_PREDICTIONS_DTYPE_VARIABLE_NAME = 'CCUBE_PREDICT_PREDICTIONS_DTYPE'
 PREDICT_DATASET_FILE_VARIABLE_NAME = 'CCUBE_PREDICT_DATASET_FILE'
 PREDICT_INPUT_FILES_VARIABLE_NAME = 'CCUBE_PREDICT_INPUT_FILES'
 PREDICT_PARAMETERS_PROPERTIES_FILE_VARIABLE_NAME = 'CCUBE_PREDICT_PARAMETERS_PROPERTIES_FILE'
@@ -12,6 +26,8 @@ PREDICT_PARAMETERS_PROPERTIES_FILE_VARIABLE_NAME = 'CCUBE_PREDICT_PARAMETERS_PRO
 class ModelExecutor(object):
     """
     It executes a model.
+
+    Every execution runs in its own execution context, so the same executor, or several ones, can execute concurrently.
     """
 
     def __init__(
@@ -22,11 +38,19 @@ class ModelExecutor(object):
             execution_command,
             working_directory,
             environment_variables,
+            scratch_directory=None,
+            extraction_cache=None,
+            model_artifact=None,
+            values_type=None,
+            predictions_format=None,
+            predictions_dtype=None,
+            shards_number=None,
+            header_lines_number=0,
+            predict_server=None,
     ):
-        # Prepares the process manager.
         """
 
-        :param model_files_stream: the the base64 zip string
+        :param model_files_stream: the the base64 zip string, ignored if model_artifact is provided
         :type model_files_stream: str
 
         :param model_parameters: the parameters to execute the model
@@ -44,16 +68,124 @@ class ModelExecutor(object):
 
         :param environment_variables: the environment variables to set
         :type environment_variables: dict
+
+        :param scratch_directory: the directory in which creating the private execution directories
+        :type scratch_directory: str
+
+        :param extraction_cache: the cache of the extracted model files, shared among the executors
+        :type extraction_cache: worker.extraction_cache.ExtractionCache
+
+        :param model_artifact: the artifact containing the model files, lazily loaded
+        :type model_artifact: worker.artifact_stores.artifact_store.Artifact
+
+        :param values_type: the type of the predicted values, guessed if not provided
+        :type values_type: str
+
+        :param predictions_format: the format of the predictions file between 'text', 'npy' and 'raw', detected from
+            the file extension if not provided
+        :type predictions_format: str
+
+        :param predictions_dtype: the type of the binary predicted values, e.g. 'int8', required by the raw format
+        :type predictions_dtype: str
+
+        :param shards_number: the number of row shards of the data executed concurrently, not sharded if not provided
+        :type shards_number: int
+
+        :param header_lines_number: the number of header lines of the data, repeated in each shard
+        :type header_lines_number: int
+
+        :param predict_server: the long-lived predict process serving the predictions, shared among the executors,
+            falling back to the execution command if it fails, and not used by the copies sent to other processes
+        :type predict_server: worker.predict_server.PredictServer
         """
-        self.__process_manager = ProcessManager(
-            command=execution_command,
-            working_directory=working_directory,
-            environment_variables=environment_variables,
-        )
+        if predictions_format is None:
+            predictions_format = values_reader.detect_values_format(predictions_file_path)
+        if predictions_format not in values_reader.VALUES_FORMATS:
+            raise ValueError('Unknown predictions format: {}'.format(predictions_format))
+
+        self.__execution_command = execution_command
+        self.__working_directory = working_directory
+        self.__environment_variables = dict(environment_variables)
+        self.__scratch_directory = scratch_directory
+        self.__extraction_cache = extraction_cache
 
-        self.__model_files_stream = model_files_stream
+        if model_artifact is None:
+            model_artifact = InlineArtifact(model_files_stream)
+        self.__model_artifact = model_artifact
         self.__model_parameters = model_parameters
         self.__predictions_file_path = predictions_file_path
+        self.__values_type = values_type
+        self.__predictions_format = predictions_format
+        self.__predictions_dtype = predictions_dtype
+        self.__shards_number = int(shards_number or 1)
+        self.__header_lines_number = int(header_lines_number or 0)
+        self.__predict_server = predict_server
+
+    def __getstate__(self):
+        # Leaves out the predict server, whose processes belong to the process that started them, so that the copies
+        # sent to a process pool run the execution command.
+        state = self.__dict__.copy()
+        state['_ModelExecutor__predict_server'] = None
+        return state
+
+    @property
+    def model_artifact(self):
+        """
+        Returns the artifact containing the model files.
+
+        :return: the artifact
+        :rtype: worker.artifact_stores.artifact_store.Artifact
+        """
+        return self.__model_artifact
+
+    @property
+    def model_parameters(self):
+        """
+        Returns the parameters to execute the model.
+
+        :return: the parameters
+        :rtype: dict
+        """
+        return self.__model_parameters
+
+    @property
+    def predictions_file_path(self):
+        """
+        Returns the file containing the predictions.
+
+        :return: the file path
+        :rtype: str
+        """
+        return self.__predictions_file_path
+
+    @property
+    def predictions_format(self):
+        """
+        Returns the format of the predictions file.
+
+        :return: the format between 'text', 'npy' and 'raw'
+        :rtype: str
+        """
+        return self.__predictions_format
+
+    @property
+    def prediction_key(self):
+        """
+        Returns the key of the model and of how it is executed, identifying its predicted values on the same data.
+
+        :return: the key
+        :rtype: str
+        """
+        return compute_model_key(
+            self.__model_artifact,
+            [
+                self.__execution_command,
+                self.__model_parameters,
+                self.__values_type,
+                self.__predictions_format,
+                self.__predictions_dtype,
+            ],
+        )
 
     def execute(
             self,
@@ -68,42 +200,176 @@ class ModelExecutor(object):
         :return: the predicted values
         :rtype: list
         """
-        # Extracts the output in a temporary directory.
-        model_files_directory = tempfile.TemporaryDirectory()
-        utils.extract_zip_base64_string(self.__model_files_stream, model_files_directory.name)
+        if self.__shards_number <= 1:
+            return self.__execute_file(data_file_path)
 
-        # Adds the environment variables.
-        self.__process_manager.add_environment_variables(
-            {
-                PREDICT_DATASET_FILE_VARIABLE_NAME: data_file_path,
-                PREDICT_INPUT_FILES_VARIABLE_NAME: model_files_directory.name,
-            }
-        )
+        # Splits the data in shards of contiguous rows, executing the model on each one concurrently.
+        shards_directory = tempfile.TemporaryDirectory(prefix='ccube-shards-', dir=self.__scratch_directory)
+        with shards_directory:
+            shards_paths = utils.split_rows_file(
+                data_file_path,
+                self.__shards_number,
+                shards_directory.name,
+                self.__header_lines_number,
+            )
+            if len(shards_paths) <= 1:
+                return self.__execute_file(data_file_path)
+
+            with concurrent.futures.ThreadPoolExecutor(max_workers=len(shards_paths)) as pool_executor:
+                shards_predicted_values = list(pool_executor.map(self.__execute_file, shards_paths))
+
+            # Concatenates the predicted values in order of the shards.
+            return numpy.concatenate([numpy.asarray(predicted_values) for predicted_values in shards_predicted_values])
+
+    def __execute_file(self, data_file_path):
+        """
+        Executes the command on a data file and returns the predicted values.
+
+        :param data_file_path: the data file to test the model
+        :type data_file_path: str
 
-        # Prepares the properties.
-        string_properties = utils.convert_values_to_string(self.__model_parameters)
-        self.__process_manager.add_environment_variables(string_properties)
-        properties_file = utils.create_temporary_properties_file(string_properties)
-        self.__process_manager.add_environment_variables(
-            {
-                PREDICT_PARAMETERS_PROPERTIES_FILE_VARIABLE_NAME: properties_file.name
-            }
+        :return: the predicted values
+        :rtype: list
+        """
+        execution_context = ExecutionContext(
+            working_directory=self.__working_directory,
+            environment_variables=self.__environment_variables,
+            private_paths=[self.__predictions_file_path],
+            scratch_directory=self.__scratch_directory,
         )
+        with execution_context, self.extract_model_files(execution_context.directory) as model_files_directory:
+            process_manager = execution_context.create_process_manager(self.__execution_command)
+            predictions_file_path = execution_context.relocate_path(self.__predictions_file_path)
+
+            # Adds the environment variables.
+            process_manager.add_environment_variables(
+                {
+                    PREDICT_WORKING_DIRECTORY_VARIABLE_NAME: execution_context.working_directory,
+                    PREDICT_PREDICTIONS_FILE_VARIABLE_NAME: predictions_file_path,
+                    PREDICT_PREDICTIONS_FORMAT_VARIABLE_NAME: self.__predictions_format,
+                    PREDICT_DATASET_FILE_VARIABLE_NAME: data_file_path,
+                    PREDICT_INPUT_FILES_VARIABLE_NAME: model_files_directory,
+                }
+            )
 
-        # Echoes the command.
-        stdout, return_code = self.__process_manager.echo()
+            # Prepares the properties.
+            string_properties = utils.convert_values_to_string(self.__model_parameters)
+            process_manager.add_environment_variables(string_properties)
+            properties_file = utils.create_temporary_properties_file(string_properties)
+            process_manager.add_environment_variables(
+                {
+                    PREDICT_PARAMETERS_PROPERTIES_FILE_VARIABLE_NAME: properties_file.name
+                }
+            )
 
-        # Runs the process.
-        stdout, return_code = self.__process_manager.run()
+            # Requests the predictions to the predict server, running the process if not available.
+            if not self.__request_predictions(
+                    model_files_directory,
+                    data_file_path,
+                    predictions_file_path,
+                    properties_file.name,
+            ):
+                # Echoes the command.
+                stdout, return_code = process_manager.echo()
 
-        # Reads the predicted values.
-        predicted_values = utils.read_values_from_file(self.__predictions_file_path)
+                # Runs the process.
+                stdout, return_code = process_manager.run()
 
-        # Closes the temporary files.
-        properties_file.close()
+            # Reads the predicted values.
+            predicted_values = self.read_predictions(predictions_file_path)
 
-        # Cleanup the directory.
-        model_files_directory.cleanup()
+            # Closes the temporary files.
+            properties_file.close()
 
         # Returns the predicted values.
         return predicted_values
+
+    def __request_predictions(
+            self,
+            model_files_directory,
+            data_file_path,
+            predictions_file_path,
+            parameters_properties_file_path,
+    ):
+        """
+        Requests the predictions to the predict server, if any.
+
+        :param model_files_directory: the directory containing the model files
+        :type model_files_directory: str
+
+        :param data_file_path: the data file to test the model
+        :type data_file_path: str
+
+        :param predictions_file_path: the file in which writing the predictions
+        :type predictions_file_path: str
+
+        :param parameters_properties_file_path: the .properties file containing the model parameters
+        :type parameters_properties_file_path: str
+
+        :return: True if the predictions have been written by the predict server, False otherwise
+        :rtype: bool
+        """
+        if self.__predict_server is None:
+            return False
+
+        try:
+            self.__predict_server.predict(
+                model_files_directory,
+                data_file_path,
+                predictions_file_path,
+                parameters_properties_file_path,
+            )
+        except PredictServerError as error:
+            print('Predict server failed, running the predict command: {}'.format(error))
+            sys.stdout.flush()
+            return False
+
+        return True
+
+    def read_predictions(
+            self,
+            predictions_file_path,
+    ):
+        """
+        Reads the predicted values of a predictions file.
+
+        The binary files are memory-mapped and copied into memory, so the predicted values stay valid after the
+        predictions file is removed with its execution context.
+
+        :param predictions_file_path: the predictions file
+        :type predictions_file_path: str
+
+        :return: the predicted values, not referring to the predictions file
+        :rtype: numpy.ndarray
+        """
+        if self.__predictions_format == values_reader.TEXT_VALUES_FORMAT:
+            return utils.read_values_from_file(predictions_file_path, self.__values_type)
+
+        predicted_values = values_reader.load_binary_values(
+            predictions_file_path,
+            self.__predictions_format,
+            self.__predictions_dtype,
+        )
+        return numpy.array(predicted_values)
+
+    @contextlib.contextmanager
+    def extract_model_files(
+            self,
+            directory,
+    ):
+        """
+        Extracts the model files, using the cache if available.
+
+        :param directory: the directory in which extracting the model files if not cached, into its 'model' directory
+        :type directory: str
+
+        :return: a context manager providing the directory containing the model files
+        :rtype: contextlib.AbstractContextManager[str]
+        """
+        if self.__extraction_cache is not None:
+            with self.__extraction_cache.extract(self.__model_artifact) as model_files_directory:
+                yield model_files_directory
+        else:
+            model_files_directory = os.path.join(directory, 'model')
+            utils.extract_zip_bytes(self.__model_artifact.load(), model_files_directory)
+            yield model_files_directory
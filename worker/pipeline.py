@@ -0,0 +1,101 @@
+import queue
+import threading
+
+
+class Pipeline(object):
+    """
+    Overlaps the production of items in the current thread with their consumption in a background thread.
+
+    The items are passed through a queue, and the consumer receives them as an iterable, blocking until the next item
+    is available, so that it can start working before all the items have been produced.
+    If the consumer fails, the production stops at the next item, or as soon as the producer checks the stopped event,
+    e.g. while waiting for the next item.
+    """
+
+    __END = object()
+
+    def __init__(
+            self,
+            consume,
+    ):
+        """
+        Initializes the pipeline.
+
+        :param consume: the function consuming the iterable of the items, whose result is returned by the pipeline
+        :type consume: callable
+        """
+        self.__consume = consume
+
+        self.__queue = queue.Queue()
+        self.__stopped = threading.Event()
+        self.__result = None
+        self.__error = None
+
+    @property
+    def stopped(self):
+        """
+        Returns the event set when the consumer fails, which the producer can check while waiting for the next item.
+
+        :return: the event
+        :rtype: threading.Event
+        """
+        return self.__stopped
+
+    def run(
+            self,
+            items,
+    ):
+        """
+        Produces the items in the current thread, while consuming them in a background thread.
+
+        :param items: the items, produced lazily
+        :type items: collections.Iterable
+
+        :return: the result of the consumer
+        :rtype: object
+        """
+        consumer_thread = threading.Thread(target=self.__run_consumer, daemon=True)
+        consumer_thread.start()
+
+        try:
+            for item in items:
+                # Stops producing if the consumer has failed.
+                if self.__stopped.is_set():
+                    break
+                self.__queue.put(item)
+        finally:
+            self.__queue.put(Pipeline.__END)
+            consumer_thread.join()
+
+        if self.__error is not None:
+            raise self.__error
+        return self.__result
+
+    def __run_consumer(self):
+        """
+        Runs the consumer, storing its result or its error.
+        """
+        try:
+            self.__result = self.__consume(self.__iterate_items())
+
+            # Drains the items not consumed.
+            for _ in self.__iterate_items():
+                pass
+        except BaseException as error:
+            self.__error = error
+            self.__stopped.set()
+
+    def __iterate_items(self):
+        """
+        Iterates the items of the queue, until the end of the production.
+
+        :return: the items
+        :rtype: collections.Iterator
+        """
+        while True:
+            item = self.__queue.get()
+            if item is Pipeline.__END:
+                # Keeps the end for any following iteration.
+                self.__queue.put(item)
+                return
+            yield item
@@ -0,0 +1,296 @@
+import os
+import queue
+import time
+import subprocess
+import threading
+import sys
+
+
+OK_RESPONSE = 'OK'
+ERROR_RESPONSE = 'ERROR'
+
+DEFAULT_RESTARTS_NUMBER = 3
+DEFAULT_CLOSE_TIMEOUT = 10
+DEFAULT_RESPONSE_TIMEOUT = 3600
+
+
+class PredictServerError(Exception):
+    """
+    Raised when the predict server fails a request, or cannot be restarted.
+    """
+
+
+class PredictServer(object):
+    """
+    Manages a small pool of long-lived predict processes, avoiding to start a new process for each prediction.
+
+    Each process receives the requests on its STDIN, one per line, each one made of the tab-separated model files
+    directory, dataset file, predictions file and parameters properties file.
+    It answers on its STDOUT with a line containing 'OK' once the predictions file is written, or 'ERROR' followed by
+    a message, any other line being considered as log output.
+    Each process serves one request at a time, so concurrent requests, e.g. of the thread execution mode, are served
+    by up to the given number of processes, lazily started. If a process dies, it is restarted and the request is
+    sent again once. After more consecutive crashes than the maximum number of restarts, the server gives up; a
+    successful request resets the count, so a single model crashing the process does not disable the server.
+    A process not answering within the response timeout is killed, and restarted by the next request.
+
+    The processes belong to the process creating the server, so the server cannot be sent to other processes.
+    """
+
+    def __init__(
+            self,
+            command,
+            working_directory,
+            environment_variables,
+            restarts_number=DEFAULT_RESTARTS_NUMBER,
+            processes_number=1,
+            response_timeout=DEFAULT_RESPONSE_TIMEOUT,
+    ):
+        """
+        Initializes the server, lazily starting the processes when requests are concurrent.
+
+        :param command: the shell command starting the predict process
+        :type command: str
+
+        :param working_directory: the working directory for the command
+        :type working_directory: str
+
+        :param environment_variables: the environment variables of the process
+        :type environment_variables: dict[str, str]
+
+        :param restarts_number: the maximum number of consecutive restarts of the processes after a crash
+        :type restarts_number: int
+
+        :param processes_number: the maximum number of processes, the number of CPUs if not provided
+        :type processes_number: int
+
+        :param response_timeout: the seconds to wait for the response to a request
+        :type response_timeout: float
+        """
+        self.__command = command
+        self.__working_directory = working_directory
+        self.__environment_variables = dict(environment_variables)
+        self.__restarts_number = int(restarts_number)
+        self.__processes_number = int(processes_number or os.cpu_count() or 1)
+        self.__response_timeout = float(response_timeout or DEFAULT_RESPONSE_TIMEOUT)
+
+        self.__processes = [None] * self.__processes_number
+        self.__processes_lines = [None] * self.__processes_number
+        self.__started = [False] * self.__processes_number
+        self.__idle_slots = queue.LifoQueue()
+        for slot in reversed(range(self.__processes_number)):
+            self.__idle_slots.put(slot)
+
+        self.__crashes = 0
+        self.__restarts = 0
+        self.__lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def processes_number(self):
+        """
+        Returns the maximum number of processes.
+
+        :return: the number of processes
+        :rtype: int
+        """
+        return self.__processes_number
+
+    @property
+    def restarts(self):
+        """
+        Returns the number of restarts of the processes.
+
+        :return: the number of restarts
+        :rtype: int
+        """
+        with self.__lock:
+            return self.__restarts
+
+    def predict(
+            self,
+            model_files_directory,
+            data_file_path,
+            predictions_file_path,
+            parameters_properties_file_path='',
+    ):
+        """
+        Requests the predictions of a model on a data file, waiting for them to be written.
+
+        :param model_files_directory: the directory containing the model files
+        :type model_files_directory: str
+
+        :param data_file_path: the data file to test the model
+        :type data_file_path: str
+
+        :param predictions_file_path: the file in which writing the predictions
+        :type predictions_file_path: str
+
+        :param parameters_properties_file_path: the .properties file containing the model parameters
+        :type parameters_properties_file_path: str
+        """
+        request = '\t'.join([
+            model_files_directory,
+            data_file_path,
+            predictions_file_path,
+            parameters_properties_file_path or '',
+        ])
+
+        # Waits for an idle process, preferring the most recently used one, likely running.
+        slot = self.__idle_slots.get()
+        try:
+            # Sends the request again once if the process crashes.
+            for _ in range(2):
+                self.__start(slot)
+                process = self.__processes[slot]
+                try:
+                    process.stdin.write(request + '\n')
+                    process.stdin.flush()
+                    response = self.__read_response(self.__processes_lines[slot])
+                except (BrokenPipeError, OSError):
+                    response = None
+                except queue.Empty:
+                    # Kills the hung process, not sending the request again.
+                    self.__stop(slot, kill=True)
+                    with self.__lock:
+                        self.__crashes += 1
+                    raise PredictServerError(
+                        'The predict server did not answer within {} seconds'.format(self.__response_timeout)
+                    )
+
+                if response is None:
+                    self.__stop(slot)
+                    with self.__lock:
+                        self.__crashes += 1
+                    continue
+
+                with self.__lock:
+                    self.__crashes = 0
+                if response != OK_RESPONSE:
+                    raise PredictServerError(response[len(ERROR_RESPONSE):].strip() or 'Request failed')
+                return
+        finally:
+            self.__idle_slots.put(slot)
+
+        raise PredictServerError('The predict server exited while serving the request')
+
+    def close(self):
+        """
+        Stops the processes, closing their STDIN and killing them if they do not exit.
+        """
+        for slot in range(self.__processes_number):
+            self.__stop(slot)
+
+    def __start(self, slot):
+        """
+        Starts the process of a slot if not running.
+
+        :param slot: the slot of the process
+        :type slot: int
+        """
+        if self.__processes[slot] is not None:
+            return
+
+        with self.__lock:
+            if self.__crashes > self.__restarts_number:
+                raise PredictServerError('The predict server exceeded {} restarts'.format(self.__restarts_number))
+            if self.__started[slot]:
+                self.__restarts += 1
+            self.__started[slot] = True
+
+        self.__processes[slot] = subprocess.Popen(
+            self.__command,
+            cwd=self.__working_directory,
+            env=self.__environment_variables,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            universal_newlines=True,
+            bufsize=1,
+            shell=True,
+        )
+
+        # Reads the output lines in the background, so that the responses can be waited with a timeout.
+        self.__processes_lines[slot] = queue.Queue()
+        threading.Thread(
+            target=read_lines,
+            args=(self.__processes[slot].stdout, self.__processes_lines[slot]),
+            daemon=True,
+        ).start()
+
+    def __stop(self, slot, kill=False):
+        """
+        Stops the process of a slot if running.
+
+        :param slot: the slot of the process
+        :type slot: int
+
+        :param kill: if True, the process is killed without waiting for it to exit
+        :type kill: bool
+        """
+        process = self.__processes[slot]
+        if process is None:
+            return
+
+        self.__processes[slot] = None
+        self.__processes_lines[slot] = None
+        if kill:
+            process.kill()
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
+        try:
+            process.wait(timeout=DEFAULT_CLOSE_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+    def __read_response(self, lines):
+        """
+        Reads the response of a process, printing the log lines.
+
+        :param lines: the output lines of the process, None once it exits
+        :type lines: queue.Queue
+
+        :return: the response line, None if the process exited
+        :rtype: str
+
+        :raise queue.Empty: if the response does not arrive within the response timeout
+        """
+        deadline = time.monotonic() + self.__response_timeout
+        while True:
+            line = lines.get(timeout=max(0.0, deadline - time.monotonic()))
+            if line is None:
+                return None
+
+            line = line.rstrip('\n')
+            if line == OK_RESPONSE or line.startswith(ERROR_RESPONSE):
+                return line
+
+            print(line)
+            sys.stdout.flush()
+
+
+def read_lines(file, lines):
+    """
+    Reads the lines of a file until its end, putting them in a queue followed by None.
+
+    :param file: the file
+    :type file: io.TextIOBase
+
+    :param lines: the queue of the lines
+    :type lines: queue.Queue
+    """
+    try:
+        for line in iter(file.readline, ''):
+            lines.put(line)
+    except (OSError, ValueError):
+        pass
+    finally:
+        file.close()
+        lines.put(None)
@@ -0,0 +1,249 @@
+import os
+import json
+import fcntl
+import hashlib
+import tempfile
+import threading
+import contextlib
+
+import numpy
+
+
+DEFAULT_MAXIMUM_SIZE = 1024 * 1024 * 1024
+
+PREDICTIONS_FILE_SUFFIX = '.npy'
+EVICTION_LOCK_FILE_NAME = '.eviction.lock'
+TEMPORARY_FILE_PREFIX = '.predictions-'
+
+FILE_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class PredictionCache(object):
+    """
+    Caches the predicted values of the models on the host file system, so that executing again a model on the same
+    data, e.g. re-running a filter or a fuser, or processing a redelivered task, does not run the predict command.
+
+    The predicted values are stored as .npy files, by a key computed from the model and the data, written atomically,
+    and evicted in least recently used order when the total size exceeds the maximum size.
+    The values of object type, e.g. mixed values guessed from a text file, are not cached.
+    If bypassed, e.g. for non-deterministic predictors, the cache never finds nor stores the predicted values.
+    """
+
+    def __init__(
+            self,
+            directory,
+            maximum_size=DEFAULT_MAXIMUM_SIZE,
+            bypass=False,
+    ):
+        """
+        Initializes the cache, creating its directory if it does not exist.
+
+        :param directory: the directory of the cache, shared by the workers on the same host
+        :type directory: str
+
+        :param maximum_size: the maximum size in bytes of the cached predicted values
+        :type maximum_size: int
+
+        :param bypass: if True, the cache is not used
+        :type bypass: bool
+        """
+        self.__directory = directory
+        self.__maximum_size = int(maximum_size)
+        self.__bypass = bool(bypass)
+
+        self.__hits = 0
+        self.__misses = 0
+        self.__statistics_lock = threading.Lock()
+
+        os.makedirs(self.__directory, exist_ok=True)
+
+    @property
+    def directory(self):
+        """
+        Returns the directory of the cache.
+
+        :return: the directory path
+        :rtype: str
+        """
+        return self.__directory
+
+    @property
+    def bypass(self):
+        """
+        Checks if the cache is bypassed.
+
+        :return: True if bypassed, False otherwise
+        :rtype: bool
+        """
+        return self.__bypass
+
+    @property
+    def statistics(self):
+        """
+        Returns the numbers of 'hits' and 'misses' of the lookups since the last clearing.
+
+        :return: the statistics
+        :rtype: dict[str, int]
+        """
+        with self.__statistics_lock:
+            return {
+                'hits': self.__hits,
+                'misses': self.__misses,
+            }
+
+    def clear_statistics(self):
+        """
+        Clears the statistics of the lookups.
+        """
+        with self.__statistics_lock:
+            self.__hits = 0
+            self.__misses = 0
+
+    @staticmethod
+    def compute_key(model_key, data_key):
+        """
+        Computes the key of the predicted values of a model on some data.
+
+        :param model_key: the key of the model and of how it is executed
+        :type model_key: str
+
+        :param data_key: the key of the data, e.g. its content hash
+        :type data_key: str
+
+        :return: the key
+        :rtype: str
+        """
+        return hashlib.sha256(json.dumps([model_key, data_key]).encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """
+        Retrieves the cached predicted values.
+
+        :param key: the key of the predicted values
+        :type key: str
+
+        :return: the predicted values, None if not cached
+        :rtype: numpy.ndarray
+        """
+        if self.__bypass:
+            return None
+
+        path = os.path.join(self.__directory, key + PREDICTIONS_FILE_SUFFIX)
+        try:
+            # Marks the predicted values as recently used.
+            os.utime(path)
+            predicted_values = numpy.load(path, allow_pickle=False)
+        except (OSError, ValueError):
+            predicted_values = None
+
+        with self.__statistics_lock:
+            if predicted_values is None:
+                self.__misses += 1
+            else:
+                self.__hits += 1
+
+        return predicted_values
+
+    def put(self, key, predicted_values):
+        """
+        Stores the predicted values, replacing the cached ones.
+
+        :param key: the key of the predicted values
+        :type key: str
+
+        :param predicted_values: the predicted values
+        :type predicted_values: numpy.ndarray | list
+
+        :return: True if stored, False if bypassed or the values are not storable
+        :rtype: bool
+        """
+        if self.__bypass:
+            return False
+
+        predicted_values = numpy.asarray(predicted_values)
+        if predicted_values.dtype.hasobject:
+            return False
+
+        temporary_file = tempfile.NamedTemporaryFile(prefix=TEMPORARY_FILE_PREFIX, dir=self.__directory, delete=False)
+        try:
+            with temporary_file:
+                numpy.save(temporary_file, predicted_values, allow_pickle=False)
+            os.replace(temporary_file.name, os.path.join(self.__directory, key + PREDICTIONS_FILE_SUFFIX))
+        except BaseException:
+            os.remove(temporary_file.name)
+            raise
+
+        self.__evict()
+        return True
+
+    def __evict(self):
+        """
+        Removes the least recently used predicted values, until the size is within the maximum.
+        """
+        with self.__lock(os.path.join(self.__directory, EVICTION_LOCK_FILE_NAME)):
+            entries = []
+            size = 0
+            for entry in os.scandir(self.__directory):
+                if entry.name.startswith('.') or not entry.name.endswith(PREDICTIONS_FILE_SUFFIX) or not entry.is_file():
+                    continue
+                with contextlib.suppress(FileNotFoundError):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, entry.path, stat.st_size))
+                    size += stat.st_size
+
+            for _, path, file_size in sorted(entries):
+                if size <= self.__maximum_size:
+                    break
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(path)
+                size -= file_size
+
+    @staticmethod
+    @contextlib.contextmanager
+    def __lock(path):
+        """
+        Acquires an exclusive lock shared among the processes of the host.
+
+        :param path: the lock file path
+        :type path: str
+        """
+        with open(path, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def compute_model_key(model_artifact, execution_parameters):
+    """
+    Computes the key of a model and of how it is executed, from the content hash of its files.
+
+    :param model_artifact: the artifact containing the model files
+    :type model_artifact: worker.artifact_stores.artifact_store.Artifact
+
+    :param execution_parameters: the parameters changing the predicted values, e.g. the predict command
+    :type execution_parameters: list
+
+    :return: the key
+    :rtype: str
+    """
+    model = json.dumps([model_artifact.content_hash, execution_parameters], sort_keys=True, default=str)
+    return hashlib.sha256(model.encode('utf-8')).hexdigest()
+
+
+def compute_file_hash(path):
+    """
+    Computes the hash of a file content, e.g. the key of a data file.
+
+    :param path: the file path
+    :type path: str
+
+    :return: the hexadecimal SHA-256 digest
+    :rtype: str
+    """
+    file_hash = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(FILE_HASH_CHUNK_SIZE), b''):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
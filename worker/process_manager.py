@@ -1,5 +1,6 @@
 import subprocess
 import sys
+import collections
 
 
 class ProcessManager(object):
@@ -22,12 +23,12 @@ class ProcessManager(object):
         :param working_directory: the working directory for the command
         :type working_directory: str
 
-        :param environment_variables: the environment variables starting set
+        :param environment_variables: the environment variables starting set, never modified by the manager
         :type environment_variables: dict[str, str]
         """
         self.__command = command
         self.__working_directory = working_directory
-        self.__environment_variables = environment_variables
+        self.__environment_variables = collections.ChainMap({}, environment_variables)
 
     @property
     def environment_variables(self):
@@ -37,14 +38,14 @@ class ProcessManager(object):
         :return: the environment variables
         :rtype: dict[str, str]
         """
-        return self.__environment_variables
+        return dict(self.__environment_variables)
 
     def add_environment_variables(
             self,
             variables,
     ):
         """
-        Adds the variables to the environment variables already set.
+        Adds the variables to the environment variables already set, without modifying the starting set.
 
         :param variables: the variables dictionary to add
         :type variables: dict[str, str]
@@ -60,7 +61,7 @@ class ProcessManager(object):
         process = subprocess.Popen(
             self.__command,
             cwd=self.__working_directory,
-            env=self.__environment_variables,
+            env=dict(self.__environment_variables),
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
             shell=True,
@@ -81,7 +82,7 @@ class ProcessManager(object):
         process = subprocess.Popen(
             'echo ' + self.__command,
             cwd=self.__working_directory,
-            env=self.__environment_variables,
+            env=dict(self.__environment_variables),
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
             shell=True,
@@ -8,6 +8,8 @@ import jprops
 import numpy
 from sklearn.metrics import confusion_matrix
 
+from worker.values_reader import ValuesReader
+
 
 def convert_values_to_string(variables):
     """
@@ -49,6 +51,21 @@ def create_zip_base64_string(paths):
     :return: the base64 string
     :rtype: str
     """
+    zip_stream_base64 = codecs.encode(create_zip_bytes(paths), 'base64')
+
+    return zip_stream_base64.decode('utf-8')
+
+
+def create_zip_bytes(paths):
+    """
+    Creates a zip file as bytes.
+
+    :param paths: the file paths to include.
+    :type paths: list[str]
+
+    :return: the zip file content
+    :rtype: bytes
+    """
     zip_stream = io.BytesIO()
     zip_writer = zipfile.ZipFile(zip_stream, mode='w', compression=zipfile.ZIP_DEFLATED)
 
@@ -67,9 +84,7 @@ def create_zip_base64_string(paths):
 
     zip_writer.close()
 
-    zip_stream_base64 = codecs.encode(zip_stream.getvalue(), 'base64')
-
-    return zip_stream_base64.decode('utf-8')
+    return zip_stream.getvalue()
 
 
 def extract_zip_base64_string(string, path):
@@ -82,34 +97,160 @@ def extract_zip_base64_string(string, path):
     :param path: the destination path.
     :type path: str
     """
-    # Decodes the string from base64.
-    base64_string = string.encode('utf-8')
-    zip_string = codecs.decode(base64_string, 'base64')
+    extract_zip_bytes(decode_base64_string(string), path)
+
 
-    zip_stream = io.BytesIO(zip_string)
+def extract_zip_bytes(data, path):
+    """
+    Extract a zip file given as bytes to directory.
+
+    :param data: the zip file content
+    :type data: bytes
+
+    :param path: the destination path.
+    :type path: str
+    """
+    zip_stream = io.BytesIO(data)
     zip_reader = zipfile.ZipFile(zip_stream, mode='r', compression=zipfile.ZIP_DEFLATED)
 
     zip_reader.extractall(path)
 
 
-def read_values_from_file(file):
+def decode_base64_string(string):
+    """
+    Decodes a base64 string.
+
+    :param string: the base64 string
+    :type string: str
+
+    :return: the decoded bytes
+    :rtype: bytes
+    """
+    base64_string = string.encode('utf-8')
+    return codecs.decode(base64_string, 'base64')
+
+
+def read_values_from_file(file, value_type=None):
     """
     Reads a file containing values, one per line.
 
     :param file: the file containing the values, one per line
     :type file: file
 
+    :param value_type: the type of the values between 'integer', 'real' and 'text', guessed if not provided
+    :type value_type: str
+
     :return: a list of predictions
     :rtype: object
     """
+    if value_type is not None:
+        return ValuesReader(value_type).read(file)
     return numpy.genfromtxt(file, dtype=None)
 
 
+def count_lines(path):
+    """
+    Counts the non-empty lines of a file.
+
+    :param path: the file path
+    :type path: str
+
+    :return: the number of lines
+    :rtype: int
+    """
+    with open(path, 'rb') as file:
+        return sum(1 for line in file if line.strip())
+
+
+def write_rows_subset(path, subset_file, rows_indices, header_lines_number=0):
+    """
+    Writes a subset of the rows of a file, keeping its header lines.
+
+    :param path: the file path
+    :type path: str
+
+    :param subset_file: the file where to write the subset
+    :type subset_file: file
+
+    :param rows_indices: the sorted indices of the rows to write, not counting the header lines
+    :type rows_indices: numpy.ndarray
+
+    :param header_lines_number: the number of header lines
+    :type header_lines_number: int
+    """
+    rows_indices = iter(rows_indices)
+    next_row_index = next(rows_indices, None)
+
+    with open(path, 'r') as file:
+        lines = (line for line in file if line.strip())
+        for i, line in enumerate(lines):
+            if i < header_lines_number:
+                subset_file.write(line)
+                continue
+
+            if next_row_index is None:
+                break
+            if i - header_lines_number == next_row_index:
+                subset_file.write(line if line.endswith('\n') else line + '\n')
+                next_row_index = next(rows_indices, None)
+
+
+def split_rows_file(path, shards_number, shards_directory, header_lines_number=0):
+    """
+    Splits the rows of a file in contiguous shards of about the same size, each one starting with the header lines.
+
+    :param path: the file path
+    :type path: str
+
+    :param shards_number: the maximum number of shards, fewer if the rows are less
+    :type shards_number: int
+
+    :param shards_directory: the directory in which writing the shards
+    :type shards_directory: str
+
+    :param header_lines_number: the number of header lines
+    :type header_lines_number: int
+
+    :return: the paths of the shards, in order of the rows
+    :rtype: list[str]
+    """
+    rows_number = max(0, count_lines(path) - header_lines_number)
+    shard_rows_number = max(1, -(-rows_number // max(1, shards_number)))
+
+    header_lines = []
+    shards_paths = []
+    shard_file = None
+    try:
+        with open(path, 'r') as file:
+            lines = (line for line in file if line.strip())
+            for i, line in enumerate(lines):
+                if not line.endswith('\n'):
+                    line += '\n'
+                if i < header_lines_number:
+                    header_lines.append(line)
+                    continue
+
+                # Opens the next shard, writing the header lines.
+                if (i - header_lines_number) % shard_rows_number == 0:
+                    if shard_file is not None:
+                        shard_file.close()
+                    shards_paths.append(os.path.join(shards_directory, 'shard-{}.csv'.format(len(shards_paths))))
+                    shard_file = open(shards_paths[-1], 'w')
+                    shard_file.writelines(header_lines)
+
+                shard_file.write(line)
+    finally:
+        if shard_file is not None:
+            shard_file.close()
+
+    return shards_paths
+
+
 def compute_confusion_matrix(actual_values, predicted_values, class_values_order):
     naive_confusion_matrix = confusion_matrix(
         actual_values,
         predicted_values,
-        class_values_order
+        labels=class_values_order,
     )
     true_positives = naive_confusion_matrix[1][1]
     false_positives = naive_confusion_matrix[0][1]
@@ -0,0 +1,280 @@
+import os
+
+import numpy
+
+
+INTEGER_VALUE_TYPE = 'integer'
+REAL_VALUE_TYPE = 'real'
+TEXT_VALUE_TYPE = 'text'
+
+VALUE_TYPES = [
+    INTEGER_VALUE_TYPE,
+    REAL_VALUE_TYPE,
+    TEXT_VALUE_TYPE,
+]
+
+TEXT_VALUES_FORMAT = 'text'
+NPY_VALUES_FORMAT = 'npy'
+RAW_VALUES_FORMAT = 'raw'
+
+VALUES_FORMATS = [
+    TEXT_VALUES_FORMAT,
+    NPY_VALUES_FORMAT,
+    RAW_VALUES_FORMAT,
+]
+
+VALUES_FORMATS_EXTENSIONS = {
+    '.npy': NPY_VALUES_FORMAT,
+    '.raw': RAW_VALUES_FORMAT,
+    '.bin': RAW_VALUES_FORMAT,
+}
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+INTEGER_DTYPES = [
+    numpy.int8,
+    numpy.int32,
+    numpy.int64,
+]
+
+
+class ValuesReader(object):
+    """
+    Reads the values of a file, one per line, into a compact array of the given type.
+
+    The source is streamed in chunks, so it can be a file path, a file object, or an iterator of chunks such as the
+    content of an HTTP response.
+    The integer values are stored in the smallest type between int8, int32 and int64, accepting real values without
+    fractional part such as '1.000'. The text values are dictionary-encoded, as the codes of the sorted labels.
+    """
+
+    def __init__(
+            self,
+            value_type,
+            chunk_size=DEFAULT_CHUNK_SIZE,
+    ):
+        """
+        Initializes the reader.
+
+        :param value_type: the type of the values, between 'integer', 'real' and 'text'
+        :type value_type: str
+
+        :param chunk_size: the size in bytes of the chunks read from the files
+        :type chunk_size: int
+        """
+        if value_type not in VALUE_TYPES:
+            raise ValueError('Unknown value type: {}'.format(value_type))
+
+        self.__value_type = value_type
+        self.__chunk_size = int(chunk_size)
+
+    @property
+    def value_type(self):
+        """
+        Returns the type of the values.
+
+        :return: the value type
+        :rtype: str
+        """
+        return self.__value_type
+
+    def read(
+            self,
+            source,
+    ):
+        """
+        Reads the values, decoding the text values.
+
+        :param source: the file path, the file object, or the iterator of bytes or string chunks
+        :type source: str | file | collections.Iterable
+
+        :return: the values
+        :rtype: numpy.ndarray
+        """
+        if self.__value_type == TEXT_VALUE_TYPE:
+            codes, labels = self.read_codes(source)
+            return labels[codes]
+
+        values_chunks = [self.__parse_numbers(lines) for lines in self.__iterate_lines(source)]
+        if not values_chunks:
+            return numpy.empty(0, dtype=INTEGER_DTYPES[0] if self.__value_type == INTEGER_VALUE_TYPE else numpy.float64)
+
+        values = numpy.concatenate(values_chunks)
+        if self.__value_type == INTEGER_VALUE_TYPE:
+            values = values.astype(get_integer_dtype(values), copy=False)
+        return values
+
+    def read_codes(
+            self,
+            source,
+    ):
+        """
+        Reads the text values as the codes of the sorted labels.
+
+        :param source: the file path, the file object, or the iterator of bytes or string chunks
+        :type source: str | file | collections.Iterable
+
+        :return: the codes and the sorted labels
+        :rtype: (numpy.ndarray, numpy.ndarray)
+        """
+        labels_codes = {}
+        codes_chunks = []
+        for lines in self.__iterate_lines(source):
+            values = [line.strip() for line in lines.splitlines()]
+            values = numpy.array([value for value in values if value])
+            if len(values) == 0:
+                continue
+
+            # Maps the labels of the chunk to the codes in order of appearance.
+            chunk_labels, chunk_codes = numpy.unique(values, return_inverse=True)
+            chunk_labels_codes = numpy.array([
+                labels_codes.setdefault(label, len(labels_codes)) for label in chunk_labels.tolist()
+            ], dtype=numpy.int64)
+            codes_chunks.append(chunk_labels_codes[chunk_codes.ravel()])
+
+        # Renumbers the codes in order of the sorted labels.
+        labels = numpy.array([label.decode('utf-8') for label in labels_codes.keys()], dtype=str)
+        order = numpy.argsort(labels, kind='stable')
+        sorted_codes = numpy.empty(len(labels), dtype=numpy.int64)
+        sorted_codes[order] = numpy.arange(len(labels))
+
+        if codes_chunks:
+            codes = sorted_codes[numpy.concatenate(codes_chunks)]
+        else:
+            codes = numpy.empty(0, dtype=numpy.int64)
+        return codes.astype(get_integer_dtype(codes), copy=False), labels[order]
+
+    def __parse_numbers(self, lines):
+        """
+        Parses the numbers of complete lines.
+
+        :param lines: the lines
+        :type lines: bytes
+
+        :return: the numbers, as integers if the value type is integer
+        :rtype: numpy.ndarray
+        """
+        numbers = numpy.array(lines.split(), dtype=numpy.float64)
+        if self.__value_type != INTEGER_VALUE_TYPE:
+            return numbers
+
+        integers = numbers.astype(numpy.int64)
+        if not numpy.array_equal(integers, numbers):
+            raise ValueError('Found non-integer values for an integer type')
+        return integers
+
+    def __iterate_lines(self, source):
+        """
+        Iterates the source in chunks of complete lines.
+
+        :param source: the file path, the file object, or the iterator of bytes or string chunks
+        :type source: str | file | collections.Iterable
+
+        :return: the chunks, each ending at a line end
+        :rtype: collections.Iterator[bytes]
+        """
+        remainder = b''
+        for chunk in self.__iterate_chunks(source):
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+
+            data = remainder + chunk
+            line_end = data.rfind(b'\n')
+            if line_end < 0:
+                remainder = data
+                continue
+
+            yield data[:line_end + 1]
+            remainder = data[line_end + 1:]
+
+        if remainder.strip():
+            yield remainder
+
+    def __iterate_chunks(self, source):
+        """
+        Iterates the chunks of the source.
+
+        :param source: the file path, the file object, or the iterator of bytes or string chunks
+        :type source: str | file | collections.Iterable
+
+        :return: the chunks
+        :rtype: collections.Iterator[bytes | str]
+        """
+        if isinstance(source, str):
+            with open(source, 'rb') as source_file:
+                yield from self.__iterate_chunks(source_file)
+        elif hasattr(source, 'read'):
+            while True:
+                chunk = source.read(self.__chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        else:
+            yield from source
+
+
+def detect_values_format(path):
+    """
+    Detects the format of a values file from its extension, '.npy' for NumPy files and '.raw' or '.bin' for raw binary
+    files, text otherwise.
+
+    :param path: the file path
+    :type path: str
+
+    :return: the format between 'text', 'npy' and 'raw'
+    :rtype: str
+    """
+    _, extension = os.path.splitext(path or '')
+    return VALUES_FORMATS_EXTENSIONS.get(extension.lower(), TEXT_VALUES_FORMAT)
+
+
+def load_binary_values(path, values_format, dtype=None):
+    """
+    Loads the values of a binary file, memory-mapping it instead of parsing it.
+
+    :param path: the file path
+    :type path: str
+
+    :param values_format: the format between 'npy' and 'raw'
+    :type values_format: str
+
+    :param dtype: the type of the values of a raw file, e.g. 'int8' or '<f8', the type of a NumPy file if provided
+    :type dtype: str
+
+    :return: the values, memory-mapped
+    :rtype: numpy.ndarray
+    """
+    if values_format == NPY_VALUES_FORMAT:
+        values = numpy.load(path, mmap_mode='r', allow_pickle=False)
+        if dtype is not None and values.dtype != numpy.dtype(dtype):
+            raise ValueError('Found values of type {} instead of {}'.format(values.dtype, dtype))
+        return values.reshape(-1)
+
+    if values_format == RAW_VALUES_FORMAT:
+        if dtype is None:
+            raise ValueError('The type of the values of a raw file is required')
+        if os.path.getsize(path) == 0:
+            return numpy.empty(0, dtype=dtype)
+        return numpy.memmap(path, dtype=dtype, mode='r')
+
+    raise ValueError('Unknown binary values format: {}'.format(values_format))
+
+
+def get_integer_dtype(values):
+    """
+    Finds the smallest integer type holding the values.
+
+    :param values: the integer values
+    :type values: numpy.ndarray
+
+    :return: the type between int8, int32 and int64
+    :rtype: type
+    """
+    if len(values) == 0:
+        return INTEGER_DTYPES[0]
+
+    minimum, maximum = values.min(), values.max()
+    for dtype in INTEGER_DTYPES:
+        if numpy.iinfo(dtype).min <= minimum and maximum <= numpy.iinfo(dtype).max:
+            return dtype
+    return INTEGER_DTYPES[-1]
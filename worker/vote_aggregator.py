@@ -0,0 +1,101 @@
+import numpy
+
+
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+class VoteAggregator(object):
+    """
+    Aggregates the hard votes of several predictors, working on a (predictors x rows) matrix of label codes.
+
+    The label codes are in [0, labels number), the negative codes are not counted as votes. On ties the lowest label
+    code wins, as the hard voting of scikit-learn does with the labels sorted by value.
+    """
+
+    def __init__(
+            self,
+            labels_number,
+            weights=None,
+            chunk_size=DEFAULT_CHUNK_SIZE,
+    ):
+        """
+        Initializes the aggregator.
+
+        :param labels_number: the number of labels
+        :type labels_number: int
+
+        :param weights: the weight of the vote of each predictor, all equal if not provided
+        :type weights: list[float]
+
+        :param chunk_size: the maximum number of votes processed at once, to bound the memory
+        :type chunk_size: int
+        """
+        self.__labels_number = int(labels_number)
+        self.__weights = None if weights is None else numpy.asarray(weights, dtype=numpy.float64)
+        self.__chunk_size = int(chunk_size)
+
+    @property
+    def labels_number(self):
+        """
+        Returns the number of labels.
+
+        :return: the number of labels
+        :rtype: int
+        """
+        return self.__labels_number
+
+    def aggregate(
+            self,
+            predicted_codes,
+    ):
+        """
+        Computes the label code winning the vote of each row.
+
+        :param predicted_codes: the label codes, one row per predictor
+        :type predicted_codes: numpy.ndarray
+
+        :return: the winning label code of each row
+        :rtype: numpy.ndarray
+        """
+        predicted_codes = numpy.asarray(predicted_codes)
+        if predicted_codes.ndim == 1:
+            predicted_codes = predicted_codes.reshape(1, -1)
+        predictors_number, rows_number = predicted_codes.shape
+
+        if self.__weights is not None and len(self.__weights) != predictors_number:
+            raise ValueError('Found {} weights for {} predictors'.format(len(self.__weights), predictors_number))
+
+        winning_codes = numpy.empty(rows_number, dtype=numpy.min_scalar_type(max(self.__labels_number - 1, 0)))
+        chunk_rows_number = max(1, self.__chunk_size // max(1, predictors_number))
+        for start in range(0, rows_number, chunk_rows_number):
+            stop = min(start + chunk_rows_number, rows_number)
+            votes = self.count_votes(predicted_codes[:, start:stop])
+            winning_codes[start:stop] = numpy.argmax(votes, axis=0)
+
+        return winning_codes
+
+    def count_votes(
+            self,
+            predicted_codes,
+    ):
+        """
+        Counts the votes of each label for each row.
+
+        :param predicted_codes: the label codes, one row per predictor
+        :type predicted_codes: numpy.ndarray
+
+        :return: the (weighted) number of votes, one row per label
+        :rtype: numpy.ndarray
+        """
+        votes_dtype = numpy.int64 if self.__weights is None else numpy.float64
+        votes = numpy.zeros((self.__labels_number, predicted_codes.shape[1]), dtype=votes_dtype)
+
+        for code in range(self.__labels_number):
+            code_mask = (predicted_codes == code)
+            if self.__weights is None:
+                votes[code] = numpy.count_nonzero(code_mask, axis=0)
+            else:
+                votes[code] = self.__weights @ code_mask
+
+        return votes
+